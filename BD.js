@@ -1,6 +1,19 @@
 // ---------------------------
 // Backend URL
 const BACKEND_URL = "http://localhost:8000/vulnerabilities";
+const BATCH_URL = "http://localhost:8000/batch/vulnerabilities";
+const LIVE_URL = "http://localhost:8000/live/updates";
+
+// Normalize a /vulnerabilities/{domain} payload into card metrics
+function toVulnMetrics(data) {
+  const vulns = data.vulnerabilities || data;
+  return {
+    domain: data.domain,
+    findings: vulns.issues || vulns.findings || [],
+    counts: vulns.counts || { critical: 0, high: 0, medium: 0, low: 0 },
+    risk_score: vulns.risk_score || 0
+  };
+}
 
 // Fetch vulnerability metrics for a single domain
 async function fetchVulnerabilityMetrics(domain) {
@@ -9,22 +22,33 @@ async function fetchVulnerabilityMetrics(domain) {
     if (!response.ok) throw new Error("Network response was not ok");
 
     const data = await response.json();
-    return {
-      domain: data.domain,
-      findings: data.findings || [],
-      counts: data.counts || { critical: 0, high: 0, medium: 0, low: 0 },
-      risk_score: data.risk_score || 0
-    };
+    return toVulnMetrics(data);
   } catch (err) {
     console.error(`Failed to fetch metrics for ${domain}:`, err);
     return null;
   }
 }
 
+// One card per domain, created under the vulnerabilities panel on first use
+function vulnCard(domain) {
+  let card = document.getElementById(`card-${domain}`);
+  if (card) return card;
+
+  const panel = document.getElementById("vulnerabilities");
+  if (!panel) return null;
+
+  card = document.createElement("div");
+  card.id = `card-${domain}`;
+  card.className = "vuln-card";
+  card.dataset.domain = domain;
+  panel.appendChild(card);
+  return card;
+}
+
 // Update or inject risk score and counts into a card
 function updateVulnCard(result) {
-  // Select the card by domain, fallback to first card if IDs aren't set
-  const card = document.querySelector(`#card-${result.domain}`) || document.querySelector(".vuln-card");
+  // Never fall back to another domain's card
+  const card = vulnCard(result.domain);
   if (!card) return;
 
   // Risk score
@@ -47,18 +71,59 @@ function updateVulnCard(result) {
   countsElem.textContent = `C:${result.counts.critical} H:${result.counts.high} M:${result.counts.medium} L:${result.counts.low}`;
 }
 
+// ---------------------------
+// Stream every domain's card over one connection (NDJSON, completion order)
+async function streamVulnerabilityMetrics(domains, onResult) {
+  const response = await fetch(BATCH_URL, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ domains, format: "ndjson" })
+  });
+  if (!response.ok) throw new Error("Network response was not ok");
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split("\n");
+    buffer = lines.pop();  // keep the partial line for the next chunk
+
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      const message = JSON.parse(line);
+      if (message.event !== "result") continue;
+
+      if (message.error) {
+        console.error(`Failed to fetch metrics for ${message.domain}:`, message.error);
+      } else {
+        onResult(toVulnMetrics({ domain: message.domain, ...message.result }));
+      }
+    }
+  }
+}
+
 // ---------------------------
 // Monitoring loop integration
 async function monitoringLoop() {
   if (!segments || !Object.keys(segments).length) return;
 
-  // Flatten all domain promises
-  const allPromises = Object.values(segments).flatMap(domains =>
-    domains.map(fetchVulnerabilityMetrics)
-  );
+  const domains = [...new Set(Object.values(segments).flat())];
+  if (!domains.length) return;
 
-  const results = await Promise.all(allPromises);
-  const allResults = results.filter(Boolean);
+  const allResults = [];
+  try {
+    await streamVulnerabilityMetrics(domains, result => {
+      allResults.push(result);
+      updateVulnCard(result);  // cards update as each domain finishes
+    });
+  } catch (err) {
+    console.error("Batch monitoring stream failed:", err);
+  }
 
   // Render your existing grid as usual
   renderGrid(allResults);
@@ -68,5 +133,79 @@ async function monitoringLoop() {
 }
 
 // ---------------------------
-// Optional: auto-refresh every X seconds
-setInterval(monitoringLoop, 30000); // refresh every 30s
\ No newline at end of file
+// Live updates: server pushes only domains whose results changed
+const liveState = {};  // domain -> { "section.field": value }
+
+// { "security.vulnerabilities.counts.high": 1 } -> nested object under prefix
+function unflatten(flat, prefix) {
+  const out = {};
+  for (const [path, value] of Object.entries(flat)) {
+    if (!path.startsWith(prefix)) continue;
+    const keys = path.slice(prefix.length).split(".");
+    let node = out;
+    keys.slice(0, -1).forEach(key => (node = node[key] = node[key] || {}));
+    node[keys[keys.length - 1]] = value;
+  }
+  return out;
+}
+
+// Reload segments and re-render; concurrent callers share one refresh
+let refreshing = null;
+function refreshGrid() {
+  if (!refreshing) {
+    refreshing = (async () => {
+      if (typeof loadDomains === "function") await loadDomains();
+      await monitoringLoop();
+    })().finally(() => (refreshing = null));
+  }
+  return refreshing;
+}
+
+function isSegmentDomain(domain) {
+  return Object.values(segments || {}).some(domains => domains.includes(domain));
+}
+
+const reloadedFor = new Set();  // unknown domains that already triggered a reload
+
+function applyLiveState(domain) {
+  if (typeof segments === "undefined") return;
+
+  // Possibly added since segments loaded: reload and re-render once
+  if (!isSegmentDomain(domain)) {
+    if (!reloadedFor.has(domain)) {
+      reloadedFor.add(domain);
+      refreshGrid().then(() => isSegmentDomain(domain) && applyLiveState(domain));
+    }
+    return;
+  }
+
+  const security = unflatten(liveState[domain] || {}, "security.");
+  if (!Object.keys(security).length) return;
+  updateVulnCard(toVulnMetrics({ domain, ...security }));
+}
+
+function startLiveUpdates() {
+  const source = new EventSource(LIVE_URL);
+
+  source.addEventListener("snapshot", event => {
+    const { domains } = JSON.parse(event.data);
+    Object.keys(liveState).forEach(domain => delete liveState[domain]);
+    Object.assign(liveState, domains);
+    Object.keys(domains).forEach(applyLiveState);
+  });
+
+  source.addEventListener("diff", event => {
+    const diff = JSON.parse(event.data);
+    const state = (liveState[diff.domain] = liveState[diff.domain] || {});
+    diff.removed.forEach(path => delete state[path]);
+    Object.assign(state, diff.changes);
+    applyLiveState(diff.domain);
+  });
+
+  // EventSource reconnects by itself; the server re-sends a snapshot
+  return source;
+}
+
+// Full render once segments are loaded, then live diffs instead of
+// polling; live updates for domains not yet in segments trigger a re-render
+refreshGrid().finally(startLiveUpdates);
\ No newline at end of file
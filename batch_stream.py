@@ -0,0 +1,96 @@
+# ============================================================
+# SitePulseAI Batch Streaming
+# Run one check across many domains, stream results as they finish
+# ============================================================
+
+import asyncio
+import inspect
+import json
+import time
+
+from fastapi.responses import StreamingResponse
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+BATCH_CONCURRENCY = 32      # domains checked at once per stream
+MAX_BATCH_DOMAINS = 1000    # largest batch one request may ask for
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+# ---------------------------
+# Runner
+# ---------------------------
+async def _checked(check, domain, limit):
+    async with limit:
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(check):
+                result = await check(domain)
+            else:
+                result = await asyncio.to_thread(check, domain)
+            record = {"domain": domain, "result": result}
+        except Exception as e:
+            record = {"domain": domain, "error": str(e)}
+        record["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return record
+
+
+async def iter_checks(domains, check, concurrency=BATCH_CONCURRENCY):
+    """
+    Yield one record per domain in completion order. Pending checks are
+    cancelled if the consumer stops early (e.g. the client disconnects).
+    """
+    limit = asyncio.Semaphore(concurrency)
+    tasks = [asyncio.create_task(_checked(check, d, limit)) for d in domains]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+# ---------------------------
+# Wire formats
+# ---------------------------
+def _ndjson(event, payload):
+    return json.dumps({"event": event, **payload}, default=str) + "\n"
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+async def _encode(domains, check, fmt, concurrency):
+    encode = _sse if fmt == "sse" else _ndjson
+    start = time.perf_counter()
+    completed = 0
+
+    yield encode("start", {"total": len(domains)})
+
+    async for record in iter_checks(domains, check, concurrency):
+        completed += 1
+        yield encode("result", {**record, "completed": completed, "total": len(domains)})
+
+    yield encode("done", {
+        "total": len(domains),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    })
+
+
+def stream_checks(domains, check, fmt="ndjson", concurrency=BATCH_CONCURRENCY):
+    """
+    StreamingResponse with a start event, one result event per domain as
+    it finishes, and a done event.
+    """
+    return StreamingResponse(
+        _encode(domains, check, fmt, concurrency),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
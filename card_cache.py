@@ -0,0 +1,179 @@
+# ============================================================
+# SitePulseAI Card Cache
+# Shared TTL + stale-while-revalidate cache for the card endpoints
+# ============================================================
+
+import asyncio
+import functools
+import inspect
+import time
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+# card -> (fresh seconds, extra seconds stale data may be served while refreshing)
+CARD_TTLS = {
+    "ssl": (3600, 6 * 3600),
+    "uptime": (60, 600),
+    "seo": (900, 3600),
+    "latency": (60, 600),
+    "traffic": (3600, 6 * 3600),
+    "risk": (300, 1800),
+}
+DEFAULT_TTL = (60, 300)
+MAX_ENTRIES = 50000     # oldest fetches are evicted first
+
+# Cards catch their own failures and return a normal-looking dict; results
+# shaped like a failure are kept briefly and never served stale
+ERROR_TTL = (30, 0)
+ERROR_STATUSES = {"Unavailable", "Not scanned", "Error", "Timeout"}
+
+
+def is_error_result(value):
+    return isinstance(value, dict) and bool(
+        value.get("error") or value.get("partial") or value.get("status") in ERROR_STATUSES
+    )
+
+
+class CardCache:
+    """
+    (card, domain) -> last result.
+
+    Fresh entries are returned directly. Stale entries within the stale
+    window are returned immediately and refreshed in the background.
+    Misses wait for a probe, and concurrent misses or refreshes for the
+    same key share one probe, so probe volume tracks domains, not viewers.
+    Misses that join a probe already in flight are counted as coalesced.
+
+    How long a result stays fresh / stale comes from CARD_TTLS, unless it
+    looks like a failure (ERROR_TTL) or the caller passes ttl(value).
+    Dict results carry cache_age_s, the seconds since the probe ran.
+    """
+
+    def __init__(self, ttls=CARD_TTLS, max_entries=MAX_ENTRIES):
+        self.ttls = ttls
+        self.max_entries = max_entries
+
+        self._entries = {}      # key -> (fetched_at, value, fresh, stale)
+        self._inflight = {}     # (loop, key) -> probe task
+        self._stats = {}        # card -> counters
+
+    # ---------------------------
+    # Internal Helpers
+    # ---------------------------
+    def _count(self, card, field):
+        counters = self._stats.setdefault(card, {"hits": 0, "stale": 0, "misses": 0, "coalesced": 0, "probes": 0})
+        counters[field] += 1
+
+    def _ttl(self, card, value):
+        if is_error_result(value):
+            return ERROR_TTL
+        return self.ttls.get(card, DEFAULT_TTL)
+
+    def _store(self, key, value, ttl):
+        fresh, stale = ttl
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic(), value, fresh, stale)
+        while len(self._entries) > self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+    async def _run(self, key, probe, ttl):
+        self._count(key[0], "probes")
+        if inspect.iscoroutinefunction(probe):
+            value = await probe()
+        else:
+            value = await asyncio.to_thread(probe)
+        self._store(key, value, ttl(value) if ttl else self._ttl(key[0], value))
+        return value
+
+    def _start(self, key, probe, ttl):
+        """
+        One probe task per key; a viewer disconnecting never cancels it.
+        """
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get((loop, key))
+        if task is None:
+            task = self._inflight[(loop, key)] = loop.create_task(self._run(key, probe, ttl))
+            task.add_done_callback(functools.partial(self._finished, loop, key))
+        return task
+
+    def _finished(self, loop, key, task):
+        self._inflight.pop((loop, key), None)
+        if not task.cancelled() and task.exception() is not None:
+            # Nothing is cached; the next request probes again
+            print(f"[Card Cache] probe failed for {key[0]}/{key[1]}: {task.exception()}")
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    async def get(self, card, domain, probe, ttl=None):
+        """
+        probe: zero-argument callable (sync or async) producing the card.
+        ttl: optional callable(value) -> (fresh, stale) seconds.
+        """
+        key = (card, domain.strip().lower())
+
+        entry = self._entries.get(key)
+        if entry:
+            fetched_at, value, fresh, stale = entry
+            age = time.monotonic() - fetched_at
+            if age < fresh:
+                self._count(card, "hits")
+                return _with_age(value, age)
+            if age < fresh + stale:
+                self._count(card, "stale")
+                self._start(key, probe, ttl)
+                return _with_age(value, age)
+
+        # A miss that joins a probe already in flight costs no probe
+        if (asyncio.get_running_loop(), key) in self._inflight:
+            self._count(card, "coalesced")
+        else:
+            self._count(card, "misses")
+        value = await asyncio.shield(self._start(key, probe, ttl))
+        return _with_age(value, 0)
+
+    def invalidate(self, domain, card=None):
+        domain = domain.strip().lower()
+        for key in [k for k in self._entries if k[1] == domain and card in (None, k[0])]:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "refreshing": len(self._inflight),
+            "cards": {card: dict(counters) for card, counters in self._stats.items()},
+        }
+
+
+def _with_age(value, age):
+    if isinstance(value, dict):
+        return {**value, "cache_age_s": round(age, 1)}
+    return value
+
+
+card_cache = CardCache()
+
+
+def cached_card(card, ttl=None):
+    """
+    Route decorator: serve the wrapped card function through card_cache.
+    The wrapper is async and keeps the original signature for FastAPI;
+    the uncached function stays reachable as __wrapped__.
+    ttl: optional callable(domain, value) -> (fresh, stale) seconds.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            domain = kwargs["domain"] if "domain" in kwargs else args[0]
+            return await card_cache.get(
+                card,
+                domain,
+                functools.partial(func, *args, **kwargs),
+                ttl=functools.partial(ttl, domain) if ttl else None,
+            )
+
+        return wrapper
+
+    return decorator
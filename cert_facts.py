@@ -0,0 +1,140 @@
+# ============================================================
+# SitePulseAI Certificate Facts
+# One TLS handshake per domain, shared by every SSL checker
+# ============================================================
+
+import os
+import ssl
+import time
+from datetime import datetime
+
+from dns_cache import create_connection
+from expiring_cache import ExpiringCache
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+CERT_TIMEOUT = 6.0    # seconds, connect + handshake
+
+# Cache lifetime shrinks as expiry gets closer
+TTL_HEALTHY = 6 * 3600     # > 30 days remaining
+TTL_WARNING = 3600         # <= 30 days remaining
+TTL_CRITICAL = 300         # <= 7 days remaining
+TTL_ERROR = 60             # handshake failed
+
+CERT_FACTS_MAX = int(os.getenv("CERT_FACTS_MAX", "20000"))   # domains kept
+
+# domain -> facts dict; bounded, facts are dropped once their TTL passes.
+# Its per-domain locks make concurrent checkers share one handshake
+_FACTS = ExpiringCache(CERT_FACTS_MAX, lambda f: f["fetched_at"] + f["ttl"])
+
+
+# ---------------------------
+# Internal Helpers
+# ---------------------------
+def _ttl_for(facts):
+    if facts["error"]:
+        return TTL_ERROR
+
+    seconds_left = (facts["expires_at"] - datetime.utcnow()).total_seconds()
+    days_left = seconds_left / 86400
+
+    if days_left <= 7:
+        ttl = TTL_CRITICAL
+    elif days_left <= 30:
+        ttl = TTL_WARNING
+    else:
+        ttl = TTL_HEALTHY
+
+    # Never serve facts past the moment the certificate expires
+    return max(TTL_ERROR, min(ttl, seconds_left))
+
+
+def _handshake(domain):
+    facts = {
+        "domain": domain,
+        "valid": False,
+        "not_after": None,
+        "expires_at": None,
+        "issuer": None,
+        "subject": None,
+        "sans": [],
+        "protocol": None,
+        "cipher": None,
+        "raw": None,
+        "fetched_at": time.time(),
+        "ttl": TTL_ERROR,
+        "error": None,
+    }
+
+    try:
+        context = ssl.create_default_context()
+
+        with create_connection(domain, 443, timeout=CERT_TIMEOUT) as sock:
+            with context.wrap_socket(sock, server_hostname=domain) as ssock:
+                cert = ssock.getpeercert()
+                protocol = ssock.version()
+                cipher = ssock.cipher()
+
+        facts.update({
+            "valid": True,
+            "not_after": cert.get("notAfter"),
+            "expires_at": datetime.strptime(cert["notAfter"], "%b %d %H:%M:%S %Y %Z"),
+            "issuer": cert.get("issuer", ()),
+            "subject": cert.get("subject", ()),
+            "sans": [value for _, value in cert.get("subjectAltName", ())],
+            "protocol": protocol,
+            "cipher": cipher[0] if cipher else None,
+            "raw": cert,
+        })
+
+    except Exception as e:
+        facts["valid"] = False
+        facts["error"] = str(e)
+
+    facts["ttl"] = _ttl_for(facts)
+    return facts
+
+
+# ---------------------------
+# Public API
+# ---------------------------
+def get_cert_facts(domain: str) -> dict:
+    """
+    Return parsed certificate facts for a domain, doing at most one
+    TLS handshake per TTL window. The facts must be treated as read-only.
+    """
+    domain = domain.lower().strip()
+
+    with _FACTS.lock(domain):
+        facts = _FACTS.get(domain)
+        if facts:
+            return facts
+
+        facts = _handshake(domain)
+        _FACTS.put(domain, facts)
+        return facts
+
+
+def peek_cert_facts(domain: str):
+    """
+    Cached facts for a domain, or None; never does a handshake.
+    """
+    return _FACTS.get(domain.lower().strip())
+
+
+def days_remaining(facts: dict):
+    """
+    Whole days until expiry, computed at read time (facts may be cached).
+    """
+    if not facts.get("expires_at"):
+        return None
+    return (facts["expires_at"] - datetime.utcnow()).days
+
+
+def invalidate_cert_facts(domain: str):
+    """
+    Drop cached facts, e.g. right after a renewal.
+    """
+    _FACTS.pop(domain.lower().strip())
@@ -0,0 +1,143 @@
+# ============================================================
+# SitePulseAI Cycle Runner
+# Fixed-cadence, bounded-concurrency monitoring cycles with stats
+# ============================================================
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+CYCLE_HISTORY = 20     # cycles kept for /monitoring/cycles
+SLOWEST_COUNT = 5      # slowest domains reported per cycle
+
+
+class CycleRunner:
+    """
+    Runs check(domain) for every domain once per interval.
+
+    Cycles start on a fixed cadence measured from the previous start, not
+    after the previous cycle ends. If a cycle runs longer than the interval,
+    it is flagged as an overrun and the next cycle starts as soon as it
+    finishes, with the cadence re-based from that point.
+    """
+
+    def __init__(self, get_domains, check, interval, concurrency, history=CYCLE_HISTORY, prepare=None):
+        self.get_domains = get_domains
+        self.check = check
+        self.prepare = prepare      # called with the cycle's domain list first
+        self.interval = interval
+        self.concurrency = concurrency
+
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cycle")
+        self._history = deque(maxlen=history)
+        self._cycles = 0
+        self._overruns = 0
+        self._stop = threading.Event()
+
+    # ---------------------------
+    # One cycle
+    # ---------------------------
+    def _timed_check(self, domain):
+        start = time.perf_counter()
+        try:
+            ok = bool(self.check(domain))
+        except Exception as e:
+            print(f"[Cycle Exception] {domain}: {e}")
+            ok = False
+        return domain, ok, time.perf_counter() - start
+
+    def run_cycle(self):
+        domains = list(self.get_domains())
+        started_at = datetime.utcnow().isoformat()
+        start = time.perf_counter()
+
+        if self.prepare and domains:
+            try:
+                self.prepare(domains)
+            except Exception as e:
+                print(f"[Cycle Prepare Error] {e}")
+
+        succeeded = 0
+        durations = []
+
+        futures = [self._executor.submit(self._timed_check, d) for d in domains]
+        for future in as_completed(futures):
+            domain, ok, duration = future.result()
+            succeeded += ok
+            durations.append((duration, domain))
+
+        duration = time.perf_counter() - start
+        overrun = duration > self.interval
+
+        self._cycles += 1
+        self._overruns += overrun
+
+        stats = {
+            "cycle": self._cycles,
+            "started_at": started_at,
+            "duration_s": round(duration, 3),
+            "domains": len(domains),
+            "succeeded": succeeded,
+            "failed": len(domains) - succeeded,
+            "overrun": overrun,
+            "utilization": round(duration / self.interval, 3),
+            "slowest": [
+                {"domain": domain, "duration_ms": round(d * 1000, 1)}
+                for d, domain in sorted(durations, reverse=True)[:SLOWEST_COUNT]
+            ],
+        }
+        self._history.append(stats)
+
+        if overrun:
+            print(f"[Cycle Overrun] cycle {self._cycles} took {duration:.1f}s (interval {self.interval}s)")
+
+        return stats
+
+    def check_now(self, domain):
+        """
+        Run one check outside the cadence (e.g. a newly added domain).
+        """
+        return self._executor.submit(self._timed_check, domain)
+
+    # ---------------------------
+    # Cadence loop
+    # ---------------------------
+    def run_forever(self):
+        next_start = time.monotonic()
+
+        while not self._stop.is_set():
+            try:
+                self.run_cycle()
+            except Exception as e:
+                print(f"[Cycle Error] {e}")
+
+            next_start += self.interval
+            now = time.monotonic()
+            if now > next_start:
+                next_start = now  # overrun: start right away, re-base cadence
+
+            self._stop.wait(next_start - now if next_start > now else 0)
+
+    def stop(self):
+        self._stop.set()
+
+    # ---------------------------
+    # Reporting
+    # ---------------------------
+    def stats(self):
+        history = list(self._history)
+        return {
+            "interval_s": self.interval,
+            "concurrency": self.concurrency,
+            "cycles_completed": self._cycles,
+            "overruns": self._overruns,
+            "keeping_up": bool(history) and not history[-1]["overrun"],
+            "last_cycle": history[-1] if history else None,
+            "recent_cycles": history,
+        }
@@ -0,0 +1,328 @@
+# ============================================================
+# SitePulseAI DNS Cache
+# Shared, TTL-honoring name resolution for every checker
+# ============================================================
+
+import asyncio
+import importlib.util
+import ipaddress
+import os
+import socket
+import time
+
+import httpcore
+
+from expiring_cache import ExpiringCache
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+DNS_TIMEOUT = float(os.getenv("DNS_TIMEOUT", "5"))   # seconds per lookup
+DEFAULT_TTL = 300      # seconds, used when the resolver gives no TTL
+MIN_TTL = 5            # floor, so TTL=0 records don't bypass the cache
+MAX_TTL = 3600         # ceiling, so stale records age out eventually
+NEGATIVE_TTL = 30      # seconds a failed lookup is remembered
+DNS_CACHE_MAX = int(os.getenv("DNS_CACHE_MAX", "20000"))   # hostnames kept
+
+# Record TTLs need the optional 'dnspython' package; without it, or when it
+# finds nothing, lookups go through the system resolver and are cached for
+# DEFAULT_TTL
+HAS_DNSPYTHON = importlib.util.find_spec("dns") is not None
+if HAS_DNSPYTHON:
+    import dns.asyncresolver
+    import dns.exception
+    import dns.resolver
+
+# domain -> record dict; bounded, records are dropped once their TTL
+# passes. Its per-domain locks make concurrent sync callers share a lookup
+_RECORDS = ExpiringCache(DNS_CACHE_MAX, lambda r: r["expires_at"])
+
+# (loop, domain) -> future, so concurrent async callers share one lookup
+_INFLIGHT = {}
+
+
+# ---------------------------
+# Internal Helpers
+# ---------------------------
+def _key(host):
+    return host.strip().lower().rstrip(".")
+
+
+def _literal(host):
+    """
+    Record for IP literals, which never hit the resolver.
+    """
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return None
+    return {
+        "domain": host,
+        "addresses": [host],
+        "ttl": None,
+        "expires_at": None,
+        "lookup_ms": 0.0,
+        "resolver": "literal",
+        "error": None,
+        "cached": True,
+    }
+
+
+def _cached(domain):
+    record = _RECORDS.get(domain)
+    if record:
+        return {**record, "cached": True}
+    return None
+
+
+def _store(domain, addresses, ttl, lookup_seconds, resolver, error=None):
+    if error is None:
+        ttl = max(MIN_TTL, min(ttl, MAX_TTL))
+    else:
+        ttl = NEGATIVE_TTL
+
+    record = {
+        "domain": domain,
+        "addresses": addresses,
+        "ttl": ttl,
+        "expires_at": time.time() + ttl,
+        "lookup_ms": round(lookup_seconds * 1000, 2),
+        "resolver": resolver,
+        "error": error,
+    }
+    _RECORDS.put(domain, record)
+    return {**record, "cached": False}
+
+
+def _unique(addresses):
+    return list(dict.fromkeys(addresses))
+
+
+def _from_answers(answers):
+    """
+    answers: one dnspython answer (or exception) per record type.
+    Returns (addresses, ttl); raises when no type resolved.
+    """
+    addresses, ttls, errors = [], [], []
+    for answer in answers:
+        if isinstance(answer, Exception):
+            errors.append(answer)
+            continue
+        addresses += [rdata.address for rdata in answer]
+        ttls.append(answer.rrset.ttl)
+
+    if not addresses:
+        raise errors[0] if errors else socket.gaierror("no addresses")
+    return _unique(addresses), min(ttls)
+
+
+def _from_addrinfo(infos):
+    return _unique(info[4][0] for info in infos), DEFAULT_TTL
+
+
+# ---------------------------
+# Lookups
+# ---------------------------
+def _system_lookup(domain):
+    return _from_addrinfo(socket.getaddrinfo(domain, None, type=socket.SOCK_STREAM)) + ("system",)
+
+
+async def _system_lookup_async(domain):
+    loop = asyncio.get_running_loop()
+    infos = await asyncio.wait_for(
+        loop.getaddrinfo(domain, None, type=socket.SOCK_STREAM), DNS_TIMEOUT
+    )
+    return _from_addrinfo(infos) + ("system",)
+
+
+def _lookup(domain):
+    if HAS_DNSPYTHON:
+        answers = []
+        for rdtype in ("A", "AAAA"):
+            try:
+                answers.append(dns.resolver.resolve(domain, rdtype, lifetime=DNS_TIMEOUT))
+            except dns.exception.DNSException as e:
+                answers.append(e)
+        try:
+            return _from_answers(answers) + ("dnspython",)
+        except Exception:
+            # /etc/hosts, nsswitch and search domains are only known to
+            # the system resolver; ask it before caching a failure
+            pass
+
+    return _system_lookup(domain)
+
+
+async def _lookup_async(domain):
+    if HAS_DNSPYTHON:
+        answers = await asyncio.gather(
+            *(dns.asyncresolver.resolve(domain, rdtype, lifetime=DNS_TIMEOUT) for rdtype in ("A", "AAAA")),
+            return_exceptions=True,
+        )
+        try:
+            return _from_answers(answers) + ("dnspython",)
+        except Exception:
+            pass
+
+    return await _system_lookup_async(domain)
+
+
+# ---------------------------
+# Public API
+# ---------------------------
+def resolve(host: str) -> dict:
+    """
+    Resolve a host through the shared cache (blocking).
+    Returns a record with addresses, ttl, lookup_ms, cached and error.
+    """
+    domain = _key(host)
+    literal = _literal(domain)
+    if literal:
+        return literal
+
+    with _RECORDS.lock(domain):
+        record = _cached(domain)
+        if record:
+            return record
+
+        start = time.perf_counter()
+        try:
+            addresses, ttl, resolver = _lookup(domain)
+            return _store(domain, addresses, ttl, time.perf_counter() - start, resolver)
+        except Exception as e:
+            return _store(domain, [], None, time.perf_counter() - start, "error", str(e) or type(e).__name__)
+
+
+async def resolve_async(host: str) -> dict:
+    """
+    Non-blocking resolve; concurrent callers on one loop share a lookup.
+    """
+    domain = _key(host)
+    literal = _literal(domain)
+    if literal:
+        return literal
+
+    record = _cached(domain)
+    if record:
+        return record
+
+    loop = asyncio.get_running_loop()
+    inflight = _INFLIGHT.get((loop, domain))
+    if inflight:
+        return {**await asyncio.shield(inflight), "cached": True}
+
+    future = _INFLIGHT[(loop, domain)] = loop.create_future()
+    start = time.perf_counter()
+    try:
+        addresses, ttl, resolver = await _lookup_async(domain)
+        record = _store(domain, addresses, ttl, time.perf_counter() - start, resolver)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        record = _store(domain, [], None, time.perf_counter() - start, "error", str(e) or type(e).__name__)
+    finally:
+        _INFLIGHT.pop((loop, domain), None)
+
+    future.set_result(record)
+    return record
+
+
+async def resolve_many(hosts) -> dict:
+    """
+    Resolve a batch of hosts in parallel. Returns host -> record.
+    """
+    hosts = list(dict.fromkeys(hosts))
+    records = await asyncio.gather(*(resolve_async(h) for h in hosts))
+    return dict(zip(hosts, records))
+
+
+def prefetch(hosts):
+    """
+    Warm the cache for a batch of hosts from a thread with no event loop
+    (e.g. the start of a monitoring cycle).
+    """
+    return asyncio.run(resolve_many(hosts))
+
+
+def create_connection(host, port, timeout=None):
+    """
+    socket.create_connection() that resolves through the cache and tries
+    each cached address in turn.
+    """
+    record = resolve(host)
+    if record["error"]:
+        raise socket.gaierror(record["error"])
+
+    last_error = None
+    for address in record["addresses"]:
+        try:
+            return socket.create_connection((address, port), timeout=timeout)
+        except OSError as e:
+            last_error = e
+    raise last_error
+
+
+def invalidate(host: str):
+    _RECORDS.pop(_key(host))
+
+
+# ---------------------------
+# httpcore network backends
+# ---------------------------
+class CachedDNSBackend(httpcore.AsyncNetworkBackend):
+    """
+    Async network backend that resolves hosts through the cache before
+    connecting. TLS still uses the original hostname for SNI/verification.
+    """
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        record = await resolve_async(host)
+        if record["error"]:
+            raise httpcore.ConnectError(f"DNS lookup failed for {host}: {record['error']}")
+
+        last_error = None
+        for address in record["addresses"]:
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds):
+        await self._backend.sleep(seconds)
+
+
+class CachedDNSSyncBackend(httpcore.NetworkBackend):
+    """
+    Blocking counterpart of CachedDNSBackend for sync clients.
+    """
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        record = resolve(host)
+        if record["error"]:
+            raise httpcore.ConnectError(f"DNS lookup failed for {host}: {record['error']}")
+
+        last_error = None
+        for address in record["addresses"]:
+            try:
+                return self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error
+
+    def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    def sleep(self, seconds):
+        self._backend.sleep(seconds)
@@ -0,0 +1,95 @@
+# ============================================================
+# SitePulseAI Expiring Cache
+# Bounded per-domain cache with expiry and per-key locks
+# ============================================================
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+SWEEP_INTERVAL = 60     # seconds between full expiry sweeps
+
+
+class ExpiringCache:
+    """
+    key -> value with a size bound and per-entry expiry.
+
+    expires_at(value) gives the epoch time after which an entry is dead.
+    Entries are kept in least-recently-used order and the oldest go first
+    past max_entries. Expired entries are dropped when read and by a full
+    sweep at most once per SWEEP_INTERVAL on write.
+
+    lock(key) serializes work on one key (e.g. a fetch). A key's lock
+    exists only while a caller holds or waits on it.
+    """
+
+    def __init__(self, max_entries, expires_at):
+        self.max_entries = max_entries
+        self.expires_at = expires_at
+
+        self._entries = OrderedDict()
+        self._locks = {}            # key -> [lock, holders + waiters]
+        self._guard = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    # ---------------------------
+    # Entries
+    # ---------------------------
+    def get(self, key):
+        with self._guard:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            if time.time() >= self.expires_at(value):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._guard:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            if time.monotonic() - self._last_sweep >= SWEEP_INTERVAL:
+                self._sweep()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._guard:
+            return self._entries.pop(key, None)
+
+    def _sweep(self):
+        self._last_sweep = time.monotonic()
+        now = time.time()
+        for key in [k for k, v in self._entries.items() if now >= self.expires_at(v)]:
+            del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ---------------------------
+    # Per-key locks
+    # ---------------------------
+    @contextmanager
+    def lock(self, key):
+        with self._guard:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
@@ -1,10 +1,18 @@
+import atexit
+import io
+import multiprocessing
+import threading
 import uuid
 import hashlib
 import json
 import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from PIL import Image, ImageDraw, ImageFont
 
+from sqlite_store import SQLiteStore
+
 
 # ==============================
 # DIRECTORY STRUCTURE
@@ -44,9 +52,9 @@ def build_internal_telemetry(site, uptime, ssl_status, node_id, timestamp):
 # AUDIT LOG GENERATION
 # (CONTROLLED ACCESS LAYER)
 # ==============================
-def create_audit_log(site, telemetry, uptime, ssl_status, window, cert_id):
+def build_audit_entry(site, telemetry, uptime, ssl_status, window, cert_id):
 
-    audit_entry = {
+    return {
         "site": site,
         "certificate_id": cert_id,
         "timestamp": telemetry["timestamp"],
@@ -57,7 +65,16 @@ def create_audit_log(site, telemetry, uptime, ssl_status, window, cert_id):
         "signature_hash": telemetry["signature_hash"]
     }
 
-    log_name = f"AUDIT-{datetime.utcnow().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}.json"
+
+def new_audit_ref():
+    return f"AUDIT-{datetime.utcnow().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
+
+
+def create_audit_log(site, telemetry, uptime, ssl_status, window, cert_id):
+
+    audit_entry = build_audit_entry(site, telemetry, uptime, ssl_status, window, cert_id)
+
+    log_name = f"{new_audit_ref()}.json"
     log_path = os.path.join(AUDIT_DIR, log_name)
 
     with open(log_path, "w") as f:
@@ -70,12 +87,14 @@ def create_audit_log(site, telemetry, uptime, ssl_status, window, cert_id):
 # PUBLIC CERTIFICATE BUILDER
 # (SAFE FOR LINKEDIN / CLIENT USE)
 # ==============================
+CERTIFICATE_TITLE = "Telemetry Verification Certificate"
+
 def build_public_certificate(site, uptime, ssl_status, window, cert_id, audit_ref):
 
     issued_time = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
 
     return {
-        "title": "Telemetry Verification Certificate",
+        "title": CERTIFICATE_TITLE,
         "issuer": "SitePulseAI Licensed Monitoring Infrastructure",
 
         "site": site,
@@ -102,61 +121,246 @@ def build_public_certificate(site, uptime, ssl_status, window, cert_id, audit_re
 # CERTIFICATE IMAGE RENDERER
 # (PUBLIC VISUAL OUTPUT ONLY)
 # ==============================
-def render_certificate_image(public_cert, output_path):
-
-    img = Image.new("RGB", (1200, 780), (20, 26, 36))
+CANVAS_SIZE = (1200, 780)
+BACKGROUND = (20, 26, 36)
+FONT_PATH = os.getenv("CERT_FONT", "arial.ttf")
+FONT_SIZES = {"title": 54, "body": 32, "small": 26}
+
+# png | png-optimized (palette + zlib optimize) | webp
+CERT_IMAGE_FORMAT = os.getenv("CERT_IMAGE_FORMAT", "png")
+IMAGE_EXTENSIONS = {"png": ".png", "png-optimized": ".png", "webp": ".webp"}
+
+# Worker processes for rendering; 1 renders in the calling thread
+RENDER_WORKERS = int(os.getenv("CERT_RENDER_WORKERS", str(os.cpu_count() or 1)))
+
+# Loaded once per process (main process and each render worker)
+_FONTS = None
+_TEMPLATE = None
+_RENDER_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _fonts():
+    global _FONTS
+    if _FONTS is None:
+        try:
+            _FONTS = {name: ImageFont.truetype(FONT_PATH, size) for name, size in FONT_SIZES.items()}
+        except OSError:
+            default = ImageFont.load_default()
+            _FONTS = {name: default for name in FONT_SIZES}
+    return _FONTS
+
+
+def _template():
+    """
+    Background, rule, fixed status lines and footer, drawn once.
+    """
+    global _TEMPLATE
+    if _TEMPLATE is None:
+        fonts = _fonts()
+        img = Image.new("RGB", CANVAS_SIZE, BACKGROUND)
+        draw = ImageDraw.Draw(img)
+
+        # Header
+        draw.text((140, 60), CERTIFICATE_TITLE, fill="white", font=fonts["title"])
+        draw.line((120, 140, 1080, 140), fill="white", width=2)
+
+        # Status block (PUBLIC ONLY)
+        draw.text((150, 240), "System Verification: CONFIRMED", fill="white", font=fonts["small"])
+        draw.text((150, 270), "Monitoring State: ACTIVE", fill="white", font=fonts["small"])
+        draw.text((150, 300), "Data Integrity: VERIFIED", fill="white", font=fonts["small"])
+
+        # Footer
+        draw.text(
+            (150, 660),
+            "SitePulseAI — Licensed Monitoring Infrastructure",
+            fill="white",
+            font=fonts["small"]
+        )
+
+        _TEMPLATE = img
+    return _TEMPLATE
+
+
+def encode_certificate_image(public_cert, fmt=CERT_IMAGE_FORMAT):
+    """
+    Draw the per-certificate fields onto the template and encode it.
+    Returns (image bytes, file extension).
+    """
+    fonts = _fonts()
+    img = _template().copy()
     draw = ImageDraw.Draw(img)
 
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 54)
-        body_font = ImageFont.truetype("arial.ttf", 32)
-        small_font = ImageFont.truetype("arial.ttf", 26)
-    except:
-        title_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
-
-    # Header
-    draw.text((140, 60), public_cert["title"], fill="white", font=title_font)
-    draw.line((120, 140, 1080, 140), fill="white", width=2)
-
     # Site
-    draw.text((150, 180), f"Site: {public_cert['site']}", fill="white", font=body_font)
-
-    # Status block (PUBLIC ONLY)
-    draw.text((150, 240), "System Verification: CONFIRMED", fill="white", font=small_font)
-    draw.text((150, 270), "Monitoring State: ACTIVE", fill="white", font=small_font)
-    draw.text((150, 300), "Data Integrity: VERIFIED", fill="white", font=small_font)
+    draw.text((150, 180), f"Site: {public_cert['site']}", fill="white", font=fonts["body"])
 
     # Metrics
-    draw.text((150, 350), f"Verified Uptime: {public_cert['metrics']['uptime']}", fill="white", font=body_font)
-    draw.text((150, 400), f"SSL Status: {public_cert['metrics']['ssl_status']}", fill="white", font=body_font)
+    draw.text((150, 350), f"Verified Uptime: {public_cert['metrics']['uptime']}", fill="white", font=fonts["body"])
+    draw.text((150, 400), f"SSL Status: {public_cert['metrics']['ssl_status']}", fill="white", font=fonts["body"])
 
     # Window + audit
-    draw.text((150, 450), f"Observation Window: {public_cert['observation_window']}", fill="white", font=small_font)
-    draw.text((150, 500), f"Audit Reference: {public_cert['audit_reference']}", fill="white", font=small_font)
+    draw.text((150, 450), f"Observation Window: {public_cert['observation_window']}", fill="white", font=fonts["small"])
+    draw.text((150, 500), f"Audit Reference: {public_cert['audit_reference']}", fill="white", font=fonts["small"])
 
     # Identity layer
-    draw.text((150, 550), f"Certificate ID: {public_cert['certificate_id']}", fill="white", font=small_font)
-    draw.text((150, 600), f"Issued: {public_cert['issued']}", fill="white", font=small_font)
-
-    # Footer
-    draw.text(
-        (150, 660),
-        "SitePulseAI — Licensed Monitoring Infrastructure",
-        fill="white",
-        font=small_font
+    draw.text((150, 550), f"Certificate ID: {public_cert['certificate_id']}", fill="white", font=fonts["small"])
+    draw.text((150, 600), f"Issued: {public_cert['issued']}", fill="white", font=fonts["small"])
+
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        # method=0 is the fastest encoder; still well under half the PNG size
+        img.save(buffer, "WEBP", quality=90, method=0)
+    elif fmt == "png-optimized":
+        # White-on-dark text needs few colours; a 32-colour palette PNG is
+        # about 40% of the RGB size, and fast-octree keeps it as cheap to encode
+        img.quantize(colors=32, method=Image.Quantize.FASTOCTREE).save(buffer, "PNG")
+    else:
+        img.save(buffer, "PNG")
+
+    return buffer.getvalue(), IMAGE_EXTENSIONS[fmt]
+
+
+def _render_pool():
+    """
+    Shared process pool; spawned workers avoid forking a threaded server.
+    """
+    global _RENDER_POOL
+    with _POOL_LOCK:
+        if _RENDER_POOL is None:
+            _RENDER_POOL = ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_template,
+            )
+            atexit.register(_RENDER_POOL.shutdown)
+        return _RENDER_POOL
+
+
+def render_certificate_images(public_certs, fmt=CERT_IMAGE_FORMAT):
+    """
+    Encode many certificates across the render pool, in input order.
+    Returns a list of (image bytes, file extension).
+    """
+    if RENDER_WORKERS <= 1:
+        return [encode_certificate_image(cert, fmt) for cert in public_certs]
+
+    chunksize = max(1, len(public_certs) // (RENDER_WORKERS * 4))
+    return list(_render_pool().map(encode_certificate_image, public_certs, [fmt] * len(public_certs), chunksize=chunksize))
+
+
+def render_certificate_image(public_cert, output_path, fmt=CERT_IMAGE_FORMAT):
+    """
+    Render one certificate (through the pool when enabled) and write it.
+    The extension of output_path follows fmt; returns the written path.
+    """
+    if RENDER_WORKERS <= 1:
+        data, ext = encode_certificate_image(public_cert, fmt)
+    else:
+        data, ext = _render_pool().submit(encode_certificate_image, public_cert, fmt).result()
+
+    output_path = os.path.splitext(output_path)[0] + ext
+    with open(output_path, "wb") as f:
+        f.write(data)
+
+    return output_path
+
+
+# ==============================
+# CERTIFICATE INDEX
+# (LOOKUP BY CERTIFICATE ID)
+# ==============================
+CERT_INDEX_DB = "certificates.db"
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS certificates (
+    cert_id TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    batch_id TEXT,
+    issued_at TEXT NOT NULL,
+    audit_ref TEXT NOT NULL,
+    public_path TEXT NOT NULL,
+    public_offset INTEGER,
+    public_length INTEGER,
+    image_path TEXT NOT NULL,
+    image_member TEXT
+);
+CREATE INDEX IF NOT EXISTS certificates_by_site ON certificates (site, issued_at);
+"""
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+def _index():
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = SQLiteStore(CERT_INDEX_DB, _INDEX_SCHEMA)
+        return _INDEX
+
+
+def _index_certificates(rows):
+    with _index().transaction() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO certificates (cert_id, site, batch_id, issued_at, audit_ref, "
+            "public_path, public_offset, public_length, image_path, image_member) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+def _lookup(cert_id):
+    return _index().query_one(
+        "SELECT public_path, public_offset, public_length, image_path, image_member "
+        "FROM certificates WHERE cert_id = ?",
+        (cert_id,),
     )
 
-    img.save(output_path)
+
+def get_certificate(cert_id):
+    """
+    Public certificate JSON by id: one index lookup, then either the
+    per-certificate file or a single seek into the batch bundle.
+    """
+    row = _lookup(cert_id)
+    if row is None:
+        return None
+
+    public_path, offset, length, _, _ = row
+    with open(public_path, "rb") as f:
+        if offset is None:
+            return json.load(f)
+        f.seek(offset)
+        return json.loads(f.read(length))
+
+
+def get_certificate_image(cert_id):
+    """
+    Certificate image by id. Returns (image bytes, file extension) or None.
+    """
+    row = _lookup(cert_id)
+    if row is None:
+        return None
+
+    _, _, _, image_path, member = row
+    if member is None:
+        with open(image_path, "rb") as f:
+            return f.read(), os.path.splitext(image_path)[1]
+
+    with zipfile.ZipFile(image_path) as bundle:
+        return bundle.read(member), os.path.splitext(member)[1]
 
 
 # ==============================
 # ORCHESTRATION FUNCTION
 # ==============================
-def generate_site_certificate(site):
+NODE_ID = "SPAI-MON-VA01"
 
-    node_id = "SPAI-MON-VA01"
+
+def _build_certificate(site, audit_ref=None):
+    """
+    Telemetry, audit entry and public model for one site (nothing written).
+    """
     cert_id = f"SPAI-{uuid.uuid4().hex[:10].upper()}"
 
     issued_time = datetime.utcnow()
@@ -169,7 +373,36 @@ def generate_site_certificate(site):
     ssl_status = "Valid"
 
     # 1. INTERNAL TELEMETRY (PRIVATE)
-    telemetry = build_internal_telemetry(site, uptime, ssl_status, node_id, timestamp)
+    telemetry = build_internal_telemetry(site, uptime, ssl_status, NODE_ID, timestamp)
+
+    # 2. AUDIT ENTRY (CONTROLLED EXPOSURE)
+    audit = build_audit_entry(site, telemetry, uptime, ssl_status, window, cert_id)
+    if audit_ref is None:
+        audit_ref = create_audit_log(site, telemetry, uptime, ssl_status, window, cert_id)
+
+    # 3. PUBLIC CERTIFICATE MODEL (SAFE OUTPUT)
+    public_cert = build_public_certificate(
+        site, uptime, ssl_status, window, cert_id, audit_ref
+    )
+
+    return {
+        "cert_id": cert_id,
+        "site": site,
+        "issued_at": issued_time.isoformat(),
+        "audit_ref": audit_ref,
+        "telemetry": telemetry,
+        "audit": audit,
+        "public": public_cert,
+    }
+
+
+def generate_site_certificate(site):
+
+    cert = _build_certificate(site)
+    cert_id = cert["cert_id"]
+    telemetry = cert["telemetry"]
+    audit_ref = cert["audit_ref"]
+    public_cert = cert["public"]
 
     # Save internal telemetry (NOT EXPOSED)
     internal_path = os.path.join(
@@ -180,14 +413,6 @@ def generate_site_certificate(site):
     with open(internal_path, "w") as f:
         json.dump(telemetry, f, indent=4)
 
-    # 2. AUDIT LOG (CONTROLLED EXPOSURE)
-    audit_ref = create_audit_log(site, telemetry, uptime, ssl_status, window, cert_id)
-
-    # 3. PUBLIC CERTIFICATE MODEL (SAFE OUTPUT)
-    public_cert = build_public_certificate(
-        site, uptime, ssl_status, window, cert_id, audit_ref
-    )
-
     # Save public JSON (optional client use)
     public_path = os.path.join(
         OUTPUT_DIR,
@@ -203,7 +428,11 @@ def generate_site_certificate(site):
         f"{site.replace('.', '_')}_{cert_id}.png"
     )
 
-    render_certificate_image(public_cert, image_path)
+    image_path = render_certificate_image(public_cert, image_path)
+
+    _index_certificates([
+        (cert_id, site, None, cert["issued_at"], audit_ref, public_path, None, None, image_path, None)
+    ])
 
     print("\n✔ Enterprise Certificate Generated")
     print("Public Image:", image_path)
@@ -211,6 +440,102 @@ def generate_site_certificate(site):
     print("Audit Log:", audit_ref)
     print("Internal Telemetry Stored Securely")
 
+    return {
+        "cert_id": cert_id,
+        "site": site,
+        "image_path": image_path,
+        "public_path": public_path,
+        "audit_ref": audit_ref,
+    }
+
+
+# ==============================
+# BATCH ORCHESTRATION
+# (ONE BUNDLE PER LAYER PER BATCH)
+# ==============================
+def _jsonl(records):
+    """
+    Encode records as JSON lines. Returns (bytes, [(offset, length)]).
+    """
+    lines, spans, offset = [], [], 0
+    for record in records:
+        line = json.dumps(record).encode() + b"\n"
+        lines.append(line)
+        spans.append((offset, len(line) - 1))
+        offset += len(line)
+    return b"".join(lines), spans
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def generate_site_certificates(sites, fmt=CERT_IMAGE_FORMAT):
+    """
+    Generate certificates for many sites in one pass.
+
+    Instead of four files per site, each batch writes one JSONL per
+    access layer (internal telemetry, audit, public) and one zip of
+    images, then indexes every certificate id in a single transaction.
+    Images are rendered together through the render pool.
+    """
+    sites = list(sites)
+    batch_id = f"BATCH-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6].upper()}"
+
+    certs = [_build_certificate(site, audit_ref=new_audit_ref()) for site in sites]
+    images = render_certificate_images([cert["public"] for cert in certs], fmt)
+
+    # Internal telemetry and audit bundles (NOT EXPOSED)
+    internal_path = os.path.join(INTERNAL_DIR, f"{batch_id}.jsonl")
+    internal_data, _ = _jsonl(cert["telemetry"] for cert in certs)
+    _write_atomic(internal_path, internal_data)
+
+    audit_path = os.path.join(AUDIT_DIR, f"{batch_id}.jsonl")
+    audit_data, _ = _jsonl({"audit_ref": cert["audit_ref"], **cert["audit"]} for cert in certs)
+    _write_atomic(audit_path, audit_data)
+
+    # Public JSON bundle
+    public_path = os.path.join(OUTPUT_DIR, f"{batch_id}.jsonl")
+    public_data, spans = _jsonl(cert["public"] for cert in certs)
+    _write_atomic(public_path, public_data)
+
+    # Public image bundle; images are already compressed, so store as-is
+    image_path = os.path.join(OUTPUT_DIR, f"{batch_id}.zip")
+    members = []
+    with zipfile.ZipFile(f"{image_path}.tmp", "w", zipfile.ZIP_STORED) as bundle:
+        for cert, (data, ext) in zip(certs, images):
+            member = f"{cert['site'].replace('.', '_')}_{cert['cert_id']}{ext}"
+            bundle.writestr(member, data)
+            members.append(member)
+    os.replace(f"{image_path}.tmp", image_path)
+
+    _index_certificates([
+        (cert["cert_id"], cert["site"], batch_id, cert["issued_at"], cert["audit_ref"],
+         public_path, offset, length, image_path, member)
+        for cert, (offset, length), member in zip(certs, spans, members)
+    ])
+
+    print(f"\n✔ Certificate batch {batch_id}: {len(certs)} certificates")
+    print("Public Bundle:", public_path)
+    print("Image Bundle:", image_path)
+    print("Audit Bundle:", audit_path)
+    print("Internal Telemetry Stored Securely")
+
+    return {
+        "batch_id": batch_id,
+        "count": len(certs),
+        "public_path": public_path,
+        "image_path": image_path,
+        "audit_path": audit_path,
+        "certificates": [
+            {"cert_id": cert["cert_id"], "site": cert["site"], "audit_ref": cert["audit_ref"], "image_member": member}
+            for cert, member in zip(certs, members)
+        ],
+    }
+
 
 # ==============================
 # RUN
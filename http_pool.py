@@ -0,0 +1,164 @@
+# ============================================================
+# SitePulseAI HTTP Pool
+# One keep-alive client shared by every checker
+# ============================================================
+
+import asyncio
+import importlib.util
+import os
+import threading
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+import httpcore
+import httpx
+
+from dns_cache import CachedDNSBackend, CachedDNSSyncBackend
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))            # seconds, read/write/pool
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "200"))
+MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "100"))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "90"))     # seconds an idle connection is kept
+PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", "4"))
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+_CLIENT = None          # httpx.AsyncClient bound to the app event loop
+_LOOP = None
+_HOST_LIMITS = {}       # host -> [asyncio.Semaphore, holders + waiters]
+
+_SYNC_CLIENT = None     # fallback for scripts running without the app loop
+_SYNC_LOCK = threading.Lock()
+
+
+def _transport(transport_class, backend_class):
+    transport = transport_class(
+        http2=HTTP2,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    )
+    # httpx has no resolver hook; wrap httpcore's network backend so new
+    # connections resolve through the shared DNS cache. These are private
+    # attributes, so httpx/httpcore are pinned in requirements.txt and a
+    # layout change fails here at startup instead of silently skipping DNS
+    pool = getattr(transport, "_pool", None)
+    if pool is None or not hasattr(pool, "_network_backend"):
+        raise RuntimeError(
+            f"httpx {httpx.__version__} / httpcore {httpcore.__version__}: transport has no "
+            "_pool._network_backend; update http_pool._transport for this version"
+        )
+    pool._network_backend = backend_class(pool._network_backend)
+    return transport
+
+
+def _client_options():
+    return {
+        "timeout": httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        "follow_redirects": True,
+    }
+
+
+# ---------------------------
+# Lifecycle (FastAPI startup / shutdown)
+# ---------------------------
+async def start():
+    global _CLIENT, _LOOP
+    if _CLIENT is None:
+        _CLIENT = httpx.AsyncClient(
+            transport=_transport(httpx.AsyncHTTPTransport, CachedDNSBackend),
+            **_client_options(),
+        )
+        _LOOP = asyncio.get_running_loop()
+        print(f"🌐 HTTP pool ready (http2={'on' if HTTP2 else 'off'}, per-host limit={PER_HOST_LIMIT})")
+
+
+async def close():
+    global _CLIENT, _LOOP
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+    _CLIENT = None
+    _LOOP = None
+    _HOST_LIMITS.clear()
+
+
+# ---------------------------
+# Requests
+# ---------------------------
+@asynccontextmanager
+async def _host_limit(url):
+    """
+    Per-host slot. A host's semaphore exists only while requests to it
+    hold or wait on it (only touched from the app loop, so no lock).
+    """
+    host = urlparse(str(url)).hostname or ""
+    entry = _HOST_LIMITS.get(host)
+    if entry is None:
+        entry = _HOST_LIMITS[host] = [asyncio.Semaphore(PER_HOST_LIMIT), 0]
+    entry[1] += 1
+
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _HOST_LIMITS[host]
+
+
+async def fetch(url, **kwargs) -> httpx.Response:
+    """
+    GET through the shared pool; at most PER_HOST_LIMIT requests per host
+    run at once. Must run on the app event loop (start() was awaited).
+    """
+    if _CLIENT is None:
+        raise RuntimeError("HTTP pool not started")
+
+    trace = kwargs.get("extensions", {}).get("trace")
+    if trace is not None and not asyncio.iscoroutinefunction(trace):
+        # httpcore's async interface only accepts async trace callbacks
+        async def async_trace(name, info):
+            trace(name, info)
+
+        kwargs["extensions"] = {**kwargs["extensions"], "trace": async_trace}
+
+    async with _host_limit(url):
+        return await _CLIENT.get(url, **kwargs)
+
+
+def _sync_client():
+    global _SYNC_CLIENT
+    with _SYNC_LOCK:
+        if _SYNC_CLIENT is None:
+            _SYNC_CLIENT = httpx.Client(
+                transport=_transport(httpx.HTTPTransport, CachedDNSSyncBackend),
+                **_client_options(),
+            )
+        return _SYNC_CLIENT
+
+
+def fetch_sync(url, **kwargs) -> httpx.Response:
+    """
+    Blocking GET for checkers running in worker threads.
+    Requests are handed to the app loop's pool; scripts and CLIs without
+    a running app fall back to a process-wide keep-alive sync client.
+    """
+    loop = _LOOP
+    if loop is not None and loop.is_running():
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+
+        if not on_loop:
+            return asyncio.run_coroutine_threadsafe(fetch(url, **kwargs), loop).result()
+
+    return _sync_client().get(url, **kwargs)
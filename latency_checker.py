@@ -1,7 +1,8 @@
 # latency_checker.py
 from fastapi import APIRouter, Path
-import httpx
-import time
+import asyncio
+from page_snapshot import get_snapshot
+from card_cache import cached_card
 
 # -------------------------------
 # Router setup
@@ -15,21 +16,26 @@ router = APIRouter(
 # Endpoint: GET /latency/{domain}
 # -------------------------------
 @router.get("/{domain}")
+@cached_card("latency")
 async def latency_card(domain: str = Path(..., description="Website domain")):
     """
     Returns the response time (latency) for a given domain in milliseconds.
     Returns status Online/Offline and handles network errors gracefully.
     """
-    url = f"https://{domain}"
-
     try:
-        start_time = time.perf_counter()
-        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            response = await client.get(url)
-        end_time = time.perf_counter()
+        snapshot = await asyncio.to_thread(get_snapshot, domain)
+
+        if snapshot["error"]:
+            # Network or connection errors
+            return {
+                "domain": domain,
+                "response_time_ms": None,
+                "status": "Offline",
+                "error": snapshot["error"]
+            }
 
-        latency_ms = round((end_time - start_time) * 1000, 2)
-        status = "Online" if response.status_code == 200 else "Offline"
+        latency_ms = snapshot["timings"]["total_ms"]
+        status = "Online" if snapshot["status_code"] == 200 else "Offline"
 
         return {
             "domain": domain,
@@ -37,14 +43,6 @@ async def latency_card(domain: str = Path(..., description="Website domain")):
             "status": status
         }
 
-    except httpx.RequestError as e:
-        # Network or connection errors
-        return {
-            "domain": domain,
-            "response_time_ms": None,
-            "status": "Offline",
-            "error": str(e)
-        }
     except Exception as e:
         # Catch any other unexpected error
         return {
@@ -8,9 +8,11 @@ from datetime import datetime
 from typing import List
 from urllib.parse import urlparse
 from fastapi import HTTPException
+from tenant_registry import REGISTRY as TENANT_REGISTRY
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 import base64
+import threading
 from cryptography.hazmat.primitives import serialization
 import os
 
@@ -27,6 +29,10 @@ PUBLIC_KEY = serialization.load_pem_public_key(
 # -------------------------------
 LICENSE_FOLDER = "licenses"
 
+# client_id -> verified license entry (see _get_license_entry)
+_LICENSE_CACHE = {}
+_LICENSE_CACHE_LOCK = threading.Lock()
+
 # -------------------------------
 # Utility Functions
 # -------------------------------
@@ -100,40 +106,99 @@ def _load_license(client_id: str) -> dict:
 
 
 # -------------------------------
-# Public License Functions
+# Verified License Cache
+# -------------------------------
 
+def _license_mtime(client_id: str) -> int:
+    path = os.path.join(LICENSE_FOLDER, f"{client_id}.json")
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        raise HTTPException(status_code=403, detail="License not found.")
 
-def get_license(client_id: str) -> dict:
+
+def _expire_license(client_id: str, license_data: dict):
+    _LICENSE_CACHE.pop(client_id, None)
+    license_data["active"] = False
+    _save_license(client_id, license_data)
+    raise HTTPException(status_code=403, detail="License expired.")
+
+
+def _get_license_entry(client_id: str) -> dict:
     """
-    Load and verify license. Checks expiration and signature.
+    Return the verified license entry for a client.
+    The file is read and its RSA signature checked once per file mtime;
+    after that a lookup is a stat() plus a dict hit.
+    """
+    mtime = _license_mtime(client_id)
+    entry = _LICENSE_CACHE.get(client_id)
+
+    if entry is None or entry["mtime"] != mtime:
+        with _LICENSE_CACHE_LOCK:
+            entry = _LICENSE_CACHE.get(client_id)
+
+            if entry is None or entry["mtime"] != mtime:
+                license_data = _load_license(client_id)
+                exp = datetime.strptime(license_data["expiration_date"], "%Y-%m-%d")
+
+                # Expiration enforcement (before paying for the signature check)
+                if datetime.utcnow() > exp:
+                    _expire_license(client_id, license_data)
+
+                # Signature verification
+                _verify_signature(
+                    client_id,
+                    license_data["tier"],
+                    license_data["domains"],
+                    license_data["expiration_date"],
+                    license_data.get("signature")
+                )
+
+                entry = {
+                    "mtime": mtime,
+                    "expires_at": exp,
+                    "data": license_data,
+                    "allowed_domains": frozenset(
+                        normalize_domain(d) for d in license_data.get("domains", [])
+                    ),
+                    "features": frozenset(license_data.get("features", [])),
+                }
+                _LICENSE_CACHE[client_id] = entry
+
+    # Expiry can pass while the entry sits in the cache
+    if datetime.utcnow() > entry["expires_at"]:
+        _expire_license(client_id, entry["data"])
+
+    return entry
+
+
+def invalidate_license_cache(client_id: str = None):
+    """
+    Drop cached license entries (all of them when client_id is None)
     """
-    license_data = _load_license(client_id)
+    if client_id is None:
+        _LICENSE_CACHE.clear()
+    else:
+        _LICENSE_CACHE.pop(client_id, None)
 
-    # Expiration enforcement
-    exp = datetime.strptime(license_data["expiration_date"], "%Y-%m-%d")
-    if datetime.utcnow() > exp:
-        license_data["active"] = False
-        _save_license(client_id, license_data)
-        raise HTTPException(status_code=403, detail="License expired.")
 
+# -------------------------------
+# Public License Functions
 
-    # Signature verification
-    _verify_signature(
-    client_id,
-    license_data["tier"],
-    license_data["domains"],
-    license_data["expiration_date"],
-    license_data.get("signature")
-)
+
+def get_license(client_id: str) -> dict:
+    """
+    Load and verify license. Checks expiration and signature.
+    Returns the cached license dict; callers must not mutate it.
+    """
+    return _get_license_entry(client_id)["data"]
 
 
 def validate_domain(client_id: str, requested_domain: str):
     """
     Ensure client only monitors allowed domains
     """
-    license_data = get_license(client_id)
-
-    allowed = [normalize_domain(d) for d in license_data.get("domains", [])]
+    allowed = _get_license_entry(client_id)["allowed_domains"]
     req_norm = normalize_domain(requested_domain)
 
     if req_norm not in allowed:
@@ -148,12 +213,12 @@ def check_feature_access(client_id: str, feature: str):
     """
     Ensure feature is allowed under license tier
     """
-    license_data = get_license(client_id)
+    entry = _get_license_entry(client_id)
 
-    if feature not in license_data.get("features", []):
+    if feature not in entry["features"]:
         raise HTTPException(
             status_code=403,
-            detail=f"Feature '{feature}' not permitted under {license_data['tier']} license."
+            detail=f"Feature '{feature}' not permitted under {entry['data']['tier']} license."
         )
     return True
 
@@ -166,8 +231,14 @@ def enforce_domain_guard(client_id: str, domains: List[str]):
     """
     Ensures monitoring batch cannot include unauthorized domains
     AND enforces max_sites limit (fully normalized + deduplicated)
+
+    max_sites covers the tenant's registered domains plus any new ones
+    in this batch, not just the batch itself. Both sides are compared
+    with this module's normalize_domain, so "www." variants of a
+    registered domain are not counted twice.
     """
-    license_data = get_license(client_id)
+    entry = _get_license_entry(client_id)
+    license_data = entry["data"]
 
     # ---------------------------
     # NORMALIZE + DEDUPLICATE INPUT DOMAINS
@@ -181,7 +252,12 @@ def enforce_domain_guard(client_id: str, domains: List[str]):
     # ---------------------------
     max_allowed = license_data.get("max_sites", 0)
 
-    if len(normalized_domains) > max_allowed:
+    # Domains already registered to this tenant count toward the limit.
+    # The registry stores hostnames as given (www. kept), so map them
+    # through the same normalizer as the batch before comparing
+    registered = set(normalize_domain(d) for d in TENANT_REGISTRY.domains(client_id))
+
+    if len(registered | normalized_domains) > max_allowed:
         raise HTTPException(
             status_code=403,
             detail=f"Exceeded max_sites limit ({max_allowed}) for this license"
@@ -190,9 +266,7 @@ def enforce_domain_guard(client_id: str, domains: List[str]):
     # ---------------------------
     # LICENSE ALLOWED DOMAINS
     # ---------------------------
-    allowed_domains = set(
-        normalize_domain(d) for d in license_data.get("domains", [])
-    )
+    allowed_domains = entry["allowed_domains"]
 
     # ---------------------------
     # WHITELIST ENFORCEMENT
@@ -0,0 +1,195 @@
+# ============================================================
+# SitePulseAI Live Updates
+# Push per-domain result diffs from the monitoring loops to dashboards
+# ============================================================
+
+import asyncio
+import json
+import threading
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+SUBSCRIBER_QUEUE = 1000     # pending diffs per dashboard before it resyncs
+KEEPALIVE_SECONDS = 25      # SSE comment so idle proxies keep the stream open
+IGNORED_FIELDS = {"timestamp", "load_time"}   # change on every check, never worth a push
+
+
+# ---------------------------
+# Diff helpers
+# ---------------------------
+def _flatten(value, prefix=""):
+    """
+    Nested dicts -> {"a.b.c": leaf}. Lists and scalars are leaves.
+    """
+    flat = {}
+    for key, item in value.items():
+        if key in IGNORED_FIELDS:
+            continue
+        path = f"{prefix}{key}"
+        if isinstance(item, dict) and item:
+            flat.update(_flatten(item, path + "."))
+        else:
+            flat[path] = item
+    return flat
+
+
+def _normalize(value):
+    # Round-trip through JSON so comparisons match what dashboards receive
+    return json.loads(json.dumps(value, default=str))
+
+
+# ---------------------------
+# Feed
+# ---------------------------
+class _Subscriber:
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE)
+        self.overflowed = False
+
+    def deliver(self, message):
+        # Runs on the subscriber's loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True   # the stream resyncs with a snapshot
+
+
+class LiveFeed:
+    """
+    Latest flattened results per domain plus the connected dashboards.
+
+    publish() is called from monitoring worker threads. It compares the new
+    sections against the last published ones and fans out only changed or
+    removed paths, so an unchanged fleet sends nothing.
+    """
+
+    def __init__(self):
+        self._state = {}        # domain -> {path: value}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    # ---------------------------
+    # Producer side (any thread)
+    # ---------------------------
+    def publish(self, domain, sections):
+        """
+        sections: {section_name: result_dict}. Only the given sections are
+        compared, so different loops can publish different parts of a card.
+        """
+        flat = _normalize(_flatten(sections))
+        prefixes = tuple(f"{name}." for name in sections)
+
+        with self._lock:
+            previous = self._state.get(domain, {})
+            changes = {p: v for p, v in flat.items() if previous.get(p, object()) != v}
+            removed = [
+                p for p in previous
+                if p not in flat and (p in sections or p.startswith(prefixes))
+            ]
+            if not changes and not removed:
+                return None
+
+            current = {p: v for p, v in previous.items() if p not in removed}
+            current.update(changes)
+            self._state[domain] = current
+
+            self._seq += 1
+            message = {
+                "seq": self._seq,
+                "domain": domain,
+                "changes": changes,
+                "removed": removed,
+                "at": time.time(),
+            }
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.deliver, message)
+            except RuntimeError:
+                pass  # loop closed; the stream's finally clause unsubscribes
+
+        return message
+
+    # ---------------------------
+    # Consumer side (event loop)
+    # ---------------------------
+    def snapshot(self):
+        with self._lock:
+            return {"seq": self._seq, "domains": {d: dict(s) for d, s in self._state.items()}}
+
+    def subscribe(self):
+        subscriber = _Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+feed = LiveFeed()
+
+
+# ---------------------------
+# SSE endpoint
+# ---------------------------
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+async def _stream():
+    subscriber = feed.subscribe()
+    try:
+        # Full state first, then diffs; a dashboard that fell too far
+        # behind gets a fresh snapshot instead of an unbounded backlog
+        yield _sse("snapshot", feed.snapshot())
+
+        # Starlette cancels this generator when the client disconnects
+        while True:
+            if subscriber.overflowed:
+                subscriber.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE)
+                subscriber.overflowed = False
+                yield _sse("snapshot", feed.snapshot())
+                continue
+
+            try:
+                message = await asyncio.wait_for(subscriber.queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            yield _sse("diff", message)
+
+    finally:
+        feed.unsubscribe(subscriber)
+
+
+router = APIRouter(prefix="/live", tags=["Live Updates"])
+
+
+@router.get("/updates")
+async def live_updates():
+    """
+    Server-Sent Events: one snapshot event, then a diff event per domain
+    whose results changed.
+    """
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
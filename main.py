@@ -5,9 +5,9 @@
 
 import os
 import json
+import asyncio
 from datetime import datetime
 import threading
-import time
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -20,7 +20,7 @@ import requests
 # -----------------------
 # Existing monitoring engine
 # -----------------------
-from monitoring_engine import add_domain_to_monitoring
+from monitoring_engine import add_domain_to_monitoring, start_monitoring, scheduler
 
 
 # -----------------------
@@ -34,6 +34,14 @@ from traffic_checker import router as traffic_router
 from latency_checker import router as latency_router
 from autofix_route import router as autofix_router  # Auto-fix routes
 from risk_router import router as risk_router
+from verify_logs import router as verify_router
+
+# Concurrent per-feature probes used by /monitor
+from monitor_probes import PROBES, run_probes
+
+# Fetch-once page data shared by the HTTP checks
+from page_snapshot import get_snapshot
+import http_pool
 
 
 # -----------------------
@@ -48,7 +56,23 @@ import persistence
 # Immutable log & attestation
 # -----------------------
 from immutable_audit_log import write_audit_log
-from telemetry_attestation import generate_telemetry_attestation
+from telemetry_attestation import generate_telemetry_attestation, ATTESTATIONS
+from telemetry_event_store import TelemetryEventStore
+
+# -----------------------
+# Background monitoring cycles
+# -----------------------
+from cycle_runner import CycleRunner
+from dns_cache import prefetch as dns_prefetch
+
+# Streamed multi-domain results for the dashboard
+from batch_stream import stream_checks, MAX_BATCH_DOMAINS
+
+# Server-pushed card diffs from the monitoring loops
+from live_updates import feed as live_feed, router as live_router
+
+# Shared TTL / stale-while-revalidate cache behind the card endpoints
+from card_cache import card_cache
 
 
 
@@ -101,22 +125,27 @@ app.include_router(traffic_router)
 app.include_router(latency_router)
 app.include_router(autofix_router)
 app.include_router(risk_router)
+app.include_router(verify_router)
+app.include_router(live_router)
 
 
 # -----------------------
 # Telemetry Event storage path
 # -----------------------
 TELEMETRY_DIR = "telemetry_events"
-TELEMETRY_FILE = os.path.join(TELEMETRY_DIR, "telemetry_event_log.json")
+TELEMETRY_FILE = os.path.join(TELEMETRY_DIR, "telemetry_event_log.json")  # legacy single-array log
 os.makedirs(TELEMETRY_DIR, exist_ok=True)
 
+# Append-only, hash-chained segments (imports the legacy log on first run)
+TELEMETRY_STORE = TelemetryEventStore(TELEMETRY_DIR, legacy_file=TELEMETRY_FILE)
+
 
 
 # ============================================================
 # Existing /monitor endpoint
 # ============================================================
 @app.post("/monitor")
-def monitor(client_id: str = Query(...), domain: str = Query(...)):
+async def monitor(client_id: str = Query(...), domain: str = Query(...)):
 
     # 1️⃣ Validate license
     license_data = get_license(client_id)
@@ -133,30 +162,22 @@ def monitor(client_id: str = Query(...), domain: str = Query(...)):
     # -----------------------
     # Tier / feature enforcement
     # -----------------------
-    if "ssl" in features:
-        check_feature_access(client_id, "ssl")
-        results["ssl"] = ssl_router.check_ssl(domain)
-
-    if "uptime" in features:
-        check_feature_access(client_id, "uptime")
-        results["uptime"] = uptime_router.check_uptime(domain)
+    licensed = [feature for feature in PROBES if feature in features]
+    for feature in licensed:
+        check_feature_access(client_id, feature)
 
-    if "seo" in features:
-        check_feature_access(client_id, "seo")
-        results["seo"] = seo_router.check_seo(domain)
-
-    if "latency" in features:
-        check_feature_access(client_id, "latency")
-        results["latency"] = latency_router.check_latency(domain)
+    # -----------------------
+    # Concurrent probe fan-out
+    # -----------------------
+    probe_results, probe_timings = await run_probes(domain, licensed)
+    results.update(probe_results)
+    results["probe_timings"] = probe_timings
 
-    if "traffic" in features:
-        check_feature_access(client_id, "traffic")
-        results["traffic"] = traffic_router.check_traffic(domain)
+    # Audit / telemetry / attestation are file I/O — keep them off the event loop
+    return await asyncio.to_thread(_record_monitor_run, client_id, domain, license_data, results)
 
-    if "vulnerabilities" in features:
-        check_feature_access(client_id, "vulnerabilities")
-        results["vulnerabilities"] = vulnerabilities_router.check_vulnerabilities(domain)
 
+def _record_monitor_run(client_id, domain, license_data, results):
 
     # -----------------------
     # Immutable audit log
@@ -170,18 +191,14 @@ def monitor(client_id: str = Query(...), domain: str = Query(...)):
 
 
 
+    # Probe results as recorded by telemetry and the attestation; taken
+    # before the event record is attached so neither refers to itself
+    snapshot = dict(results)
+
     # -----------------------
     # Telemetry Event Record
     # -----------------------
     try:
-        if os.path.exists(TELEMETRY_FILE):
-            with open(TELEMETRY_FILE, "r") as f:
-                telemetry_events = json.load(f)
-        else:
-            telemetry_events = []
-
-        previous_hash = telemetry_events[-1]["event_hash"] if telemetry_events else "GENESIS"
-
         event_record = {
             "event_type": "monitoring_event",
             "event_id": f"SP-{os.urandom(4).hex().upper()}",
@@ -189,18 +206,11 @@ def monitor(client_id: str = Query(...), domain: str = Query(...)):
             "client_id": client_id,
             "domain": domain,
             "monitoring_agent": "SitePulseAI Node",
-            "previous_event_hash": previous_hash,
-            "results_snapshot": results
+            "results_snapshot": snapshot
         }
 
-        import hashlib
-        event_string = json.dumps(event_record, sort_keys=True, default=str)
-        event_hash = hashlib.sha256(event_string.encode()).hexdigest()
-        event_record["event_hash"] = event_hash
-
-        telemetry_events.append(event_record)
-        with open(TELEMETRY_FILE, "w") as f:
-            json.dump(telemetry_events, f, indent=2, default=str)
+        # Chains to the current head and fills previous_event_hash / event_hash
+        event_record = TELEMETRY_STORE.append(event_record)
 
         results["telemetry_event_record"] = event_record
 
@@ -212,7 +222,7 @@ def monitor(client_id: str = Query(...), domain: str = Query(...)):
     # -----------------------
     # Telemetry attestation certificate
     # -----------------------
-    certificate = generate_telemetry_attestation(client_id, domain, results)
+    certificate = generate_telemetry_attestation(client_id, domain, snapshot)
     results["telemetry_certificate"] = certificate
 
     return results
@@ -224,13 +234,41 @@ def monitor(client_id: str = Query(...), domain: str = Query(...)):
 # -----------------------
 @app.get("/telemetry/latest")
 def latest_telemetry():
-    if not os.path.exists(TELEMETRY_FILE):
+    latest_event = TELEMETRY_STORE.latest()
+    if latest_event is None:
         raise HTTPException(status_code=404, detail="No telemetry events found")
-    with open(TELEMETRY_FILE, "r") as f:
-        telemetry_events = json.load(f)
     return {
         "status": "ok",
-        "latest_telemetry_event": telemetry_events[-1]
+        "latest_telemetry_event": latest_event
+    }
+
+
+# -----------------------
+# Telemetry attestation lookups
+# -----------------------
+@app.get("/telemetry/attestations")
+def list_attestations(
+    client_id: str = Query(...),
+    domain: str = Query(None),
+    start: str = Query(None, description="ISO timestamp, inclusive"),
+    end: str = Query(None, description="ISO timestamp, exclusive"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    return {
+        "status": "ok",
+        "attestations": ATTESTATIONS.query(client_id, domain, start, end, limit)
+    }
+
+
+@app.get("/telemetry/attestations/{certificate}")
+def get_attestation(certificate: str):
+    record = ATTESTATIONS.get(certificate)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Attestation not found")
+    return {
+        "status": "ok",
+        "attestation": record,
+        "verified": ATTESTATIONS.verify(certificate)
     }
 
 
@@ -248,6 +286,7 @@ def latest_telemetry():
 # Persistent domain storage
 DOMAINS_FILE = "monitored_domains.json"
 MONITOR_INTERVAL = 300  # seconds (5 min)
+MONITOR_CONCURRENCY = int(os.getenv("MONITOR_CONCURRENCY", "20"))  # domains checked at once
 try:
     with open(DOMAINS_FILE, "r") as f:
         monitored_domains = json.load(f)
@@ -276,6 +315,12 @@ def add_url(payload: dict):
     if domain not in GLOBAL_SEGMENTS[segment]:
         GLOBAL_SEGMENTS[segment].append(domain)
 
+        # Segment domains ride the monitoring cycle; check this one now so
+        # its cards get a live update before the next cycle. The cycle owns
+        # it from here, so the per-domain scheduler drops it
+        scheduler.remove(domain)
+        CYCLE_RUNNER.check_now(domain)
+
     return {"status": "added", "segments": GLOBAL_SEGMENTS}
 
 
@@ -293,6 +338,11 @@ def run_monitor(domain):
 
         if results:
             print(f"[Monitor OK] {domain}")
+            # Push only what changed to connected dashboards
+            live_feed.publish(domain, {
+                "website": results.get("website", {}),
+                "security": check_vulnerabilities(domain),
+            })
         else:
             print(f"[Monitor Warning] {domain} returned no results")
 
@@ -304,18 +354,51 @@ def run_monitor(domain):
 
 
 
-# Background autonomous monitoring loop
+def cycle_domains():
+    """
+    monitored_domains plus every dashboard segment domain, deduplicated,
+    so each domain the dashboard shows gets live updates.
+    """
+    domains = list(monitored_domains)
+    for segment_domains in list(GLOBAL_SEGMENTS.values()):
+        domains += segment_domains
+    return list(dict.fromkeys(d for d in domains if d))
+
+
+# Background autonomous monitoring loop (fixed cadence, bounded concurrency)
+CYCLE_RUNNER = CycleRunner(
+    get_domains=cycle_domains,
+    check=run_monitor,
+    interval=MONITOR_INTERVAL,
+    concurrency=MONITOR_CONCURRENCY,
+    prepare=dns_prefetch,   # resolve the whole batch in parallel up front
+)
+
+
 def monitoring_loop():
-    while True:
-        for domain in monitored_domains:
-            run_monitor(domain)
-        time.sleep(MONITOR_INTERVAL)
+    CYCLE_RUNNER.run_forever()
 
 
 # Start background loop in daemon thread
 threading.Thread(target=monitoring_loop, daemon=True).start()
 
 
+@app.get("/cards/cache")
+def card_cache_stats():
+    """
+    Card cache hit / stale / miss / coalesced / probe counts per card type.
+    """
+    return card_cache.stats()
+
+
+@app.get("/monitoring/cycles")
+def monitoring_cycles():
+    """
+    Per-cycle stats: can this node keep up with its fleet?
+    """
+    return CYCLE_RUNNER.stats()
+
+
 # ============================================================
 # ROOT / HEALTH ENDPOINTS
 # ============================================================
@@ -344,59 +427,19 @@ def get_segments():
 
 
 
-def get_ssl_expiry(domain: str):
-    try:
-        context = ssl.create_default_context()
-
-        with socket.create_connection((domain, 443), timeout=5) as sock:
-            with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                cert = ssock.getpeercert()
-
-        expiry_str = cert.get('notAfter')
-        expiry_date = datetime.strptime(expiry_str, "%b %d %H:%M:%S %Y %Z")
-
-        days_remaining = (expiry_date - datetime.utcnow()).days
-
-        if days_remaining < 7:
-            status = "Critical"
-        elif days_remaining < 30:
-            status = "Warning"
-        else:
-            status = "Healthy"
-
-        return {
-            "ssl_expiry": expiry_date.strftime("%Y-%m-%d"),
-            "days_remaining": days_remaining,
-            "ssl_status": status
-        }
-
-    except Exception:
-        return {
-            "ssl_expiry": None,
-            "days_remaining": None,
-            "ssl_status": "Unknown"
-        }
-
-
-
 import requests
-import socket
-import ssl
 from datetime import datetime
+from cert_facts import get_cert_facts, days_remaining as cert_days_remaining
 
 
 def get_ssl_expiry(domain: str):
     try:
-        context = ssl.create_default_context()
-
-        with socket.create_connection((domain, 443), timeout=5) as sock:
-            with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                cert = ssock.getpeercert()
-
-        expiry_str = cert.get('notAfter')
-        expiry_date = datetime.strptime(expiry_str, "%b %d %H:%M:%S %Y %Z")
+        facts = get_cert_facts(domain)
+        if facts["error"]:
+            raise RuntimeError(facts["error"])
 
-        days_remaining = (expiry_date - datetime.utcnow()).days
+        expiry_date = facts["expires_at"]
+        days_remaining = cert_days_remaining(facts)
 
         if days_remaining < 7:
             status = "Critical"
@@ -424,15 +467,11 @@ def check_vulnerabilities(domain: str):
     issues = []
 
     try:
-        url = f"https://{domain}"
+        snapshot = get_snapshot(domain)
+        if snapshot["error"]:
+            raise RuntimeError(snapshot["error"])
 
-        response = requests.get(
-            url,
-            timeout=5,
-            headers={"User-Agent": "Mozilla/5.0"}
-        )
-
-        headers = response.headers
+        headers = snapshot["headers"]
 
         # 🔐 Security header checks
         if "X-Frame-Options" not in headers:
@@ -489,6 +528,72 @@ def check_vulnerabilities(domain: str):
     }
 
 
+def _segment_domains(segment: str):
+    """
+    Domains in a segment: in-memory segments first, then domains.json.
+    """
+    if segment in GLOBAL_SEGMENTS:
+        return GLOBAL_SEGMENTS[segment]
+
+    try:
+        with open("domains.json", "r") as f:
+            saved = json.load(f).get("segments", {})
+    except (FileNotFoundError, ValueError):
+        saved = {}
+
+    if segment not in saved:
+        raise HTTPException(status_code=404, detail=f"Unknown segment: {segment}")
+    return saved[segment]
+
+
+class BatchRequest(BaseModel):
+    domains: list[str] = []
+    segments: list[str] = []
+    format: str = "ndjson"
+
+
+def _stream_vulnerabilities(domains, segments, fmt):
+    batch = [d.strip() for d in domains if d.strip()]
+    for segment in segments:
+        batch += _segment_domains(segment)
+
+    if not batch and not segments:
+        raise HTTPException(status_code=400, detail="Provide domains or segment")
+    if fmt not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be ndjson or sse")
+
+    batch = list(dict.fromkeys(batch))
+    if len(batch) > MAX_BATCH_DOMAINS:
+        raise HTTPException(status_code=400, detail=f"Batch limited to {MAX_BATCH_DOMAINS} domains")
+
+    return stream_checks(batch, check_vulnerabilities, fmt=fmt)
+
+
+@app.get("/batch/vulnerabilities")
+def batch_vulnerabilities(
+    domains: str = Query(None, description="Comma-separated domains"),
+    segment: str = Query(None, description="Segment name from /segments"),
+    format: str = Query("ndjson", description="ndjson or sse"),
+):
+    """
+    Vulnerability cards for many domains over one connection, streamed
+    as NDJSON or Server-Sent Events in completion order.
+    """
+    return _stream_vulnerabilities(
+        domains.split(",") if domains else [],
+        [segment] if segment else [],
+        format,
+    )
+
+
+@app.post("/batch/vulnerabilities")
+def batch_vulnerabilities_post(payload: BatchRequest):
+    """
+    Same stream for batches too long for a query string.
+    """
+    return _stream_vulnerabilities(payload.domains, payload.segments, payload.format)
+
+
 # ============================================================
 # FASTAPI STARTUP / SHUTDOWN
 # ============================================================
@@ -505,7 +610,17 @@ async def startup_event():
     print("🤖 Auto-Fix engine ready (skeleton).")
     os.makedirs("licenses", exist_ok=True)
     os.makedirs(TELEMETRY_DIR, exist_ok=True)
+    persistence.get_logger()  # starts background log rotation
+    await http_pool.start()
+
+    # Licensed sites + tenant domains on the per-domain scheduler, except
+    # those the monitoring cycle already checks (one loop per domain)
+    threading.Thread(
+        target=start_monitoring, kwargs={"skip": cycle_domains()}, name="monitor-boot", daemon=True
+    ).start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    print("🛑 SitePulseAI Backend shutting down.")
\ No newline at end of file
+    print("🛑 SitePulseAI Backend shutting down.")
+    persistence.get_logger().close()  # stops rotation, writes any unsigned batch
+    await http_pool.close()
\ No newline at end of file
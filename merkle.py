@@ -0,0 +1,57 @@
+# ============================================================
+# SitePulseAI Merkle Helpers
+# Inclusion proofs for batch-signed telemetry events
+# ============================================================
+
+import hashlib
+
+# Domain separation between leaves and inner nodes (RFC 6962 style)
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def _leaf(event_hash):
+    return hashlib.sha256(LEAF_PREFIX + bytes.fromhex(event_hash)).digest()
+
+
+def _node(left, right):
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def build_tree(event_hashes):
+    """
+    Returns (root_hex, proofs) for a list of hex event hashes.
+    proofs[i] is a list of [side, sibling_hex] pairs from leaf to root;
+    side "L" means the sibling sits on the left. An unpaired node is
+    carried up a level unchanged, so it adds nothing to the proof.
+    """
+    level = [_leaf(h) for h in event_hashes]
+    positions = list(range(len(level)))
+    proofs = [[] for _ in event_hashes]
+
+    while len(level) > 1:
+        for leaf_index, pos in enumerate(positions):
+            sibling = pos ^ 1
+            if sibling < len(level):
+                side = "L" if sibling < pos else "R"
+                proofs[leaf_index].append([side, level[sibling].hex()])
+
+        level = [
+            _node(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+        positions = [pos // 2 for pos in positions]
+
+    root = level[0].hex() if level else ""
+    return root, proofs
+
+
+def verify_proof(event_hash, proof, root_hex):
+    """
+    True if event_hash is included under root_hex via proof.
+    """
+    node = _leaf(event_hash)
+    for side, sibling_hex in proof:
+        sibling = bytes.fromhex(sibling_hex)
+        node = _node(sibling, node) if side == "L" else _node(node, sibling)
+    return node.hex() == root_hex
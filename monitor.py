@@ -1,6 +1,6 @@
 import time
-import httpx
 from bs4 import BeautifulSoup
+from page_snapshot import get_snapshot
 
 # ---------------------------
 # Single website check
@@ -17,17 +17,17 @@ def check_website(url: str):
     }
 
     try:
-        start = time.time()
-        response = httpx.get(url, timeout=10)
-        duration = time.time() - start
+        snapshot = get_snapshot(url)
+        if snapshot["error"]:
+            raise RuntimeError(snapshot["error"])
 
-        result["status_code"] = response.status_code
-        result["load_time"] = round(duration, 2)
+        result["status_code"] = snapshot["status_code"]
+        result["load_time"] = round(snapshot["timings"]["total_ms"] / 1000, 2)
 
-        if response.status_code != 200:
-            result["alerts"].append(f"Non-200 status: {response.status_code}")
+        if snapshot["status_code"] != 200:
+            result["alerts"].append(f"Non-200 status: {snapshot['status_code']}")
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(snapshot["body"], "html.parser")
         result["title"] = soup.title.string if soup.title else None
 
         meta_desc = soup.find("meta", attrs={"name": "description"})
@@ -0,0 +1,101 @@
+# ============================================================
+# SitePulseAI Probe Fan-out
+# Runs every licensed per-feature probe for a domain concurrently
+# ============================================================
+
+import asyncio
+import inspect
+import time
+
+from ssl_automation import ssl_card
+from uptime import uptime_card
+from seo_checker import seo_card
+from latency_checker import latency_card
+from traffic_checker import traffic_card
+from vulnerabilities import scan_domain
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+PROBE_TIMEOUT = 12.0    # seconds, deadline for a single probe
+REQUEST_BUDGET = 20.0   # seconds, deadline for the whole fan-out
+
+# Feature name -> probe callable (sync probes run in worker threads).
+# The card endpoints are served through the shared card cache.
+PROBES = {
+    "ssl": ssl_card,
+    "uptime": uptime_card,
+    "seo": seo_card,
+    "latency": latency_card,
+    "traffic": traffic_card,
+    "vulnerabilities": scan_domain,
+}
+
+
+# ---------------------------
+# Single probe with deadline
+# ---------------------------
+async def _run_probe(feature, domain, timeout):
+    probe = PROBES[feature]
+    timing = {"duration_ms": None, "timed_out": False}
+
+    start = time.perf_counter()
+    try:
+        if inspect.iscoroutinefunction(probe):
+            call = probe(domain)
+        else:
+            call = asyncio.to_thread(probe, domain)
+
+        result = await asyncio.wait_for(call, timeout)
+
+    except asyncio.TimeoutError:
+        # Blocking probes keep running in their thread; we just stop waiting
+        timing["timed_out"] = True
+        result = {"status": "Timeout"}
+
+    except Exception as e:
+        timing["error"] = str(e)
+        result = {"status": "Error", "error": str(e)}
+
+    timing["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result, timing
+
+
+# ---------------------------
+# Fan-out for one domain
+# ---------------------------
+async def run_probes(domain, features, probe_timeout=PROBE_TIMEOUT, budget=REQUEST_BUDGET):
+    """
+    Runs the requested probes for a domain at the same time.
+    Returns (results, timings) keyed by feature, in PROBES order.
+    Probes still running when the budget is spent are cancelled and
+    reported as timed out.
+    """
+    tasks = {
+        feature: asyncio.create_task(_run_probe(feature, domain, probe_timeout))
+        for feature in PROBES
+        if feature in features
+    }
+
+    done = set()
+    if tasks:
+        done, pending = await asyncio.wait(tasks.values(), timeout=budget)
+        for task in pending:
+            task.cancel()
+
+    results = {}
+    timings = {}
+
+    for feature, task in tasks.items():
+        if task in done:
+            results[feature], timings[feature] = task.result()
+        else:
+            results[feature] = {"status": "Timeout"}
+            timings[feature] = {
+                "duration_ms": round(budget * 1000, 2),
+                "timed_out": True,
+                "budget_exceeded": True,
+            }
+
+    return results, timings
@@ -3,10 +3,17 @@
 # Autonomous Monitoring Layer
 # ============================================================
 
-import time
+import asyncio
+import heapq
+import itertools
+import random
 import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from live_updates import feed as live_feed
 from monitor import run_full_check
 from site_manager import get_all_sites
+from tenant_registry import REGISTRY as TENANT_REGISTRY
 
 
 
@@ -14,9 +21,7 @@ from site_manager import get_all_sites
 # Configuration
 # ---------------------------
 MONITOR_INTERVAL = 300  # seconds (5 minutes)
-
-# Track active threads (prevents duplicates)
-active_threads = {}
+MAX_WORKERS = 16        # concurrent checks, regardless of domain count
 
 # ============================================================
 # Core Monitoring Function
@@ -29,6 +34,7 @@ def run_monitor(domain):
 
         if results:
             print(f"[Monitoring Success] {domain}")
+            live_feed.publish(domain, {"website": results.get("website", {})})
         else:
             print(f"[Monitoring Warning] {domain} returned no results")
 
@@ -40,54 +46,194 @@ def run_monitor(domain):
 
 
 # ============================================================
-# Per-Domain Monitoring Loop (Autonomous)
+# Async Scheduler (replaces thread-per-domain loops)
 # ============================================================
-def monitor_domain_loop(domain):
-    while True:
-        run_monitor(domain)
-        time.sleep(MONITOR_INTERVAL)
+class MonitoringScheduler:
+    """
+    One event loop thread plus a bounded worker pool for every domain.
+
+    Domains sit in a min-heap keyed by next-due time. New domains get a
+    random offset inside the interval so checks spread out instead of
+    firing together at boot. Each domain keeps a fixed cadence, and a
+    domain whose previous check is still running is skipped, not stacked.
+    """
+
+    def __init__(self, interval=MONITOR_INTERVAL, workers=MAX_WORKERS):
+        self.interval = interval
+        self.workers = workers
+
+        self._heap = []             # (due, seq, domain, generation)
+        self._generation = {}       # domain -> generation (lazy heap deletion)
+        self._running = set()       # domains with a check in flight
+        self._seq = itertools.count()
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="monitor")
+        self._loop = None
+        self._queue = None
+        self._wakeup = None
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    def start(self):
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            threading.Thread(target=self._run_loop, name="monitor-scheduler", daemon=True).start()
+            self._ready.wait()
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._main())
+
+    async def _main(self):
+        self._queue = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._ready.set()
+
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        await self._dispatch()
+        for worker in workers:
+            worker.cancel()
+
+    # ---------------------------
+    # Dispatcher + workers
+    # ---------------------------
+    async def _dispatch(self):
+        while True:
+            now = self._loop.time()
+
+            while self._heap and self._heap[0][0] <= now:
+                due, _, domain, generation = heapq.heappop(self._heap)
+                if self._generation.get(domain) != generation:
+                    continue  # removed or re-added since this entry was pushed
+
+                # Fixed cadence; if we fell behind, resume from now
+                next_due = due + self.interval
+                if next_due <= now:
+                    next_due = now + self.interval
+                heapq.heappush(self._heap, (next_due, next(self._seq), domain, generation))
+
+                if domain in self._running:
+                    print(f"[Monitoring Skipped] {domain} still running")
+                    continue
+
+                self._running.add(domain)
+                self._queue.put_nowait(domain)
+
+            timeout = self._heap[0][0] - now if self._heap else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self):
+        while True:
+            domain = await self._queue.get()
+            try:
+                await self._loop.run_in_executor(self._executor, run_monitor, domain)
+            finally:
+                self._running.discard(domain)
+
+    # ---------------------------
+    # Loop-side mutations
+    # ---------------------------
+    def _add(self, domain, delay):
+        if domain in self._generation:
+            return
+        generation = next(self._seq)
+        self._generation[domain] = generation
+        heapq.heappush(self._heap, (self._loop.time() + delay, next(self._seq), domain, generation))
+        self._wakeup.set()
+
+    def _remove(self, domain):
+        self._generation.pop(domain, None)
+
+    # ---------------------------
+    # Thread-safe public API
+    # ---------------------------
+    def add(self, domain, delay=None):
+        """
+        Schedule a domain; delay defaults to a random offset in the interval.
+        """
+        self.start()
+        if delay is None:
+            delay = random.uniform(0, self.interval)
+        self._loop.call_soon_threadsafe(self._add, domain, delay)
+
+    def remove(self, domain):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._remove, domain)
+
+    def domains(self):
+        return list(self._generation)
+
+    def __contains__(self, domain):
+        return domain in self._generation
+
+
+scheduler = MonitoringScheduler()
 
 
 # ============================================================
 # Start Monitoring for All Sites (Initial Boot)
 # ============================================================
-def start_monitoring():
+def start_monitoring(skip=()):
+    """
+    skip: domains another monitoring loop already owns; they are not
+    scheduled here, so no domain is checked twice per interval.
+    """
     print("🚀 Monitoring Engine: ACTIVE")
+    skip = set(skip)
 
-    sites = get_all_sites()
+    try:
+        sites = get_all_sites()
+    except FileNotFoundError:
+        print("[Monitoring] No license/license.json; scheduling tenant domains only")
+        sites = []
 
     for site in sites:
-        start_domain_thread(site)
+        if site not in skip:
+            start_domain_monitoring(site)
+
+    # Tenant domains are paged out of the registry, not loaded at once
+    for domain in TENANT_REGISTRY.iter_all_domains():
+        if domain not in skip:
+            start_domain_monitoring(domain)
 
 
 # ============================================================
-# Start Individual Domain Thread
+# Schedule Individual Domain
 # ============================================================
-def start_domain_thread(domain):
-    if domain in active_threads:
-        print(f"[Thread Exists] {domain} already being monitored")
+def start_domain_monitoring(domain, delay=None):
+    if domain in scheduler:
+        print(f"[Monitoring Exists] {domain} already being monitored")
         return
 
-    print(f"[Thread Starting] {domain}")
-
-    thread = threading.Thread(
-        target=monitor_domain_loop,
-        args=(domain,),
-        daemon=True
-    )
-
-    active_threads[domain] = thread
-    thread.start()
+    print(f"[Monitoring Scheduled] {domain}")
+    scheduler.add(domain, delay)
 
 
 # ============================================================
-# Dynamic Hook (Used by /add_url)
+# Dynamic Hooks (Used by /add_url)
 # ============================================================
 def add_domain_to_monitoring(domain):
     """
     Called when a new domain is added via API
     """
-    start_domain_thread(domain)
+    # Next scheduled check is a full interval out; this call runs one now
+    start_domain_monitoring(domain, delay=scheduler.interval)
 
     # 🔥 Immediate execution (no waiting)
-    return run_monitor(domain)
\ No newline at end of file
+    return run_monitor(domain)
+
+
+def remove_domain_from_monitoring(domain):
+    """
+    Stop scheduling checks for a domain (an in-flight check still finishes)
+    """
+    scheduler.remove(domain)
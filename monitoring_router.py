@@ -1,63 +1,206 @@
 import os
-from generate_certificate import generate_certificate
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from generate_certificate import generate_site_certificate, generate_site_certificates
+from tenant_registry import REGISTRY
 from datetime import datetime
 
 # =========================
-# Tenant Registry (Memory-based for now)
+# Configuration
 # =========================
 
-TENANT_REGISTRY = {}
+ROUTER_WORKERS = int(os.getenv("ROUTER_WORKERS", "8"))   # domains processed at once, across all tenants
+
+# =========================
+# Tenant Registry (persistent, see tenant_registry.py)
+# =========================
+
+TENANT_REGISTRY = REGISTRY
+
+# client_id -> progress of the latest routing cycle
+TENANT_PROGRESS = {}
+_PROGRESS_LOCK = threading.Lock()
 
 
 def register_tenant(client_id, domains):
     """
     Registers a client and their domains in the monitoring system
     """
-    TENANT_REGISTRY[client_id] = {
-        "domains": domains,
-        "created_at": datetime.utcnow().isoformat()
-    }
+    count = TENANT_REGISTRY.register(client_id, domains)
 
     print(f"[ROUTER] Tenant registered: {client_id}")
-    print(f"[ROUTER] Domains: {len(domains)}")
+    print(f"[ROUTER] Domains: {count}")
+
+
+# =========================
+# Job Runner Helpers
+# =========================
+
+def _process_domain(client_id, domain):
+    """
+    Runs the certificate generator for one domain and records the outcome
+    """
+    start = time.perf_counter()
+    record = {"client_id": client_id, "domain": domain}
+
+    try:
+        record["certificate"] = generate_site_certificate(domain)
+        record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e)
+
+    record["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return record
+
+
+def _round_robin(queues):
+    """
+    Yields (client_id, domain), taking one domain from each tenant in turn
+    so a large tenant cannot hold the pool while small ones wait
+    """
+    while queues:
+        for client_id in list(queues):
+            pending = queues[client_id]
+            yield client_id, pending.popleft()
+            if not pending:
+                del queues[client_id]
+
+
+def _start_progress(client_id, total):
+    with _PROGRESS_LOCK:
+        TENANT_PROGRESS[client_id] = {
+            "client_id": client_id,
+            "status": "running" if total else "complete",
+            "total": total,
+            "completed": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "started_at": datetime.utcnow().isoformat(),
+            "finished_at": None if total else datetime.utcnow().isoformat(),
+        }
+
+
+def _record_progress(record):
+    with _PROGRESS_LOCK:
+        progress = TENANT_PROGRESS[record["client_id"]]
+        progress["completed"] += 1
+        progress["succeeded" if record["status"] == "ok" else "failed"] += 1
+
+        if progress["completed"] == progress["total"]:
+            progress["status"] = "complete"
+            progress["finished_at"] = datetime.utcnow().isoformat()
+
+        snapshot = dict(progress)
+
+    print(
+        f"[ROUTER] {record['client_id']}: {snapshot['completed']}/{snapshot['total']} "
+        f"{record['domain']} {record['status']} ({record['duration_ms']} ms)"
+    )
+    return snapshot
+
+
+def get_progress(client_id=None):
+    """
+    Progress of the latest cycle for one tenant, or for every tenant
+    """
+    with _PROGRESS_LOCK:
+        if client_id is not None:
+            progress = TENANT_PROGRESS.get(client_id)
+            return dict(progress) if progress else None
+        return {cid: dict(p) for cid, p in TENANT_PROGRESS.items()}
 
 
 # =========================
 # Monitoring Router Core
 # =========================
 
-def route_monitoring_event(client_id):
+def route_monitoring_events(client_ids=None, workers=ROUTER_WORKERS, on_progress=None):
     """
-    Routes all domains under a tenant into the certificate generator
+    Routes the domains of several tenants through one bounded worker pool.
+
+    Domains are interleaved round-robin across tenants and only `workers`
+    jobs are in flight at a time. on_progress(progress) is called after
+    each domain finishes. Returns client_id -> list of per-domain records.
     """
+    client_ids = list(TENANT_REGISTRY) if client_ids is None else list(client_ids)
 
-    if client_id not in TENANT_REGISTRY:
-        raise Exception("Tenant not registered")
+    for client_id in client_ids:
+        if client_id not in TENANT_REGISTRY:
+            raise Exception(f"Tenant not registered: {client_id}")
+
+    queues = {}
+    results = {}
+    for client_id in client_ids:
+        domains = list(TENANT_REGISTRY[client_id]["domains"])
+        print(f"\n[ROUTER] Starting monitoring cycle for: {client_id}")
+        print(f"[ROUTER] Domains detected: {len(domains)}")
+
+        _start_progress(client_id, len(domains))
+        results[client_id] = []
+        if domains:
+            queues[client_id] = deque(domains)
 
-    domains = TENANT_REGISTRY[client_id]["domains"]
+    jobs = _round_robin(queues)
+    in_flight = set()
 
-    print(f"\n[ROUTER] Starting monitoring cycle for: {client_id}")
-    print(f"[ROUTER] Domains detected: {len(domains)}")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="router") as executor:
 
-    results = []
+        def submit_next():
+            for client_id, domain in jobs:
+                in_flight.add(executor.submit(_process_domain, client_id, domain))
+                return True
+            return False
 
-    for domain in domains:
+        while len(in_flight) < workers and submit_next():
+            pass
 
-        print(f"\n[ROUTER] Processing domain: {domain}")
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
 
-        # Call your EXISTING system (no logic changes)
-        result = generate_certificate(domain)
+            for future in done:
+                in_flight.discard(future)
+                record = future.result()
+                results[record["client_id"]].append(record)
 
-        results.append({
-            "domain": domain,
-            "status": "processed"
-        })
+                progress = _record_progress(record)
+                if on_progress:
+                    on_progress(progress)
+
+                submit_next()
 
     print("\n[ROUTER] Monitoring cycle complete")
 
     return results
 
 
+def route_monitoring_event(client_id):
+    """
+    Routes all domains under a tenant into the certificate generator
+    """
+
+    if client_id not in TENANT_REGISTRY:
+        raise Exception("Tenant not registered")
+
+    return route_monitoring_events([client_id])[client_id]
+
+
+def route_monitoring_batch(client_id):
+    """
+    Generates every certificate for a tenant as one bundled batch
+    """
+
+    if client_id not in TENANT_REGISTRY:
+        raise Exception("Tenant not registered")
+
+    domains = TENANT_REGISTRY.domains(client_id)
+    print(f"\n[ROUTER] Batch certificate run for: {client_id} ({len(domains)} domains)")
+
+    return generate_site_certificates(domains)
+
+
 # =========================
 # Example Execution
 # =========================
@@ -76,4 +219,4 @@ if __name__ == "__main__":
 
     register_tenant(client_id, domains)
 
-    route_monitoring_event(client_id)
\ No newline at end of file
+    route_monitoring_event(client_id)
@@ -0,0 +1,138 @@
+# ============================================================
+# SitePulseAI Page Snapshot
+# Fetch-once page data shared by every HTTP-based checker
+# ============================================================
+
+import os
+import time
+
+import httpx
+
+import http_pool
+from dns_cache import resolve
+from expiring_cache import ExpiringCache
+from ssl_utils import normalize_domain
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+SNAPSHOT_TTL = 60         # seconds — checks within one cycle share a fetch
+SNAPSHOT_TIMEOUT = 10.0   # seconds
+USER_AGENT = "Mozilla/5.0 (compatible; SitePulseAI Monitor)"
+
+SNAPSHOT_CACHE_MAX = int(os.getenv("SNAPSHOT_CACHE_MAX", "1000"))  # snapshots kept (bodies included)
+
+# domain -> snapshot dict; bounded, expired snapshots are dropped. Its
+# per-domain locks make concurrent checkers wait for one fetch
+_SNAPSHOTS = ExpiringCache(SNAPSHOT_CACHE_MAX, lambda s: s["fetched_at"] + SNAPSHOT_TTL)
+
+
+# ---------------------------
+# Internal Helpers
+# ---------------------------
+def _span_ms(marks, name):
+    start = marks.get(f"{name}.started")
+    end = marks.get(f"{name}.complete")
+    if start is None or end is None:
+        return None
+    return round((end - start) * 1000, 2)
+
+
+def _timings(marks, total_seconds, dns):
+    """
+    Build the timing breakdown from httpcore trace marks.
+    connect_ms and tls_ms are None when a pooled connection was reused.
+    """
+    return {
+        # Lookup cost is reported once, when the record entered the DNS cache
+        "dns_ms": dns["lookup_ms"],
+        "dns_cached": dns["cached"],
+        "connect_ms": _span_ms(marks, "connection.connect_tcp"),
+        "tls_ms": _span_ms(marks, "connection.start_tls"),
+        "ttfb_ms": (
+            round((marks["http.receive_response_headers.complete"]
+                   - marks["http.send_request_headers.started"]) * 1000, 2)
+            if "http.send_request_headers.started" in marks
+            and "http.receive_response_headers.complete" in marks
+            else None
+        ),
+        "download_ms": _span_ms(marks, "http.receive_response_body"),
+        "total_ms": round(total_seconds * 1000, 2),
+    }
+
+
+def _fetch(domain):
+    url = f"https://{domain}"
+    marks = {}
+
+    def trace(event_name, info):
+        # http11.* and http2.* events share one namespace; redirects keep the last hop
+        for prefix in ("http11.", "http2."):
+            if event_name.startswith(prefix):
+                event_name = "http." + event_name[len(prefix):]
+        marks[event_name] = time.perf_counter()
+
+    snapshot = {
+        "domain": domain,
+        "url": url,
+        "final_url": None,
+        "status_code": None,
+        "headers": httpx.Headers(),
+        "body": "",
+        "timings": None,
+        "fetched_at": time.time(),
+        "error": None,
+    }
+
+    # Resolve up front so lookup latency is its own metric; the HTTP pool
+    # then connects from the cached record
+    dns = resolve(domain)
+
+    start = time.perf_counter()
+    try:
+        # Shared keep-alive pool: warm connections skip DNS/TCP/TLS setup
+        response = http_pool.fetch_sync(
+            url,
+            timeout=SNAPSHOT_TIMEOUT,
+            headers={"User-Agent": USER_AGENT},
+            extensions={"trace": trace},
+        )
+
+        snapshot["final_url"] = str(response.url)
+        snapshot["status_code"] = response.status_code
+        snapshot["headers"] = response.headers
+        snapshot["body"] = response.text
+
+    except Exception as e:
+        snapshot["error"] = str(e)
+
+    snapshot["timings"] = _timings(marks, time.perf_counter() - start, dns)
+    return snapshot
+
+
+# ---------------------------
+# Public API
+# ---------------------------
+def get_snapshot(domain: str, max_age: float = SNAPSHOT_TTL) -> dict:
+    """
+    Return the page snapshot for a domain (or URL), fetching it at most
+    once per max_age seconds. The snapshot must be treated as read-only.
+    """
+    domain = normalize_domain(domain)
+
+    with _SNAPSHOTS.lock(domain):
+        snapshot = _SNAPSHOTS.get(domain)
+        if snapshot and time.time() - snapshot["fetched_at"] < max_age:
+            return snapshot
+
+        snapshot = _fetch(domain)
+        _SNAPSHOTS.put(domain, snapshot)
+        return snapshot
+
+
+def invalidate_snapshot(domain: str):
+    """
+    Drop a cached snapshot so the next checker fetches fresh data.
+    """
+    _SNAPSHOTS.pop(normalize_domain(domain))
@@ -1,6 +1,8 @@
 import os
 import json
 import hashlib
+import atexit
+import threading
 import zipfile
 from datetime import datetime, timedelta
 
@@ -8,10 +10,19 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives import serialization
 
+from telemetry_event_store import read_last_line
+from merkle import build_tree
+
 
 LOG_DIR = "logs/telemetry"
 ARCHIVE_DIR = "logs/archive"
 KEY_PATH = "security/signing_key.pem"
+ROTATION_INTERVAL = 3600  # seconds between archive sweeps
+
+# Batch signing: one signature per Merkle root over up to BATCH_SIZE events
+# or BATCH_INTERVAL_MS of events, whichever comes first. 0 = sign every event.
+BATCH_SIZE = int(os.getenv("TELEMETRY_BATCH_SIZE", "0"))
+BATCH_INTERVAL_MS = int(os.getenv("TELEMETRY_BATCH_INTERVAL_MS", "200"))
 
 os.makedirs(LOG_DIR, exist_ok=True)
 os.makedirs(ARCHIVE_DIR, exist_ok=True)
@@ -37,16 +48,13 @@ def get_last_hash(log_file):
     if not os.path.exists(log_file):
         return ""
 
-    with open(log_file, "rb") as f:
-
-        lines = f.readlines()
-
-        if not lines:
-            return ""
+    # Tail read — cost does not grow with the size of the daily log
+    last_line = read_last_line(log_file)
 
-        last = json.loads(lines[-1])
+    if not last_line:
+        return ""
 
-        return last["hash"]
+    return json.loads(last_line)["hash"]
 
 
 # -----------------------------
@@ -92,36 +100,193 @@ def compress_old_logs():
 
 
 # -----------------------------
-# Main logging function
+# Long-lived telemetry logger
 # -----------------------------
-def log_event(event):
-
-    private_key = load_private_key()
+class TelemetryLogger:
+    """
+    Signs and hash-chains telemetry events into daily log files.
+
+    The signing key is loaded once and the chain head of each daily file
+    is kept in memory, so logging an event is one hash, one signature and
+    one appended line. Archiving runs on a background timer.
 
-    date = datetime.utcnow().strftime("%Y-%m-%d")
-    log_file = f"{LOG_DIR}/{date}.log"
+    With batch_size > 0 events are still chained one by one, but they are
+    held until the block seals (batch_size events or batch_interval_ms).
+    The block is then signed once over its Merkle root. Each record carries
+    a "batch" field with the root, its signature and the event's inclusion
+    proof, so it can still be verified on its own.
+    """
 
-    event["timestamp"] = datetime.utcnow().isoformat()
-
-    prev_hash = get_last_hash(log_file)
-
-    event["prev_hash"] = prev_hash
+    def __init__(self, log_dir=LOG_DIR, key_path=KEY_PATH,
+                 batch_size=BATCH_SIZE, batch_interval_ms=BATCH_INTERVAL_MS):
+        self.log_dir = log_dir
+        self.key_path = key_path
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval_ms / 1000
+        self._private_key = None
+        self._last_hash = {}      # daily log file -> last event hash
+        self._pending = []        # (log_file, event) awaiting a batch signature
+        self._batch_timer = None
+        self._lock = threading.Lock()
+        self._rotation_thread = None
+        self._stop = threading.Event()
+
+        if self.batch_size > 0:
+            # Held events would be lost on exit without a final seal
+            atexit.register(self.flush)
+
+    def _key(self):
+        if self._private_key is None:
+            with open(self.key_path, "rb") as key_file:
+                self._private_key = serialization.load_pem_private_key(
+                    key_file.read(),
+                    password=None
+                )
+        return self._private_key
+
+    def _prev_hash(self, log_file):
+        if log_file not in self._last_hash:
+            # New day: forget earlier files, seed from disk (restart-safe)
+            self._last_hash = {log_file: get_last_hash(log_file)}
+        return self._last_hash[log_file]
+
+    def log(self, event):
+
+        private_key = self._key()
+
+        with self._lock:
+
+            now = datetime.utcnow()
+            log_file = f"{self.log_dir}/{now.strftime('%Y-%m-%d')}.log"
+
+            event["timestamp"] = now.isoformat()
+
+            prev_hash = self._prev_hash(log_file)
+
+            event["prev_hash"] = prev_hash
+
+            event_json = json.dumps(event, sort_keys=True)
+
+            event_hash = hashlib.sha256(
+                (event_json + prev_hash).encode()
+            ).hexdigest()
+
+            event["hash"] = event_hash
+
+            self._last_hash[log_file] = event_hash
+
+            if self.batch_size > 0:
+                self._pending.append((log_file, event))
+
+                if len(self._pending) >= self.batch_size:
+                    self._seal_batch()
+                elif self._batch_timer is None:
+                    self._batch_timer = threading.Timer(self.batch_interval, self.flush)
+                    self._batch_timer.daemon = True
+                    self._batch_timer.start()
+
+                return event
+
+            event["signature"] = sign_event(private_key, event_hash)
+
+            with open(log_file, "a") as f:
+
+                f.write(json.dumps(event) + "\n")
+
+        return event
+
+    # -----------------------------
+    # Batch signing
+    # -----------------------------
+    def _seal_batch(self):
+        """
+        Sign the pending block's Merkle root and write its events.
+        Caller holds self._lock.
+        """
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+
+        root, proofs = build_tree([event["hash"] for _, event in pending])
+        signature = sign_event(self._key(), root)
+
+        lines = {}
+        for index, (log_file, event) in enumerate(pending):
+            event["batch"] = {
+                "root": root,
+                "signature": signature,
+                "index": index,
+                "size": len(pending),
+                "proof": proofs[index],
+            }
+            lines.setdefault(log_file, []).append(json.dumps(event) + "\n")
+
+        # A block can straddle midnight, so group writes per daily file
+        for log_file, file_lines in lines.items():
+            with open(log_file, "a") as f:
+                f.writelines(file_lines)
+
+    def flush(self):
+        """
+        Seal and write any events still waiting for a batch signature.
+        """
+        with self._lock:
+            self._seal_batch()
+
+    def close(self):
+        self.stop_rotation()
+        self.flush()
+
+    # -----------------------------
+    # Background rotation
+    # -----------------------------
+    def _rotation_loop(self, interval):
+        while not self._stop.is_set():
+            try:
+                compress_old_logs()
+            except Exception as e:
+                print(f"[Telemetry Rotation Error] {e}")
+            self._stop.wait(interval)
+
+    def start_rotation(self, interval=ROTATION_INTERVAL):
+        if self._rotation_thread and self._rotation_thread.is_alive():
+            return
+        self._stop.clear()
+        self._rotation_thread = threading.Thread(
+            target=self._rotation_loop,
+            args=(interval,),
+            daemon=True
+        )
+        self._rotation_thread.start()
 
-    event_json = json.dumps(event, sort_keys=True)
+    def stop_rotation(self):
+        self._stop.set()
 
-    event_hash = hashlib.sha256(
-        (event_json + prev_hash).encode()
-    ).hexdigest()
 
-    event["hash"] = event_hash
+_LOGGER = None
+_LOGGER_LOCK = threading.Lock()
 
-    signature = sign_event(private_key, event_hash)
 
-    event["signature"] = signature
+def get_logger():
+    """
+    Process-wide TelemetryLogger (rotation starts with it)
+    """
+    global _LOGGER
+    with _LOGGER_LOCK:
+        if _LOGGER is None:
+            _LOGGER = TelemetryLogger()
+            _LOGGER.start_rotation()
+        return _LOGGER
 
-    with open(log_file, "a") as f:
 
-        f.write(json.dumps(event) + "\n")
+# -----------------------------
+# Main logging function
+# -----------------------------
+def log_event(event):
 
-    # run rotation check
-    compress_old_logs()
\ No newline at end of file
+    return get_logger().log(event)
@@ -1,22 +1,23 @@
+import asyncio
+import time
 from datetime import datetime
-import requests
+from page_snapshot import get_snapshot
 from vulnerabilities import scan_domain as vuln_scan
-import ssl
-import socket
+from cert_facts import get_cert_facts, days_remaining as cert_days_remaining
 
 # -----------------------------
 # Uptime + Response
 # -----------------------------
 def get_metrics(domain):
     try:
-        start = datetime.utcnow()
-        r = requests.get(f"https://{domain}", timeout=5)
-        end = datetime.utcnow()
+        snapshot = get_snapshot(domain)
+        if snapshot["error"]:
+            raise RuntimeError(snapshot["error"])
 
-        response_time = int((end - start).total_seconds() * 1000)
+        response_time = int(snapshot["timings"]["total_ms"])
 
         return {
-            "status": "Online" if r.status_code == 200 else "Degraded",
+            "status": "Online" if snapshot["status_code"] == 200 else "Degraded",
             "response_time_ms": response_time
         }
     except:
@@ -30,14 +31,11 @@ def get_metrics(domain):
 # -----------------------------
 def get_ssl(domain):
     try:
-        ctx = ssl.create_default_context()
-        with ctx.wrap_socket(socket.socket(), server_hostname=domain) as s:
-            s.settimeout(3)
-            s.connect((domain, 443))
-            cert = s.getpeercert()
+        facts = get_cert_facts(domain)
+        if facts["error"]:
+            raise RuntimeError(facts["error"])
 
-        expires_at = datetime.strptime(cert['notAfter'], "%b %d %H:%M:%S %Y %Z")
-        days_remaining = (expires_at - datetime.utcnow()).days
+        days_remaining = cert_days_remaining(facts)
 
         status = "valid"
         if days_remaining <= 0:
@@ -61,12 +59,44 @@ def get_ssl(domain):
 # -----------------------------
 # UNIFIED RISK PIPELINE
 # -----------------------------
-def build_risk(domain):
+SIGNAL_TIMEOUT = 10.0   # seconds, deadline for each signal
+
+# Used when a signal times out or fails, so the card still renders
+SIGNAL_FALLBACKS = {
+    "metrics": {"status": "Unknown", "response_time_ms": None},
+    "ssl": {"days_remaining": None, "status": "unknown"},
+    "vulnerabilities": {"counts": {}},
+}
+
+
+async def _signal(name, call, timeout):
+    start = time.perf_counter()
+    try:
+        value = await asyncio.wait_for(call, timeout)
+        status = "ok"
+    except asyncio.TimeoutError:
+        value, status = SIGNAL_FALLBACKS[name], "timeout"
+    except Exception as e:
+        print(f"[Risk] {name} signal failed: {e}")
+        value, status = SIGNAL_FALLBACKS[name], "error"
+
+    return value, {"status": status, "duration_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+
+async def build_risk(domain, timeout=SIGNAL_TIMEOUT):
+    """
+    Collect uptime, SSL and vulnerability signals concurrently.
+    Latency is the slowest signal (capped by timeout); signals that miss
+    the deadline are reported with fallback values and partial=True.
+    """
     domain = domain.lower().strip()
 
-    metrics = get_metrics(domain)
-    ssl_data = get_ssl(domain)
-    vuln = vuln_scan(domain)
+    (metrics, metrics_signal), (ssl_data, ssl_signal), (vuln, vuln_signal) = await asyncio.gather(
+        _signal("metrics", asyncio.to_thread(get_metrics, domain), timeout),
+        _signal("ssl", asyncio.to_thread(get_ssl, domain), timeout),
+        _signal("vulnerabilities", vuln_scan(domain), timeout),
+    )
+    signals = {"metrics": metrics_signal, "ssl": ssl_signal, "vulnerabilities": vuln_signal}
 
     counts = vuln.get("counts", {})
 
@@ -82,5 +112,7 @@ def build_risk(domain):
             **counts
         },
         "last_checked": datetime.utcnow().timestamp(),
-        "source": vuln.get("source", "live")
-    }
\ No newline at end of file
+        "source": vuln.get("source", "live"),
+        "signals": signals,
+        "partial": any(signal["status"] != "ok" for signal in signals.values()),
+    }
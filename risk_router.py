@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 from risk_engine import build_risk
+from card_cache import cached_card
 
 router = APIRouter(prefix="/risk", tags=["Risk"])
 
 @router.get("/{domain}")
-def get_risk(domain: str):
-    return build_risk(domain)
\ No newline at end of file
+@cached_card("risk")
+async def get_risk(domain: str):
+    return await build_risk(domain)
\ No newline at end of file
@@ -1,15 +1,19 @@
 from fastapi import APIRouter
-import requests
 from bs4 import BeautifulSoup
+from page_snapshot import get_snapshot
+from card_cache import cached_card
 
 router = APIRouter()
 
 @router.get("/seo/{domain}")
+@cached_card("seo")
 def seo_card(domain: str):
-    url = f"https://{domain}"
     try:
-        r = requests.get(url, timeout=5)
-        soup = BeautifulSoup(r.text, "html.parser")
+        snapshot = get_snapshot(domain)
+        if snapshot["error"]:
+            return {"score": None, "status": "Not scanned"}
+
+        soup = BeautifulSoup(snapshot["body"], "html.parser")
         title_len = len(soup.title.string) if soup.title else 0
         meta_desc = bool(soup.find("meta", attrs={"name": "description"}))
         score = min(100, title_len * 2 + (20 if meta_desc else 0))
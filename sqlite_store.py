@@ -0,0 +1,42 @@
+# ============================================================
+# SitePulseAI SQLite Store
+# Shared connection setup for the local state stores
+# ============================================================
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class SQLiteStore:
+    """
+    One WAL-mode SQLite connection shared by the threads of a process.
+    Every statement runs under the store lock; transaction() groups
+    several statements into one atomic commit.
+    """
+
+    def __init__(self, path, schema):
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(schema)
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            with self.conn:
+                yield self.conn
+
+    def query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchone()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -1,20 +1,38 @@
 from fastapi import APIRouter, Query
-import ssl
-import socket
+import time
 from datetime import datetime
+from cert_facts import get_cert_facts, peek_cert_facts, days_remaining as cert_days_remaining
+from card_cache import cached_card, CARD_TTLS, ERROR_TTL
 
 router = APIRouter()
 
+
+def ssl_card_ttl(domain, card):
+    """
+    Keep the card only as long as its certificate facts, and never serve
+    it stale past the moment the certificate expires.
+    """
+    facts = peek_cert_facts(domain)
+    if not facts:
+        return ERROR_TTL
+
+    fresh = max(0, facts["fetched_at"] + facts["ttl"] - time.time())
+    if facts["error"] or not card.get("managed"):
+        return (fresh, 0)
+
+    seconds_left = (facts["expires_at"] - datetime.utcnow()).total_seconds()
+    stale = max(0, min(CARD_TTLS["ssl"][1], seconds_left - fresh))
+    return (fresh, stale)
+
+
 @router.get("/ssl/{domain}")
+@cached_card("ssl", ttl=ssl_card_ttl)
 def ssl_card(domain: str):
     try:
-        ctx = ssl.create_default_context()
-        with ctx.wrap_socket(socket.socket(), server_hostname=domain) as s:
-            s.settimeout(3.0)
-            s.connect((domain, 443))
-            cert = s.getpeercert()
-        expires_at = datetime.strptime(cert['notAfter'], "%b %d %H:%M:%S %Y %Z")
-        days_remaining = (expires_at - datetime.utcnow()).days
+        facts = get_cert_facts(domain)
+        if facts["error"]:
+            raise RuntimeError(facts["error"])
+        days_remaining = cert_days_remaining(facts)
         return {
             "domain": domain,
             "valid": days_remaining > 0,
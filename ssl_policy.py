@@ -1,10 +1,12 @@
 # ssl_policy.py
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Iterable, List
 
 from ssl_state import (
     get_ssl_state,
+    count_recent_attempts,
     record_policy_decision,
+    flush_state,
 )
 
 from datetime import datetime
@@ -54,6 +56,17 @@ def evaluate_ssl_policy(domain: str, ssl_data: dict) -> dict:
 MAX_ATTEMPTS_24H = 3
 COOLDOWN_MINUTES = 30
 
+
+def _record(domain: str, decision: Dict) -> None:
+    # Buffered: a fleet-wide evaluation becomes one batched write
+    record_policy_decision(
+        domain,
+        "allow" if decision["allowed"] else "block",
+        decision["reason"],
+        buffered=True,
+    )
+
+
 def evaluate_ssl_repair_policy(domain: str, severity: str = "CRITICAL") -> Dict:
     """
     Returns a decision dict:
@@ -67,8 +80,7 @@ def evaluate_ssl_repair_policy(domain: str, severity: str = "CRITICAL") -> Dict:
     state = get_ssl_state(domain)
 
     mode = state.get("renewal_mode", "auto")
-    attempts = state.get("repair_attempts", [])
-    last_repair_ts = state.get("last_repair_ts")
+    last_repair_ts = state.get("last_repair_attempt_at")
 
     now = datetime.utcnow()
 
@@ -79,22 +91,17 @@ def evaluate_ssl_repair_policy(domain: str, severity: str = "CRITICAL") -> Dict:
             "reason": f"Repair blocked: mode={mode}",
             "mode": mode,
         }
-        record_policy_decision(domain, decision)
+        _record(domain, decision)
         return decision
 
-    # 2) Retry safety rule (24h window)
-    last_24h_attempts = [
-        a for a in attempts
-        if datetime.fromisoformat(a["timestamp"]) > now - timedelta(hours=24)
-    ]
-
-    if len(last_24h_attempts) >= MAX_ATTEMPTS_24H:
+    # 2) Retry safety rule (24h window, bucketed counters)
+    if count_recent_attempts(domain, 24 * 3600) >= MAX_ATTEMPTS_24H:
         decision = {
             "allowed": False,
             "reason": "Too many repair attempts in last 24h",
             "mode": mode,
         }
-        record_policy_decision(domain, decision)
+        _record(domain, decision)
         return decision
 
     # 3) Cooldown rule
@@ -106,7 +113,7 @@ def evaluate_ssl_repair_policy(domain: str, severity: str = "CRITICAL") -> Dict:
                 "reason": "Cooldown window active",
                 "mode": mode,
             }
-            record_policy_decision(domain, decision)
+            _record(domain, decision)
             return decision
 
     # 4) Severity rule
@@ -116,7 +123,7 @@ def evaluate_ssl_repair_policy(domain: str, severity: str = "CRITICAL") -> Dict:
             "reason": f"Severity {severity} not eligible for auto-repair",
             "mode": mode,
         }
-        record_policy_decision(domain, decision)
+        _record(domain, decision)
         return decision
 
     # Allowed
@@ -126,5 +133,18 @@ def evaluate_ssl_repair_policy(domain: str, severity: str = "CRITICAL") -> Dict:
         "mode": mode,
     }
 
-    record_policy_decision(domain, decision)
+    _record(domain, decision)
     return decision
+
+
+def evaluate_ssl_repair_policy_fleet(domains: Iterable[str], severity: str = "CRITICAL") -> List[Dict]:
+    """
+    Evaluate the repair policy for many domains, then write every
+    recorded decision in one flush.
+    """
+    decisions = [
+        {"domain": domain, **evaluate_ssl_repair_policy(domain, severity)}
+        for domain in domains
+    ]
+    flush_state()
+    return decisions
@@ -1,15 +1,55 @@
 # ssl_state.py
 # ssl_state.py
+import atexit
 import json
 import os
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any
 
 from ssl_utils import normalize_domain
+from sqlite_store import SQLiteStore
 
-STATE_FILE = "ssl_state.json"
+STATE_FILE = "ssl_state.json"   # legacy whole-dict snapshot, imported once
+STATE_DB = "ssl_state.db"
+
+# History lists keep only the newest entries; older ones live on as
+# per-day counts in state["history_summary"]
+HISTORY_LIMIT = 50
+SUMMARY_DAYS = 30
+
+# Repair attempts are also counted in fixed time buckets so the 24h
+# window check is a sum over at most window/bucket counters
+ATTEMPT_BUCKET_SECONDS = 300
+ATTEMPT_WINDOW_SECONDS = 24 * 3600
+
+# Buffered writes: dirty domains are flushed together in one transaction
+FLUSH_BATCH = 500
+FLUSH_INTERVAL = 5.0   # seconds
+
+# In-process cache of domain -> state; rows are loaded on first use
 _STATE: Dict[str, Dict[str, Any]] = {}
 
+# Domains changed through a buffered path and not yet written
+_DIRTY = set()
+_LAST_FLUSH = time.monotonic()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ssl_state (
+    domain TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+_DB = SQLiteStore(STATE_DB, _SCHEMA)
+
+# The store lock (re-entrant) also guards _STATE, _DIRTY and the state
+# dicts, so a record is never serialized while another thread changes it
+_LOCK = _DB.lock
+_FLUSHER = None
+
 
 # -------------------------
 # Internal Helpers
@@ -46,26 +86,161 @@ def _default_state(domain: str) -> Dict[str, Any]:
         "last_policy_decision": None,
         "last_policy_decision_reason": None,
         "last_policy_decision_at": None,
+
+        # Per-day counts for history trimmed out of the lists above
+        "history_summary": {},
+
+        # bucket start (epoch seconds, as str) -> repair attempts in bucket
+        "attempt_buckets": {},
     }
 
 
-def _persist_state() -> None:
+_UPSERT_SQL = (
+    "INSERT INTO ssl_state (domain, state, updated_at) VALUES (?, ?, ?) "
+    "ON CONFLICT(domain) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at"
+)
+
+
+def _persist_state(domain: str) -> None:
+    """
+    Write one domain's record (upsert) — cost is independent of fleet size.
+    """
     try:
-        with open(STATE_FILE, "w") as f:
-            json.dump(_STATE, f, indent=2)
+        with _LOCK:
+            payload = json.dumps(_STATE[domain])
+            with _DB.transaction() as conn:
+                conn.execute(_UPSERT_SQL, (domain, payload, datetime.utcnow().isoformat()))
+            _DIRTY.discard(domain)
     except Exception:
         # Never crash backend due to persistence failure
         pass
 
 
-def _load_state() -> None:
-    global _STATE
-    if os.path.exists(STATE_FILE):
+def _flush_loop() -> None:
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        flush_state()
+
+
+def _mark_dirty(domain: str) -> None:
+    global _FLUSHER
+    with _LOCK:
+        _DIRTY.add(domain)
+
+        # Buffered records reach disk within FLUSH_INTERVAL even when no
+        # further writes come in to trigger a flush
+        if _FLUSHER is None:
+            _FLUSHER = threading.Thread(target=_flush_loop, name="ssl-state-flush", daemon=True)
+            _FLUSHER.start()
+
+        if len(_DIRTY) >= FLUSH_BATCH or time.monotonic() - _LAST_FLUSH >= FLUSH_INTERVAL:
+            flush_state()
+
+
+def flush_state() -> int:
+    """
+    Write every buffered domain record in a single transaction.
+    Returns the number of records written.
+    """
+    global _LAST_FLUSH
+    with _LOCK:
+        _LAST_FLUSH = time.monotonic()
+
+        if not _DIRTY:
+            return 0
+
+        now = datetime.utcnow().isoformat()
+        rows = [(d, json.dumps(_STATE[d]), now) for d in _DIRTY]
         try:
-            with open(STATE_FILE, "r") as f:
-                _STATE = json.load(f)
+            with _DB.transaction() as conn:
+                conn.executemany(_UPSERT_SQL, rows)
+            _DIRTY.clear()
         except Exception:
-            _STATE = {}
+            # Never crash backend due to persistence failure
+            return 0
+
+        return len(rows)
+
+
+atexit.register(flush_state)
+
+
+def _attempt_buckets(state: Dict[str, Any]) -> Dict[str, int]:
+    buckets = state.get("attempt_buckets")
+    if buckets is None:
+        # Legacy record: seed the counters once from the retained history
+        buckets = state["attempt_buckets"] = {}
+        for attempt in state.get("repair_attempts", []):
+            # Stored timestamps are naive utcnow() strings
+            ts = datetime.fromisoformat(attempt["timestamp"]).replace(tzinfo=timezone.utc).timestamp()
+            _bump_bucket(buckets, ts)
+    return buckets
+
+
+def _bump_bucket(buckets: Dict[str, int], ts: float) -> None:
+    key = str(int(ts // ATTEMPT_BUCKET_SECONDS) * ATTEMPT_BUCKET_SECONDS)
+    buckets[key] = buckets.get(key, 0) + 1
+
+    oldest = ts - ATTEMPT_WINDOW_SECONDS - ATTEMPT_BUCKET_SECONDS
+    for stale in [k for k in buckets if int(k) < oldest]:
+        del buckets[stale]
+
+
+def _get_state(domain: str) -> Dict[str, Any]:
+    with _LOCK:
+        state = _STATE.get(domain)
+        if state is None:
+            row = _DB.query_one("SELECT state FROM ssl_state WHERE domain = ?", (domain,))
+            state = json.loads(row[0]) if row else _default_state(domain)
+            _STATE[domain] = state
+        return state
+
+
+def _append_history(state: Dict[str, Any], key: str, event: Dict[str, Any], label: str) -> None:
+    """
+    Append to a bounded history list and count it in the daily summary.
+    """
+    history = state.setdefault(key, [])
+    history.append(event)
+    if len(history) > HISTORY_LIMIT:
+        del history[:-HISTORY_LIMIT]
+
+    day = event["timestamp"][:10]
+    summary = state.setdefault("history_summary", {}).setdefault(key, {})
+    day_counts = summary.setdefault(day, {})
+    day_counts[label] = day_counts.get(label, 0) + 1
+
+    cutoff = (datetime.utcnow() - timedelta(days=SUMMARY_DAYS)).strftime("%Y-%m-%d")
+    for old_day in [d for d in summary if d < cutoff]:
+        del summary[old_day]
+
+
+def _load_state() -> None:
+    """
+    One-time import of the legacy ssl_state.json into the database.
+    """
+    if not os.path.exists(STATE_FILE):
+        return
+    if _DB.query_one("SELECT 1 FROM ssl_state LIMIT 1"):
+        return
+
+    try:
+        with open(STATE_FILE, "r") as f:
+            legacy = json.load(f)
+    except Exception:
+        return
+
+    now = datetime.utcnow().isoformat()
+    for state in legacy.values():
+        for key in ("repair_attempts", "escalations", "policy_decisions"):
+            if len(state.get(key, [])) > HISTORY_LIMIT:
+                state[key] = state[key][-HISTORY_LIMIT:]
+
+    with _DB.transaction() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO ssl_state (domain, state, updated_at) VALUES (?, ?, ?)",
+            [(domain, json.dumps(state), now) for domain, state in legacy.items()],
+        )
 
 
 _load_state()
@@ -77,9 +252,20 @@ _load_state()
 
 def get_ssl_state(domain: str) -> Dict[str, Any]:
     domain = normalize_domain(domain)
-    state = _STATE.get(domain) or _default_state(domain)
-    _STATE[domain] = state
-    return state
+    return _get_state(domain)
+
+
+def count_recent_attempts(domain: str, window_seconds: int = ATTEMPT_WINDOW_SECONDS) -> int:
+    """
+    Repair attempts in the trailing window, accurate to one bucket
+    (ATTEMPT_BUCKET_SECONDS). Constant time: no timestamps are parsed.
+    """
+    domain = normalize_domain(domain)
+    cutoff = int((time.time() - window_seconds) // ATTEMPT_BUCKET_SECONDS) * ATTEMPT_BUCKET_SECONDS
+
+    with _LOCK:
+        buckets = _attempt_buckets(_get_state(domain))
+        return sum(count for start, count in buckets.items() if int(start) >= cutoff)
 
 
 # -------------------------
@@ -91,17 +277,17 @@ def update_ssl_observation(domain: str, observation: Dict[str, Any]) -> Dict[str
     Log a fresh SSL observation (expiry, validity, status).
     """
     domain = normalize_domain(domain)
-    state = _STATE.get(domain) or _default_state(domain)
+    with _LOCK:
+        state = _get_state(domain)
 
-    now = datetime.utcnow().isoformat()
+        now = datetime.utcnow().isoformat()
 
-    state["last_checked_at"] = now
-    state["last_observed_expiry"] = observation.get("expiry_date")
-    state["last_observed_status"] = observation.get("status")
-    state["status"] = observation.get("status", state["status"])
+        state["last_checked_at"] = now
+        state["last_observed_expiry"] = observation.get("expiry_date")
+        state["last_observed_status"] = observation.get("status")
+        state["status"] = observation.get("status", state["status"])
 
-    _STATE[domain] = state
-    _persist_state()
+        _persist_state(domain)
 
     return {
         "domain": domain,
@@ -123,12 +309,12 @@ def set_renewal_mode(domain: str, mode: str) -> Dict[str, Any]:
         raise ValueError("Invalid renewal mode")
 
     domain = normalize_domain(domain)
-    state = _STATE.get(domain) or _default_state(domain)
+    with _LOCK:
+        state = _get_state(domain)
 
-    state["renewal_mode"] = mode
+        state["renewal_mode"] = mode
 
-    _STATE[domain] = state
-    _persist_state()
+        _persist_state(domain)
 
     return {
         "domain": domain,
@@ -145,31 +331,32 @@ def record_repair_attempt(domain: str, result: str, error: str = None) -> Dict[s
     Record a single repair attempt outcome.
     """
     domain = normalize_domain(domain)
-    state = _STATE.get(domain) or _default_state(domain)
+    with _LOCK:
+        state = _get_state(domain)
 
-    now = datetime.utcnow().isoformat()
+        now = datetime.utcnow().isoformat()
 
-    attempt = {
-        "timestamp": now,
-        "result": result,
-        "error": error,
-    }
+        attempt = {
+            "timestamp": now,
+            "result": result,
+            "error": error,
+        }
 
-    state["repair_attempts"].append(attempt)
-    state["last_repair_attempt_at"] = now
-    state["last_repair_error"] = error
+        _append_history(state, "repair_attempts", attempt, result)
+        _bump_bucket(_attempt_buckets(state), time.time())
+        state["last_repair_attempt_at"] = now
+        state["last_repair_error"] = error
 
-    if result == "success":
-        state["last_repair_success_at"] = now
-        state["retry_count"] = 0
-        state["next_retry_at"] = None
-        state["status"] = "healthy"
+        if result == "success":
+            state["last_repair_success_at"] = now
+            state["retry_count"] = 0
+            state["next_retry_at"] = None
+            state["status"] = "healthy"
 
-    elif result == "failure":
-        state["status"] = "repair_failed"
+        elif result == "failure":
+            state["status"] = "repair_failed"
 
-    _STATE[domain] = state
-    _persist_state()
+        _persist_state(domain)
 
     return {
         "domain": domain,
@@ -188,17 +375,17 @@ def schedule_retry(domain: str, backoff_seconds: int) -> Dict[str, Any]:
     Schedule the next retry attempt using exponential backoff.
     """
     domain = normalize_domain(domain)
-    state = _STATE.get(domain) or _default_state(domain)
+    with _LOCK:
+        state = _get_state(domain)
 
-    now = datetime.utcnow()
-    next_retry = now.timestamp() + backoff_seconds
+        now = datetime.utcnow()
+        next_retry = now.timestamp() + backoff_seconds
 
-    state["retry_count"] += 1
-    state["next_retry_at"] = datetime.utcfromtimestamp(next_retry).isoformat()
-    state["status"] = "retry_scheduled"
+        state["retry_count"] += 1
+        state["next_retry_at"] = datetime.utcfromtimestamp(next_retry).isoformat()
+        state["status"] = "retry_scheduled"
 
-    _STATE[domain] = state
-    _persist_state()
+        _persist_state(domain)
 
     return {
         "domain": domain,
@@ -216,22 +403,22 @@ def record_escalation(domain: str, reason: str = "unspecified") -> Dict[str, Any
     Record an escalation event when automated repair fails or is blocked.
     """
     domain = normalize_domain(domain)
-    state = _STATE.get(domain) or _default_state(domain)
+    with _LOCK:
+        state = _get_state(domain)
 
-    now = datetime.utcnow().isoformat()
+        now = datetime.utcnow().isoformat()
 
-    escalation_event = {
-        "timestamp": now,
-        "reason": reason,
-    }
+        escalation_event = {
+            "timestamp": now,
+            "reason": reason,
+        }
 
-    state["escalations"].append(escalation_event)
-    state["last_escalation_reason"] = reason
-    state["last_escalation_at"] = now
-    state["status"] = "escalated"
+        _append_history(state, "escalations", escalation_event, reason)
+        state["last_escalation_reason"] = reason
+        state["last_escalation_at"] = now
+        state["status"] = "escalated"
 
-    _STATE[domain] = state
-    _persist_state()
+        _persist_state(domain)
 
     return {
         "domain": domain,
@@ -245,32 +432,33 @@ def record_escalation(domain: str, reason: str = "unspecified") -> Dict[str, Any
 # 🔒 Phase 3 — Policy Decision Logging
 # -------------------------
 
-def record_policy_decision(domain: str, decision: str, reason: str = None) -> Dict[str, Any]:
+def record_policy_decision(domain: str, decision: str, reason: str = None,
+                           buffered: bool = False) -> Dict[str, Any]:
     """
     Record a policy engine decision (allow, block, escalate, defer).
+    With buffered=True the record is written later by flush_state().
     """
     domain = normalize_domain(domain)
-    state = _STATE.get(domain) or _default_state(domain)
-
-    now = datetime.utcnow().isoformat()
-
-    decision_event = {
-        "timestamp": now,
-        "decision": decision,
-        "reason": reason,
-    }
-
-    # Forward safety for legacy states
-    if "policy_decisions" not in state:
-        state["policy_decisions"] = []
-
-    state["policy_decisions"].append(decision_event)
-    state["last_policy_decision"] = decision
-    state["last_policy_decision_reason"] = reason
-    state["last_policy_decision_at"] = now
-
-    _STATE[domain] = state
-    _persist_state()
+    with _LOCK:
+        state = _get_state(domain)
+
+        now = datetime.utcnow().isoformat()
+
+        decision_event = {
+            "timestamp": now,
+            "decision": decision,
+            "reason": reason,
+        }
+
+        _append_history(state, "policy_decisions", decision_event, str(decision))
+        state["last_policy_decision"] = decision
+        state["last_policy_decision_reason"] = reason
+        state["last_policy_decision_at"] = now
+
+        if buffered:
+            _mark_dirty(domain)
+        else:
+            _persist_state(domain)
 
     return {
         "domain": domain,
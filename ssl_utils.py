@@ -1,9 +1,9 @@
 # ssl_utils.py
-import ssl
-import socket
-from datetime import datetime
+from typing import Dict, Any
 from urllib.parse import urlparse
 
+from cert_facts import get_cert_facts, days_remaining as cert_days_remaining
+
 
 def normalize_domain(url_or_domain: str) -> str:
     """
@@ -35,50 +35,29 @@ def inspect_ssl(domain: str) -> dict:
         "error": None,
     }
 
-    try:
-        ctx = ssl.create_default_context()
-
-        with ctx.wrap_socket(socket.socket(), server_hostname=domain) as s:
-            s.settimeout(6)
-            s.connect((domain, 443))
-            cert = s.getpeercert()
-
-        not_after = cert.get("notAfter")
-        issuer = cert.get("issuer")
-
-        expiry_date = datetime.strptime(not_after, "%b %d %H:%M:%S %Y %Z")
-        days_remaining = (expiry_date - datetime.utcnow()).days
+    facts = get_cert_facts(domain)
 
+    if facts["error"]:
+        result["error"] = facts["error"]
+    else:
         result.update(
             {
                 "valid": True,
-                "issuer": str(issuer),
-                "expiry_date": expiry_date.isoformat(),
-                "days_remaining": days_remaining,
+                "issuer": str(facts["issuer"]),
+                "expiry_date": facts["expires_at"].isoformat(),
+                "days_remaining": cert_days_remaining(facts),
             }
         )
 
-    except Exception as e:
-        result["error"] = str(e)
-
     return result
 
 
-# ssl_utils.py
-
-import ssl
-import socket
-from datetime import datetime
-from typing import Dict, Any
-
-
 def fetch_ssl_certificate_info(domain: str) -> Dict[str, Any]:
     """
     Fetch SSL certificate details for a domain.
     Returns a normalized dict used across the platform.
     """
 
-    context = ssl.create_default_context()
     result = {
         "valid": False,
         "expires_in_days": None,
@@ -87,37 +66,26 @@ def fetch_ssl_certificate_info(domain: str) -> Dict[str, Any]:
         "error": None,
     }
 
-    try:
-        with socket.create_connection((domain, 443), timeout=10) as sock:
-            with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                cert = ssock.getpeercert()
-
-        not_after_str = cert.get("notAfter")
-        not_after = datetime.strptime(not_after_str, "%b %d %H:%M:%S %Y %Z")
-        expires_in_days = (not_after - datetime.utcnow()).days
-
-        issuer_parts = cert.get("issuer", [])
-        issuer = ", ".join("=".join(x) for part in issuer_parts for x in part)
-
-        result.update(
-            {
-                "valid": expires_in_days > 0,
-                "expires_in_days": expires_in_days,
-                "issuer": issuer,
-                "not_after": not_after_str,
-            }
-        )
+    facts = get_cert_facts(domain)
 
+    if facts["error"]:
+        result["error"] = facts["error"]
         return result
 
-    except Exception as e:
-        result["error"] = str(e)
-        return result
+    expires_in_days = cert_days_remaining(facts)
+    issuer = ", ".join("=".join(x) for part in facts["issuer"] for x in part)
 
+    result.update(
+        {
+            "valid": expires_in_days > 0,
+            "expires_in_days": expires_in_days,
+            "issuer": issuer,
+            "not_after": facts["not_after"],
+        }
+    )
+
+    return result
 
-import ssl
-import socket
-from datetime import datetime
 
 def get_ssl_certificate(domain: str) -> dict:
     """
@@ -125,33 +93,24 @@ def get_ssl_certificate(domain: str) -> dict:
     Returns structured certificate metadata for policy + state layers.
     """
 
-    context = ssl.create_default_context()
-
-    try:
-        with socket.create_connection((domain, 443), timeout=10) as sock:
-            with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                cert = ssock.getpeercert()
-
-        not_after = cert.get("notAfter")
-        expires_at = datetime.strptime(not_after, "%b %d %H:%M:%S %Y %Z")
-        expires_in_days = (expires_at - datetime.utcnow()).days
-
-        issuer = " ".join(x[0][1] for x in cert.get("issuer", []))
-        subject = " ".join(x[0][1] for x in cert.get("subject", []))
-
-        return {
-            "domain": domain,
-            "valid": True,
-            "issuer": issuer,
-            "subject": subject,
-            "expires_at": expires_at.isoformat(),
-            "expires_in_days": expires_in_days,
-            "raw": cert,
-        }
+    facts = get_cert_facts(domain)
 
-    except Exception as e:
+    if facts["error"]:
         return {
             "domain": domain,
             "valid": False,
-            "error": str(e),
+            "error": facts["error"],
         }
+
+    issuer = " ".join(x[0][1] for x in facts["issuer"])
+    subject = " ".join(x[0][1] for x in facts["subject"])
+
+    return {
+        "domain": domain,
+        "valid": True,
+        "issuer": issuer,
+        "subject": subject,
+        "expires_at": facts["expires_at"].isoformat(),
+        "expires_in_days": cert_days_remaining(facts),
+        "raw": facts["raw"],
+    }
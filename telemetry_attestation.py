@@ -1,38 +1,105 @@
 import hashlib
 import json
 from datetime import datetime
-import os
 
-TELEMETRY_CERT_FOLDER = "telemetry_certificates"
+from sqlite_store import SQLiteStore
 
-def generate_telemetry_attestation(client_id: str, domain: str, results: dict) -> str:
+ATTESTATION_DB = "telemetry_attestations.db"
+QUERY_LIMIT = 100       # default rows per range lookup
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attestations (
+    certificate TEXT PRIMARY KEY,
+    client_id TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attestations_by_target ON attestations (client_id, domain, timestamp);
+"""
+
+
+class AttestationStore:
     """
-    Generate a cryptographically verifiable telemetry certificate
-    Each certificate is saved to disk for auditing
+    Append-only attestation log in SQLite.
+
+    Each record keeps the exact compact payload that was hashed, so a
+    certificate can be re-verified from its stored bytes. Records are
+    keyed by certificate hash and indexed by (client, domain, time).
     """
 
-    os.makedirs(TELEMETRY_CERT_FOLDER, exist_ok=True)
+    def __init__(self, path=ATTESTATION_DB):
+        self._db = SQLiteStore(path, _SCHEMA)
 
-    # Normalize payload for hashing
-    payload = json.dumps({
-        "client_id": client_id,
-        "domain": domain,
-        "results": results,
-        "timestamp": datetime.utcnow().isoformat()
-    }, sort_keys=True)
+    @staticmethod
+    def _record(row):
+        certificate, payload = row
+        return {**json.loads(payload), "certificate": certificate}
 
-    # Compute SHA256 hash
-    certificate = hashlib.sha256(payload.encode()).hexdigest()
+    def append(self, client_id, domain, results):
+        timestamp = datetime.utcnow().isoformat()
 
-    # Save certificate for audit purposes
-    filename = f"{TELEMETRY_CERT_FOLDER}/{client_id}_{domain}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.json"
-    with open(filename, "w") as f:
-        json.dump({
+        # Serialized once: the same string is hashed and stored
+        payload = json.dumps({
             "client_id": client_id,
             "domain": domain,
             "results": results,
-            "certificate": certificate,
-            "timestamp": datetime.utcnow().isoformat()
-        }, f, indent=4)
+            "timestamp": timestamp
+        }, sort_keys=True, separators=(",", ":"), default=str)
+
+        certificate = hashlib.sha256(payload.encode()).hexdigest()
+
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO attestations (certificate, client_id, domain, timestamp, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (certificate, client_id, domain, timestamp, payload),
+            )
+        return certificate
+
+    def get(self, certificate):
+        row = self._db.query_one(
+            "SELECT certificate, payload FROM attestations WHERE certificate = ?", (certificate,)
+        )
+        return self._record(row) if row else None
+
+    def verify(self, certificate):
+        """
+        True if the stored payload still hashes to the certificate.
+        """
+        row = self._db.query_one("SELECT payload FROM attestations WHERE certificate = ?", (certificate,))
+        return row is not None and hashlib.sha256(row[0].encode()).hexdigest() == certificate
+
+    def query(self, client_id, domain=None, start=None, end=None, limit=QUERY_LIMIT):
+        """
+        Newest first for a client (optionally one domain) within
+        [start, end), where start / end are ISO timestamps.
+        """
+        sql = "SELECT certificate, payload FROM attestations WHERE client_id = ?"
+        params = [client_id]
 
-    return certificate
\ No newline at end of file
+        if domain is not None:
+            sql += " AND domain = ?"
+            params.append(domain)
+        if start is not None:
+            sql += " AND timestamp >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND timestamp < ?"
+            params.append(end)
+
+        sql += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(limit)
+
+        return [self._record(row) for row in self._db.query(sql, params)]
+
+
+ATTESTATIONS = AttestationStore()
+
+
+def generate_telemetry_attestation(client_id: str, domain: str, results: dict) -> str:
+    """
+    Generate a cryptographically verifiable telemetry certificate
+    Each certificate is appended to the attestation store for auditing
+    """
+    return ATTESTATIONS.append(client_id, domain, results)
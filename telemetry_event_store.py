@@ -0,0 +1,231 @@
+# ============================================================
+# SitePulseAI Telemetry Event Store
+# Append-only, hash-chained JSONL segments with a sidecar index
+# ============================================================
+
+import hashlib
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX hosts: in-process locking only
+    fcntl = None
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+SEGMENT_MAX_EVENTS = 10000
+INDEX_FILE = "index.json"
+LOCK_FILE = ".lock"
+GENESIS_HASH = "GENESIS"
+
+
+def _segment_name(number):
+    return f"segment-{number:06d}.jsonl"
+
+
+def _event_hash(event_record):
+    event_string = json.dumps(event_record, sort_keys=True, default=str)
+    return hashlib.sha256(event_string.encode()).hexdigest()
+
+
+def read_last_line(path, chunk_size=4096):
+    """
+    Return the last non-empty line of a file without reading all of it.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        buffer = b""
+        position = end
+
+        while position > 0:
+            step = min(chunk_size, position)
+            position -= step
+            f.seek(position)
+            buffer = f.read(step) + buffer
+
+            lines = buffer.rstrip(b"\n").split(b"\n")
+            if len(lines) > 1 or position == 0:
+                return lines[-1].decode() if lines[-1] else None
+
+    return None
+
+
+class TelemetryEventStore:
+    """
+    Hash-chained telemetry events stored as rolling JSONL segments.
+
+    The index holds the chain head, so an append costs one line write
+    plus one small index write no matter how long the chain is. Appends
+    are serialized with a thread lock and, where available, an flock on
+    the store directory so separate worker processes never fork the chain.
+    """
+
+    def __init__(self, directory, legacy_file=None, segment_max_events=SEGMENT_MAX_EVENTS):
+        self.directory = directory
+        self.segment_max_events = segment_max_events
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+        if legacy_file and os.path.exists(legacy_file) and not os.path.exists(self.index_path):
+            self._migrate_legacy(legacy_file)
+
+    # -----------------------
+    # Locking + index
+    # -----------------------
+    def _acquire(self):
+        self._lock.acquire()
+        if fcntl is None:
+            return None
+        lock_file = open(os.path.join(self.directory, LOCK_FILE), "a")
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    def _release(self, lock_file):
+        if lock_file is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+        self._lock.release()
+
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return {
+                "head_hash": GENESIS_HASH,
+                "segment": 1,
+                "segment_events": 0,
+                "segment_bytes": 0,
+                "total_events": 0,
+            }
+        with open(self.index_path, "r") as f:
+            return json.load(f)
+
+    def _write_index(self, index):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _segment_path(self, index):
+        return os.path.join(self.directory, _segment_name(index["segment"]))
+
+    def _recover_index(self, index):
+        """
+        A crash between the segment write and the index write leaves the
+        index behind the segment; rebuild the head from the segment tail.
+        If that write was the first line of a new segment, the index still
+        names the previous one, so later segments are recovered too.
+        """
+        index = self._recover_segment(index)
+
+        while os.path.exists(os.path.join(self.directory, _segment_name(index["segment"] + 1))):
+            index["segment"] += 1
+            index["segment_events"] = 0
+            index["segment_bytes"] = 0
+            index = self._recover_segment(index)
+
+        return index
+
+    def _recover_segment(self, index):
+        path = self._segment_path(index)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size == index["segment_bytes"]:
+            return index
+
+        last_line = read_last_line(path) if size else None
+        with open(path, "rb") as f:
+            segment_events = sum(1 for line in f if line.strip())
+
+        index["total_events"] += segment_events - index["segment_events"]
+        index["segment_events"] = segment_events
+        index["segment_bytes"] = size
+        if last_line:
+            index["head_hash"] = json.loads(last_line)["event_hash"]
+        return index
+
+    # -----------------------
+    # Writes
+    # -----------------------
+    def _write_event(self, index, line):
+        if index["segment_events"] >= self.segment_max_events:
+            index["segment"] += 1
+            index["segment_events"] = 0
+            index["segment_bytes"] = 0
+
+        with open(self._segment_path(index), "a") as f:
+            f.write(line)
+
+        index["segment_events"] += 1
+        index["segment_bytes"] += len(line.encode())
+        index["total_events"] += 1
+
+    def append(self, event_record):
+        """
+        Chain the event to the current head, store it and return it
+        with previous_event_hash and event_hash filled in.
+        """
+        lock_file = self._acquire()
+        try:
+            index = self._recover_index(self._read_index())
+
+            event_record["previous_event_hash"] = index["head_hash"]
+            event_record["event_hash"] = _event_hash(event_record)
+
+            line = json.dumps(event_record, sort_keys=True, default=str) + "\n"
+            self._write_event(index, line)
+
+            index["head_hash"] = event_record["event_hash"]
+            self._write_index(index)
+
+            return event_record
+        finally:
+            self._release(lock_file)
+
+    def _migrate_legacy(self, legacy_file):
+        """
+        One-time import of the old single-array telemetry_event_log.json.
+        Events keep their original hashes so the chain stays intact.
+        """
+        with open(legacy_file, "r") as f:
+            events = json.load(f)
+
+        lock_file = self._acquire()
+        try:
+            if os.path.exists(self.index_path):
+                return
+
+            index = self._read_index()
+            for event in events:
+                self._write_event(index, json.dumps(event, sort_keys=True, default=str) + "\n")
+                index["head_hash"] = event["event_hash"]
+
+            self._write_index(index)
+            os.replace(legacy_file, legacy_file + ".migrated")
+            print(f"[Telemetry Store] Migrated {len(events)} legacy events")
+        finally:
+            self._release(lock_file)
+
+    # -----------------------
+    # Reads
+    # -----------------------
+    def latest(self):
+        """
+        Return the newest event (reads only the tail of the live segment).
+        """
+        index = self._read_index()
+        if not index["total_events"]:
+            return None
+
+        last_line = read_last_line(self._segment_path(index))
+        return json.loads(last_line) if last_line else None
+
+    def head_hash(self):
+        return self._read_index()["head_hash"]
+
+    def stats(self):
+        return self._read_index()
@@ -0,0 +1,179 @@
+# ============================================================
+# SitePulseAI Tenant Registry
+# Persistent tenant <-> domain ownership with indexed lookups
+# ============================================================
+
+from datetime import datetime
+
+from sqlite_store import SQLiteStore
+from ssl_utils import normalize_domain
+
+
+TENANT_DB = "tenants.db"
+PAGE_SIZE = 1000        # rows per page when streaming domains
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tenants (
+    client_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    domain_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tenant_domains (
+    client_id TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    added_at TEXT NOT NULL,
+    PRIMARY KEY (client_id, domain)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tenant_domains_by_domain ON tenant_domains (domain, client_id);
+"""
+
+
+class TenantRegistry:
+    """
+    Tenants and their domains in SQLite.
+
+    The primary key indexes tenant -> domains and a second index covers
+    domain -> tenants, so ownership checks are single index lookups.
+    Domain counts are stored per tenant. Nothing is loaded into memory
+    beyond the rows a caller asks for.
+
+    Supports the dict-style access the monitoring router already uses:
+    `client_id in registry`, `registry[client_id]["domains"]`, iteration.
+    """
+
+    def __init__(self, path=TENANT_DB):
+        self._db = SQLiteStore(path, _SCHEMA)
+
+    # ---------------------------
+    # Internal Helpers
+    # ---------------------------
+    @staticmethod
+    def _normalize(domains):
+        return list(dict.fromkeys(d for d in (normalize_domain(x) for x in domains) if d))
+
+    def _insert_domains(self, conn, client_id, domains, now):
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO tenant_domains (client_id, domain, added_at) VALUES (?, ?, ?)",
+            ((client_id, domain, now) for domain in domains),
+        )
+        return conn.total_changes - before
+
+    # ---------------------------
+    # Writes
+    # ---------------------------
+    def register(self, client_id, domains):
+        """
+        Create or replace a tenant's domain list.
+        """
+        domains = self._normalize(domains)
+        now = datetime.utcnow().isoformat()
+
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO tenants (client_id, created_at) VALUES (?, ?)", (client_id, now)
+            )
+            conn.execute("DELETE FROM tenant_domains WHERE client_id = ?", (client_id,))
+            count = self._insert_domains(conn, client_id, domains, now)
+            conn.execute("UPDATE tenants SET domain_count = ? WHERE client_id = ?", (count, client_id))
+        return count
+
+    def add_domains(self, client_id, domains):
+        """
+        Bulk import: adds domains in one transaction and returns how many
+        were new. Creates the tenant if needed.
+        """
+        domains = self._normalize(domains)
+        now = datetime.utcnow().isoformat()
+
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO tenants (client_id, created_at) VALUES (?, ?)", (client_id, now)
+            )
+            added = self._insert_domains(conn, client_id, domains, now)
+            conn.execute(
+                "UPDATE tenants SET domain_count = domain_count + ? WHERE client_id = ?", (added, client_id)
+            )
+        return added
+
+    def remove_domain(self, client_id, domain):
+        with self._db.transaction() as conn:
+            removed = conn.execute(
+                "DELETE FROM tenant_domains WHERE client_id = ? AND domain = ?",
+                (client_id, normalize_domain(domain)),
+            ).rowcount
+            conn.execute(
+                "UPDATE tenants SET domain_count = domain_count - ? WHERE client_id = ?", (removed, client_id)
+            )
+        return bool(removed)
+
+    def remove_tenant(self, client_id):
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM tenant_domains WHERE client_id = ?", (client_id,))
+            return bool(conn.execute("DELETE FROM tenants WHERE client_id = ?", (client_id,)).rowcount)
+
+    # ---------------------------
+    # Lookups
+    # ---------------------------
+    def owners(self, domain):
+        """
+        Tenants that registered a domain (domain index lookup).
+        """
+        rows = self._db.query(
+            "SELECT client_id FROM tenant_domains WHERE domain = ?", (normalize_domain(domain),)
+        )
+        return [row[0] for row in rows]
+
+    def owns(self, client_id, domain):
+        return self._db.query_one(
+            "SELECT 1 FROM tenant_domains WHERE client_id = ? AND domain = ?",
+            (client_id, normalize_domain(domain)),
+        ) is not None
+
+    def domain_count(self, client_id):
+        row = self._db.query_one("SELECT domain_count FROM tenants WHERE client_id = ?", (client_id,))
+        return row[0] if row else 0
+
+    def domains(self, client_id):
+        rows = self._db.query(
+            "SELECT domain FROM tenant_domains WHERE client_id = ? ORDER BY domain", (client_id,)
+        )
+        return [row[0] for row in rows]
+
+    def iter_all_domains(self, page_size=PAGE_SIZE):
+        """
+        Every registered domain once, streamed in index order one page at
+        a time (no lock is held between pages).
+        """
+        last = ""
+        while True:
+            rows = self._db.query(
+                "SELECT DISTINCT domain FROM tenant_domains WHERE domain > ? ORDER BY domain LIMIT ?",
+                (last, page_size),
+            )
+            for row in rows:
+                yield row[0]
+            if len(rows) < page_size:
+                return
+            last = rows[-1][0]
+
+    # ---------------------------
+    # Dict-style access
+    # ---------------------------
+    def __contains__(self, client_id):
+        return self._db.query_one("SELECT 1 FROM tenants WHERE client_id = ?", (client_id,)) is not None
+
+    def __getitem__(self, client_id):
+        row = self._db.query_one("SELECT created_at FROM tenants WHERE client_id = ?", (client_id,))
+        if row is None:
+            raise KeyError(client_id)
+        return {"domains": self.domains(client_id), "created_at": row[0]}
+
+    def __iter__(self):
+        return iter([row[0] for row in self._db.query("SELECT client_id FROM tenants ORDER BY client_id")])
+
+    def __len__(self):
+        return self._db.query_one("SELECT COUNT(*) FROM tenants")[0]
+
+
+REGISTRY = TenantRegistry()
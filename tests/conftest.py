@@ -0,0 +1,67 @@
+import base64
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Modules create their stores (SQLite files, log folders) relative to the
+# working directory at import time, so run the whole session in a scratch dir
+WORKDIR = tempfile.mkdtemp(prefix="sitepulseai-tests-")
+os.chdir(WORKDIR)
+
+SIGNING_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+os.environ["PUBLIC_KEY_PEM"] = SIGNING_KEY.public_key().public_bytes(
+    serialization.Encoding.PEM,
+    serialization.PublicFormat.SubjectPublicKeyInfo,
+).decode()
+
+
+@pytest.fixture
+def issue_license():
+    """
+    Write a signed license file the way generate_license does for production.
+    """
+    import license_enforcer
+
+    def issue(client_id, domains, max_sites=5, features=(), tier="tier_1", expiration_date="2099-12-31"):
+        payload = f"{client_id}{tier}{license_enforcer._canonical_domains(domains)}{expiration_date}".encode()
+        signature = SIGNING_KEY.sign(payload, padding.PKCS1v15(), hashes.SHA256())
+
+        license_data = {
+            "client_id": client_id,
+            "tier": tier,
+            "domains": list(domains),
+            "max_sites": max_sites,
+            "features": list(features),
+            "expiration_date": expiration_date,
+            "signature": base64.b64encode(signature).decode(),
+        }
+        os.makedirs(license_enforcer.LICENSE_FOLDER, exist_ok=True)
+        with open(os.path.join(license_enforcer.LICENSE_FOLDER, f"{client_id}.json"), "w") as f:
+            json.dump(license_data, f)
+
+        license_enforcer.invalidate_license_cache(client_id)
+        return license_data
+
+    return issue
+
+
+@pytest.fixture
+def signing_key_path(tmp_path):
+    """
+    The session signing key as a PEM file, for TelemetryLogger(key_path=...).
+    """
+    path = tmp_path / "signing_key.pem"
+    path.write_bytes(SIGNING_KEY.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    return str(path)
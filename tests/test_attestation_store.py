@@ -0,0 +1,55 @@
+import hashlib
+
+from telemetry_attestation import AttestationStore
+
+
+def test_same_second_attestations_are_all_kept(tmp_path):
+    store = AttestationStore(str(tmp_path / "attestations.db"))
+
+    certificates = [store.append("C1", "a.com", {"run": i}) for i in range(50)]
+
+    assert len(set(certificates)) == 50
+    assert len(store.query("C1", "a.com", limit=1000)) == 50
+
+
+def test_certificate_is_hash_of_stored_payload(tmp_path):
+    store = AttestationStore(str(tmp_path / "attestations.db"))
+    certificate = store.append("C1", "a.com", {"uptime": "100%"})
+
+    payload = store._db.query_one("SELECT payload FROM attestations WHERE certificate = ?", (certificate,))[0]
+
+    assert hashlib.sha256(payload.encode()).hexdigest() == certificate
+    assert store.verify(certificate)
+    assert not store.verify("0" * 64)
+
+
+def test_get_by_certificate(tmp_path):
+    store = AttestationStore(str(tmp_path / "attestations.db"))
+    certificate = store.append("C1", "a.com", {"uptime": "100%"})
+
+    record = store.get(certificate)
+
+    assert record["certificate"] == certificate
+    assert record["client_id"] == "C1"
+    assert record["domain"] == "a.com"
+    assert record["results"] == {"uptime": "100%"}
+    assert store.get("missing") is None
+
+
+def test_query_by_client_domain_and_time_range(tmp_path):
+    store = AttestationStore(str(tmp_path / "attestations.db"))
+    for i in range(6):
+        store.append("C1", "a.com", {"run": i})
+    store.append("C1", "b.com", {"run": 0})
+    store.append("C2", "a.com", {"run": 0})
+
+    records = store.query("C1", "a.com")
+    assert [r["results"]["run"] for r in records] == [5, 4, 3, 2, 1, 0]
+
+    start, end = records[4]["timestamp"], records[1]["timestamp"]
+    in_range = store.query("C1", "a.com", start=start, end=end)
+    assert [r["results"]["run"] for r in in_range] == [3, 2, 1]
+
+    assert len(store.query("C1")) == 7
+    assert len(store.query("C1", limit=2)) == 2
+    assert [r["client_id"] for r in store.query("C2")] == ["C2"]
@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from batch_stream import iter_checks, stream_checks
+
+DELAYS = {"slow.com": 0.15, "mid.com": 0.08, "fast.com": 0.01}
+
+
+async def _check(domain):
+    if domain == "broken.com":
+        raise RuntimeError("unreachable")
+    await asyncio.sleep(DELAYS[domain])
+    return {"domain": domain, "ok": True}
+
+
+def _client(fmt):
+    app = FastAPI()
+
+    @app.get("/stream")
+    def stream():
+        return stream_checks(["slow.com", "broken.com", "mid.com", "fast.com"], _check, fmt=fmt)
+
+    return TestClient(app)
+
+
+def test_ndjson_streams_results_in_completion_order():
+    response = _client("ndjson").get("/stream")
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    messages = [json.loads(line) for line in response.text.splitlines()]
+
+    assert messages[0] == {"event": "start", "total": 4}
+    assert messages[-1]["event"] == "done"
+
+    results = messages[1:-1]
+    assert [m["domain"] for m in results] == ["broken.com", "fast.com", "mid.com", "slow.com"]
+    assert [m["completed"] for m in results] == [1, 2, 3, 4]
+    assert results[0]["error"] == "unreachable"
+    assert results[1]["result"] == {"domain": "fast.com", "ok": True}
+
+
+def test_sse_uses_named_events():
+    response = _client("sse").get("/stream")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n")[0] for block in response.text.strip().split("\n\n")]
+    assert events == ["event: start"] + ["event: result"] * 4 + ["event: done"]
+
+
+def test_concurrency_is_bounded_and_early_stop_cancels_pending_checks():
+    running, peak, finished = [0], [0], []
+
+    async def check(domain):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            running[0] -= 1
+        finished.append(domain)
+        return domain
+
+    async def consume():
+        records = iter_checks([f"d{i}.com" for i in range(10)], check, concurrency=3)
+        first = await records.__anext__()
+        await records.aclose()
+        await asyncio.sleep(0.05)
+        return first
+
+    first = asyncio.run(consume())
+
+    assert first["result"] in finished
+    assert peak[0] <= 3
+    assert len(finished) < 10
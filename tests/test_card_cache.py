@@ -0,0 +1,97 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import cert_facts
+import ssl_automation
+from card_cache import CardCache, ERROR_TTL
+
+
+def test_concurrent_misses_share_one_probe_and_count_as_coalesced():
+    cache = CardCache(ttls={"ssl": (60, 60)})
+    probes = []
+
+    async def probe():
+        probes.append(1)
+        await asyncio.sleep(0.02)
+        return {"status": "valid"}
+
+    async def run():
+        return await asyncio.gather(*(cache.get("ssl", "a.com", probe) for _ in range(10)))
+
+    results = asyncio.run(run())
+
+    assert len(probes) == 1
+    assert all(r == {"status": "valid", "cache_age_s": 0} for r in results)
+    assert cache.stats()["cards"]["ssl"] == {"hits": 0, "stale": 0, "misses": 1, "coalesced": 9, "probes": 1}
+
+
+def test_fresh_entries_are_hits_and_stale_entries_refresh():
+    cache = CardCache(ttls={"uptime": (60, 600)})
+    values = iter(["first", "second"])
+
+    def probe():
+        return next(values)
+
+    async def run():
+        first = await cache.get("uptime", "A.com ", probe)
+        hit = await cache.get("uptime", "a.com", probe)
+
+        # Age the entry past fresh but inside the stale window
+        fetched_at, value, fresh, stale = cache._entries[("uptime", "a.com")]
+        cache._entries[("uptime", "a.com")] = (fetched_at - 120, value, fresh, stale)
+
+        stale = await cache.get("uptime", "a.com", probe)
+        await asyncio.sleep(0.05)
+        refreshed = await cache.get("uptime", "a.com", probe)
+        return first, hit, stale, refreshed
+
+    assert asyncio.run(run()) == ("first", "first", "first", "second")
+    counters = cache.stats()["cards"]["uptime"]
+    assert counters["hits"] == 2 and counters["stale"] == 1 and counters["probes"] == 2
+
+
+def test_error_shaped_results_are_kept_briefly_and_never_served_stale():
+    cache = CardCache(ttls={"seo": (900, 3600)})
+
+    async def run():
+        return await cache.get("seo", "down.com", lambda: {"score": None, "status": "Not scanned"})
+
+    result = asyncio.run(run())
+
+    assert result["status"] == "Not scanned"
+    assert cache._entries[("seo", "down.com")][2:] == ERROR_TTL
+
+
+def test_cached_results_report_their_age():
+    cache = CardCache(ttls={"uptime": (60, 600)})
+
+    async def run():
+        await cache.get("uptime", "a.com", lambda: {"status": "Online"})
+        fetched_at, value, fresh, stale = cache._entries[("uptime", "a.com")]
+        cache._entries[("uptime", "a.com")] = (fetched_at - 30, value, fresh, stale)
+        return await cache.get("uptime", "a.com", lambda: {"status": "Online"})
+
+    result = asyncio.run(run())
+
+    assert result["cache_age_s"] >= 30
+    assert "cache_age_s" not in cache._entries[("uptime", "a.com")][1]
+
+
+def test_ssl_card_ttl_follows_cert_facts_and_stops_at_expiry(monkeypatch):
+    expires_at = datetime.utcnow() + timedelta(hours=2)
+    facts = {"fetched_at": time.time(), "ttl": 300, "error": None, "expires_at": expires_at}
+    monkeypatch.setattr(ssl_automation, "peek_cert_facts", lambda domain: facts)
+
+    fresh, stale = ssl_automation.ssl_card_ttl("a.com", {"managed": True})
+
+    assert 295 <= fresh <= 300
+    assert fresh + stale <= 2 * 3600
+
+    facts["error"] = "timed out"
+    assert ssl_automation.ssl_card_ttl("a.com", {"managed": False})[1] == 0
+
+
+def test_peek_cert_facts_never_handshakes(monkeypatch):
+    monkeypatch.setattr(cert_facts, "_handshake", lambda domain: (_ for _ in ()).throw(AssertionError))
+    assert cert_facts.peek_cert_facts("never-fetched.example") is None
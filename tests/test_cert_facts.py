@@ -0,0 +1,40 @@
+import threading
+import time
+
+import cert_facts
+
+
+def _fake_handshake(calls, ttl=300):
+    def handshake(domain):
+        calls.append(domain)
+        time.sleep(0.02)
+        return {"domain": domain, "fetched_at": time.time(), "ttl": ttl, "error": None}
+    return handshake
+
+
+def test_concurrent_checkers_share_one_handshake(monkeypatch):
+    calls = []
+    monkeypatch.setattr(cert_facts, "_handshake", _fake_handshake(calls))
+
+    threads = [threading.Thread(target=cert_facts.get_cert_facts, args=("Shared-TLS.com",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ["shared-tls.com"]
+    assert "shared-tls.com" not in cert_facts._FACTS._locks
+
+
+def test_expired_facts_are_refetched_and_cache_is_bounded(monkeypatch):
+    calls = []
+    monkeypatch.setattr(cert_facts, "_handshake", _fake_handshake(calls, ttl=0))
+    monkeypatch.setattr(cert_facts._FACTS, "max_entries", 3)
+
+    cert_facts.get_cert_facts("expired.com")
+    cert_facts.get_cert_facts("expired.com")
+    assert calls == ["expired.com", "expired.com"]
+
+    for i in range(10):
+        cert_facts.get_cert_facts(f"bound{i}.com")
+    assert len(cert_facts._FACTS) <= 3
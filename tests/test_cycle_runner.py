@@ -0,0 +1,55 @@
+import time
+
+from cycle_runner import CycleRunner
+
+
+def _slow_check(seconds, failing=()):
+    def check(domain):
+        time.sleep(seconds)
+        return domain not in failing
+    return check
+
+
+def test_cycle_within_interval_is_not_an_overrun():
+    runner = CycleRunner(lambda: ["a.com", "b.com", "c.com"], _slow_check(0.01, failing={"c.com"}),
+                         interval=5, concurrency=3)
+
+    stats = runner.run_cycle()
+
+    assert stats["domains"] == 3
+    assert stats["succeeded"] == 2 and stats["failed"] == 1
+    assert not stats["overrun"]
+    assert runner.stats()["keeping_up"]
+
+
+def test_cycle_longer_than_interval_is_flagged_as_overrun():
+    # Four 50 ms checks on one worker cannot fit a 100 ms interval
+    runner = CycleRunner(lambda: ["a.com", "b.com", "c.com", "d.com"], _slow_check(0.05),
+                         interval=0.1, concurrency=1)
+
+    stats = runner.run_cycle()
+
+    assert stats["overrun"]
+    assert stats["utilization"] > 1
+    assert len(stats["slowest"]) == 4
+
+    summary = runner.stats()
+    assert summary["overruns"] == 1
+    assert not summary["keeping_up"]
+    assert summary["last_cycle"] == stats
+
+
+def test_prepare_runs_first_and_check_errors_count_as_failures():
+    calls = []
+
+    def check(domain):
+        calls.append(("check", domain))
+        raise RuntimeError("boom")
+
+    runner = CycleRunner(lambda: ["a.com"], check, interval=5, concurrency=1,
+                         prepare=lambda domains: calls.append(("prepare", tuple(domains))))
+
+    stats = runner.run_cycle()
+
+    assert calls == [("prepare", ("a.com",)), ("check", "a.com")]
+    assert stats["failed"] == 1
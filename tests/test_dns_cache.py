@@ -0,0 +1,147 @@
+import asyncio
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+import dns_cache
+
+
+def _fake_lookup(calls, ttl=120):
+    def lookup(domain):
+        calls.append(domain)
+        time.sleep(0.02)
+        return ["192.0.2.1"], ttl, "test"
+    return lookup
+
+
+def test_sync_callers_share_one_lookup(monkeypatch):
+    calls = []
+    monkeypatch.setattr(dns_cache, "_lookup", _fake_lookup(calls))
+
+    threads = [threading.Thread(target=dns_cache.resolve, args=("Shared-DNS.com.",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ["shared-dns.com"]
+    assert dns_cache.resolve("shared-dns.com")["cached"] is True
+    assert "shared-dns.com" not in dns_cache._RECORDS._locks
+
+
+def test_async_callers_share_one_lookup(monkeypatch):
+    calls = []
+
+    async def lookup_async(domain):
+        calls.append(domain)
+        await asyncio.sleep(0.02)
+        return ["192.0.2.2"], 120, "test"
+
+    monkeypatch.setattr(dns_cache, "_lookup_async", lookup_async)
+
+    records = asyncio.run(dns_cache.resolve_many(["a-async.com", "b-async.com", "a-async.com"]))
+
+    async def burst():
+        return await asyncio.gather(*(dns_cache.resolve_async("c-async.com") for _ in range(5)))
+
+    again = asyncio.run(burst())
+
+    assert sorted(calls) == ["a-async.com", "b-async.com", "c-async.com"]
+    assert records["a-async.com"]["addresses"] == ["192.0.2.2"]
+    assert sum(not r["cached"] for r in again) == 1
+
+
+def test_ttls_are_clamped_and_failures_cached_briefly(monkeypatch):
+    monkeypatch.setattr(dns_cache, "_lookup", _fake_lookup([], ttl=0))
+    assert dns_cache.resolve("zero-ttl.com")["ttl"] == dns_cache.MIN_TTL
+
+    def failing(domain):
+        raise OSError("nxdomain")
+
+    monkeypatch.setattr(dns_cache, "_lookup", failing)
+    record = dns_cache.resolve("missing.invalid")
+    assert record["error"] == "nxdomain"
+    assert record["ttl"] == dns_cache.NEGATIVE_TTL
+
+
+def test_record_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(dns_cache, "_lookup", _fake_lookup([]))
+    monkeypatch.setattr(dns_cache._RECORDS, "max_entries", 4)
+
+    for i in range(12):
+        dns_cache.resolve(f"bound{i}.example")
+
+    assert len(dns_cache._RECORDS) == 4
+
+
+def test_ip_literals_skip_the_resolver():
+    record = dns_cache.resolve("127.0.0.1")
+    assert record["resolver"] == "literal"
+    assert record["addresses"] == ["127.0.0.1"]
+
+
+class _FakeDNSException(Exception):
+    pass
+
+
+class _Answer(list):
+    """
+    Iterates rdatas and exposes rrset.ttl, like a dnspython Answer.
+    """
+    def __init__(self, addresses, ttl):
+        super().__init__(SimpleNamespace(address=a) for a in addresses)
+        self.rrset = SimpleNamespace(ttl=ttl)
+
+
+def _fake_dns(monkeypatch, zone):
+    """
+    Stub dnspython; zone maps (domain, rdtype) -> (addresses, ttl).
+    """
+    def resolve(domain, rdtype, lifetime=None):
+        if (domain, rdtype) not in zone:
+            raise _FakeDNSException(f"{rdtype} {domain}: NXDOMAIN")
+        return _Answer(*zone[(domain, rdtype)])
+
+    async def resolve_async(domain, rdtype, lifetime=None):
+        return resolve(domain, rdtype, lifetime)
+
+    fake = SimpleNamespace(
+        resolver=SimpleNamespace(resolve=resolve),
+        asyncresolver=SimpleNamespace(resolve=resolve_async),
+        exception=SimpleNamespace(DNSException=_FakeDNSException),
+    )
+    monkeypatch.setattr(dns_cache, "HAS_DNSPYTHON", True)
+    monkeypatch.setattr(dns_cache, "dns", fake, raising=False)
+
+
+def test_dnspython_merges_a_and_aaaa_and_keeps_the_lowest_ttl(monkeypatch):
+    _fake_dns(monkeypatch, {
+        ("dual.example", "A"): (["192.0.2.10", "192.0.2.11"], 600),
+        ("dual.example", "AAAA"): (["2001:db8::1"], 90),
+    })
+
+    for addresses, ttl, resolver in (
+        dns_cache._lookup("dual.example"),
+        asyncio.run(dns_cache._lookup_async("dual.example")),
+    ):
+        assert addresses == ["192.0.2.10", "192.0.2.11", "2001:db8::1"]
+        assert ttl == 90
+        assert resolver == "dnspython"
+
+
+def test_dnspython_misses_fall_back_to_the_system_resolver(monkeypatch):
+    _fake_dns(monkeypatch, {})
+    infos = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("198.51.100.7", 0))]
+    monkeypatch.setattr(socket, "getaddrinfo", lambda *args, **kwargs: infos)
+
+    async def getaddrinfo(*args, **kwargs):
+        return infos
+
+    assert dns_cache._lookup("hosts-file-only") == (["198.51.100.7"], dns_cache.DEFAULT_TTL, "system")
+
+    async def lookup():
+        monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo)
+        return await dns_cache._lookup_async("hosts-file-only")
+
+    assert asyncio.run(lookup()) == (["198.51.100.7"], dns_cache.DEFAULT_TTL, "system")
@@ -0,0 +1,55 @@
+import threading
+import time
+
+import expiring_cache
+from expiring_cache import ExpiringCache
+
+
+def _cache(max_entries=3, ttl=60):
+    return ExpiringCache(max_entries, lambda value: value["at"] + ttl)
+
+
+def test_least_recently_used_entries_go_first():
+    cache = _cache(max_entries=2)
+    now = time.time()
+    cache.put("a", {"at": now})
+    cache.put("b", {"at": now})
+    cache.get("a")
+
+    cache.put("c", {"at": now})
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert len(cache) == 2
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    cache = _cache(max_entries=10, ttl=60)
+    cache.put("old", {"at": time.time() - 120})
+    cache.put("stale", {"at": time.time() - 120})
+
+    assert cache.get("old") is None
+    assert len(cache) == 1
+
+    monkeypatch.setattr(expiring_cache, "SWEEP_INTERVAL", 0)
+    cache.put("fresh", {"at": time.time()})
+    assert len(cache) == 1
+
+
+def test_key_locks_are_released_after_use():
+    cache = _cache()
+    entered = []
+
+    def worker(key):
+        with cache.lock(key):
+            entered.append(key)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=worker, args=(f"k{i % 3}",)) for i in range(12)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(entered) == 12
+    assert cache._locks == {}
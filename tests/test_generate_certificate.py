@@ -0,0 +1,103 @@
+import io
+import json
+import os
+import zipfile
+
+import pytest
+from PIL import Image
+
+import generate_certificate as certificates
+
+
+@pytest.fixture(autouse=True)
+def inline_rendering(monkeypatch):
+    monkeypatch.setattr(certificates, "RENDER_WORKERS", 1)
+
+
+def test_single_certificate_is_indexed():
+    result = certificates.generate_site_certificate("single.com")
+
+    public = certificates.get_certificate(result["cert_id"])
+    image, ext = certificates.get_certificate_image(result["cert_id"])
+
+    assert public["site"] == "single.com"
+    assert public["audit_reference"] == result["audit_ref"]
+    assert ext == ".png" and image[:4] == b"\x89PNG"
+
+
+def test_batch_writes_one_bundle_per_layer():
+    sites = [f"batch{i}.com" for i in range(5)]
+    before = {d: set(os.listdir(d)) for d in (certificates.OUTPUT_DIR, certificates.AUDIT_DIR, certificates.INTERNAL_DIR)}
+
+    batch = certificates.generate_site_certificates(sites)
+
+    added = {d: set(os.listdir(d)) - names for d, names in before.items()}
+    batch_id = batch["batch_id"]
+    assert added[certificates.OUTPUT_DIR] == {f"{batch_id}.jsonl", f"{batch_id}.zip"}
+    assert added[certificates.AUDIT_DIR] == {f"{batch_id}.jsonl"}
+    assert added[certificates.INTERNAL_DIR] == {f"{batch_id}.jsonl"}
+
+    with zipfile.ZipFile(batch["image_path"]) as bundle:
+        assert len(bundle.namelist()) == 5
+
+    with open(batch["audit_path"]) as f:
+        audits = [json.loads(line) for line in f]
+    assert [a["site"] for a in audits] == sites
+
+
+def test_batch_certificates_are_found_by_id():
+    batch = certificates.generate_site_certificates(["x.com", "y.com", "z.com"])
+
+    for cert in batch["certificates"]:
+        public = certificates.get_certificate(cert["cert_id"])
+        image, ext = certificates.get_certificate_image(cert["cert_id"])
+
+        assert public["certificate_id"] == cert["cert_id"]
+        assert public["site"] == cert["site"]
+        assert public["audit_reference"] == cert["audit_ref"]
+        assert ext == ".png" and image[:4] == b"\x89PNG"
+
+    assert certificates.get_certificate("SPAI-MISSING") is None
+    assert certificates.get_certificate_image("SPAI-MISSING") is None
+
+
+def _public(site):
+    return certificates.build_public_certificate(site, "99.9%", "VALID", "30 days", f"SPAI-{site}", "AUDIT-1")
+
+
+@pytest.mark.parametrize("fmt, ext, image_format, mode", [
+    ("png", ".png", "PNG", "RGB"),
+    ("png-optimized", ".png", "PNG", "P"),
+    ("webp", ".webp", "WEBP", "RGB"),
+])
+def test_images_render_in_each_format(fmt, ext, image_format, mode):
+    data, extension = certificates.encode_certificate_image(_public("fmt.com"), fmt)
+
+    image = Image.open(io.BytesIO(data))
+    assert extension == ext
+    assert image.format == image_format
+    assert image.mode == mode
+    assert image.size == certificates.CANVAS_SIZE
+
+
+def test_compact_formats_are_smaller_than_png():
+    sizes = {fmt: len(certificates.encode_certificate_image(_public("size.com"), fmt)[0])
+             for fmt in ("png", "png-optimized", "webp")}
+
+    assert sizes["png-optimized"] < sizes["png"]
+    assert sizes["webp"] < sizes["png"]
+
+
+def test_render_pool_keeps_input_order(monkeypatch):
+    monkeypatch.setattr(certificates, "RENDER_WORKERS", 2)
+    monkeypatch.setattr(certificates, "_RENDER_POOL", None)
+    public_certs = [_public(f"pool{i}.com") for i in range(4)]
+
+    try:
+        pooled = certificates.render_certificate_images(public_certs, "webp")
+    finally:
+        certificates._RENDER_POOL.shutdown()
+
+    inline = [certificates.encode_certificate_image(cert, "webp") for cert in public_certs]
+    assert [ext for _, ext in pooled] == [".webp"] * 4
+    assert pooled == inline
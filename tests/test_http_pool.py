@@ -0,0 +1,34 @@
+import asyncio
+
+import httpx
+
+import http_pool
+from dns_cache import CachedDNSBackend, CachedDNSSyncBackend
+
+
+def test_transports_resolve_through_the_dns_cache():
+    sync_transport = http_pool._transport(httpx.HTTPTransport, CachedDNSSyncBackend)
+    async_transport = http_pool._transport(httpx.AsyncHTTPTransport, CachedDNSBackend)
+
+    assert isinstance(sync_transport._pool._network_backend, CachedDNSSyncBackend)
+    assert isinstance(async_transport._pool._network_backend, CachedDNSBackend)
+
+
+def test_host_limits_cap_concurrency_and_are_dropped_when_idle(monkeypatch):
+    monkeypatch.setattr(http_pool, "PER_HOST_LIMIT", 2)
+    active, peak = {}, {}
+
+    async def request(host):
+        async with http_pool._host_limit(f"https://{host}/path"):
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+
+    async def run():
+        await asyncio.gather(*(request(f"limit{i % 3}.example") for i in range(12)))
+
+    asyncio.run(run())
+
+    assert peak == {"limit0.example": 2, "limit1.example": 2, "limit2.example": 2}
+    assert not any(host in http_pool._HOST_LIMITS for host in peak)
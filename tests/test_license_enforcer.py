@@ -0,0 +1,70 @@
+import json
+import os
+
+import pytest
+from fastapi import HTTPException
+
+import license_enforcer
+from tenant_registry import REGISTRY
+
+
+def test_registered_www_domain_is_not_counted_twice(issue_license):
+    issue_license("LIC-WWW", ["a.com"], max_sites=1)
+    REGISTRY.register("LIC-WWW", ["https://www.a.com"])
+
+    license_enforcer.enforce_domain_guard("LIC-WWW", ["https://www.a.com"])
+    license_enforcer.enforce_domain_guard("LIC-WWW", ["a.com"])
+
+
+def test_registered_domains_count_toward_max_sites(issue_license):
+    issue_license("LIC-MAX", ["a.com", "b.com", "c.com"], max_sites=2)
+    REGISTRY.register("LIC-MAX", ["a.com", "b.com"])
+
+    license_enforcer.enforce_domain_guard("LIC-MAX", ["a.com", "b.com"])
+
+    with pytest.raises(HTTPException) as exc:
+        license_enforcer.enforce_domain_guard("LIC-MAX", ["c.com"])
+    assert exc.value.status_code == 403
+    assert "max_sites" in exc.value.detail
+
+
+def test_batch_over_max_sites_is_rejected(issue_license):
+    issue_license("LIC-BATCH", ["a.com", "b.com"], max_sites=1)
+
+    with pytest.raises(HTTPException) as exc:
+        license_enforcer.enforce_domain_guard("LIC-BATCH", ["a.com", "www.b.com"])
+    assert "max_sites" in exc.value.detail
+
+
+def test_unlicensed_domain_is_rejected(issue_license):
+    issue_license("LIC-ALLOW", ["a.com"], max_sites=5)
+
+    with pytest.raises(HTTPException) as exc:
+        license_enforcer.enforce_domain_guard("LIC-ALLOW", ["evil.com"])
+    assert "Unauthorized" in exc.value.detail
+
+
+def test_tampered_license_fails_signature_check(issue_license):
+    issue_license("LIC-SIG", ["a.com"])
+    license_enforcer.get_license("LIC-SIG")
+
+    path = os.path.join(license_enforcer.LICENSE_FOLDER, "LIC-SIG.json")
+    with open(path) as f:
+        data = json.load(f)
+    data["domains"].append("b.com")
+    with open(path, "w") as f:
+        json.dump(data, f)
+    license_enforcer.invalidate_license_cache("LIC-SIG")
+
+    with pytest.raises(HTTPException) as exc:
+        license_enforcer.get_license("LIC-SIG")
+    assert exc.value.status_code == 403
+
+
+def test_validate_domain_and_feature_access(issue_license):
+    issue_license("LIC-FEAT", ["www.a.com"], features=["ssl"])
+
+    assert license_enforcer.validate_domain("LIC-FEAT", "https://a.com")
+    assert license_enforcer.check_feature_access("LIC-FEAT", "ssl")
+    with pytest.raises(HTTPException):
+        license_enforcer.check_feature_access("LIC-FEAT", "seo")
@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+
+import main
+from live_updates import feed
+
+
+def test_segment_domains_join_the_monitoring_cycle():
+    client = TestClient(main.app)
+    client.post("/add_url", json={"domain": "cycle-seg.com", "segment": "cycle-test"})
+
+    assert "cycle-seg.com" in main.cycle_domains()
+    assert main.cycle_domains().count("cycle-seg.com") == 1
+
+
+def test_add_url_publishes_a_live_update(monkeypatch):
+    def fake_check(domain):
+        feed.publish(domain, {"security": {"vulnerabilities": {"counts": {"high": 1}}}})
+        return True
+
+    monkeypatch.setattr(main.CYCLE_RUNNER, "check", fake_check)
+
+    futures = []
+    check_now = main.CYCLE_RUNNER.check_now
+    monkeypatch.setattr(main.CYCLE_RUNNER, "check_now", lambda domain: futures.append(check_now(domain)))
+    client = TestClient(main.app)
+
+    client.post("/add_url", json={"domain": "live-seg.com", "segment": "live-test"})
+
+    assert len(futures) == 1
+    assert futures[0].result(timeout=10)[1] is True
+    assert "live-seg.com" in feed.snapshot()["domains"]
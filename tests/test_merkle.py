@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+
+import pytest
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+
+import persistence
+from conftest import SIGNING_KEY
+from merkle import build_tree, verify_proof
+from persistence import TelemetryLogger
+
+
+def _hashes(count):
+    return [hashlib.sha256(str(i).encode()).hexdigest() for i in range(count)]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 8, 13])
+def test_every_leaf_proves_inclusion(count):
+    leaves = _hashes(count)
+    root, proofs = build_tree(leaves)
+
+    for leaf, proof in zip(leaves, proofs):
+        assert verify_proof(leaf, proof, root)
+
+
+def test_proof_rejects_other_leaves_and_roots():
+    leaves = _hashes(6)
+    root, proofs = build_tree(leaves)
+    other_root, _ = build_tree(_hashes(7))
+
+    assert not verify_proof(leaves[1], proofs[0], root)
+    assert not verify_proof(leaves[0], proofs[0], other_root)
+
+
+def test_batch_logger_signs_the_root_once_per_block(tmp_path, signing_key_path):
+    logger = TelemetryLogger(log_dir=str(tmp_path), key_path=signing_key_path, batch_size=4, batch_interval_ms=60000)
+
+    for i in range(6):
+        logger.log({"event": "probe", "n": i})
+    logger.flush()
+
+    (log_name,) = [name for name in os.listdir(tmp_path) if name.endswith(".log")]
+    with open(tmp_path / log_name) as f:
+        records = [json.loads(line) for line in f]
+
+    assert len(records) == 6
+    assert [r["batch"]["size"] for r in records] == [4, 4, 4, 4, 2, 2]
+    assert len({r["batch"]["root"] for r in records}) == 2
+
+    public_key = SIGNING_KEY.public_key()
+    for record in records:
+        batch = record["batch"]
+        assert verify_proof(record["hash"], batch["proof"], batch["root"])
+        public_key.verify(bytes.fromhex(batch["signature"]), batch["root"].encode(), padding.PKCS1v15(), hashes.SHA256())
+
+    # Events stay hash-chained across block boundaries
+    assert [r["prev_hash"] for r in records[1:]] == [r["hash"] for r in records[:-1]]
+
+
+def test_batch_logger_seals_held_events_at_exit(tmp_path, signing_key_path, monkeypatch):
+    exit_hooks = []
+    monkeypatch.setattr(persistence.atexit, "register", exit_hooks.append)
+
+    logger = TelemetryLogger(log_dir=str(tmp_path), key_path=signing_key_path, batch_size=4, batch_interval_ms=60000)
+    logger.log({"event": "probe", "n": 0})
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".log")]
+
+    for hook in exit_hooks:
+        hook()
+
+    (log_name,) = [name for name in os.listdir(tmp_path) if name.endswith(".log")]
+    with open(tmp_path / log_name) as f:
+        assert [json.loads(line)["batch"]["size"] for line in f] == [1]
@@ -0,0 +1,32 @@
+from fastapi.testclient import TestClient
+
+import main
+from telemetry_attestation import ATTESTATIONS
+
+
+def test_monitor_records_event_and_attestation(issue_license):
+    issue_license("MON-CLIENT", ["example.com"])
+    client = TestClient(main.app)
+
+    response = client.post("/monitor", params={"client_id": "MON-CLIENT", "domain": "example.com"})
+
+    assert response.status_code == 200
+    body = response.json()
+
+    event = body["telemetry_event_record"]
+    assert event["results_snapshot"]["domain"] == "example.com"
+    assert "telemetry_event_record" not in event["results_snapshot"]
+
+    record = ATTESTATIONS.get(body["telemetry_certificate"])
+    assert record["client_id"] == "MON-CLIENT"
+    assert "telemetry_event_record" not in record["results"]
+    assert ATTESTATIONS.verify(body["telemetry_certificate"])
+
+
+def test_monitor_rejects_unlicensed_domain(issue_license):
+    issue_license("MON-CLIENT-2", ["example.com"])
+    client = TestClient(main.app)
+
+    response = client.post("/monitor", params={"client_id": "MON-CLIENT-2", "domain": "other.com"})
+
+    assert response.status_code == 403
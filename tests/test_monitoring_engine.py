@@ -0,0 +1,52 @@
+import time
+
+import monitoring_engine
+from monitoring_engine import MonitoringScheduler
+
+
+class _Registry:
+    def __init__(self, domains):
+        self._domains = domains
+
+    def iter_all_domains(self):
+        return iter(self._domains)
+
+
+def test_start_monitoring_skips_domains_another_loop_owns(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(monitoring_engine, "get_all_sites", lambda: ["licensed.com", "shared.com"])
+    monkeypatch.setattr(monitoring_engine, "TENANT_REGISTRY", _Registry(["tenant.com", "segment.com"]))
+    monkeypatch.setattr(monitoring_engine, "start_domain_monitoring", lambda domain: scheduled.append(domain))
+
+    monitoring_engine.start_monitoring(skip=["shared.com", "segment.com"])
+
+    assert scheduled == ["licensed.com", "tenant.com"]
+
+
+def test_removed_domain_stops_running(monkeypatch):
+    runs = []
+
+    def check(domain):
+        runs.append(domain)
+
+    monkeypatch.setattr(monitoring_engine, "run_monitor", check)
+    scheduler = MonitoringScheduler(interval=0.05, workers=2)
+    scheduler.add("kept.com", delay=0)
+    scheduler.add("removed.com", delay=0)
+
+    try:
+        time.sleep(0.2)
+        scheduler.remove("removed.com")
+        time.sleep(0.05)
+        removed_runs = runs.count("removed.com")
+        time.sleep(0.2)
+        domains = scheduler.domains()
+    finally:
+        # The scheduler thread outlives the test; leave it nothing to run
+        scheduler.remove("kept.com")
+        time.sleep(0.05)
+
+    assert removed_runs >= 2
+    assert runs.count("removed.com") == removed_runs
+    assert runs.count("kept.com") > removed_runs
+    assert domains == ["kept.com"]
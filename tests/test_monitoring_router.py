@@ -0,0 +1,48 @@
+import threading
+import time
+from collections import deque
+
+import monitoring_router
+from tenant_registry import TenantRegistry
+
+
+def test_round_robin_takes_one_domain_per_tenant_in_turn():
+    queues = {"big": deque(["b1", "b2", "b3", "b4"]), "small": deque(["s1"])}
+
+    order = list(monitoring_router._round_robin(queues))
+
+    assert order == [("big", "b1"), ("small", "s1"), ("big", "b2"), ("big", "b3"), ("big", "b4")]
+
+
+def test_small_tenant_finishes_while_large_tenant_is_still_running(tmp_path, monkeypatch):
+    registry = TenantRegistry(str(tmp_path / "tenants.db"))
+    registry.register("BIG", [f"big{i}.com" for i in range(20)])
+    registry.register("SMALL", ["small0.com", "small1.com"])
+    monkeypatch.setattr(monitoring_router, "TENANT_REGISTRY", registry)
+
+    running, peak = [0], [0]
+    guard = threading.Lock()
+
+    def generate(domain):
+        with guard:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with guard:
+            running[0] -= 1
+        return {"domain": domain}
+
+    monkeypatch.setattr(monitoring_router, "generate_site_certificate", generate)
+
+    big_done_when_small_finished = []
+
+    def on_progress(progress):
+        if progress["client_id"] == "SMALL" and progress["status"] == "complete":
+            big_done_when_small_finished.append(monitoring_router.get_progress("BIG")["completed"])
+
+    results = monitoring_router.route_monitoring_events(["BIG", "SMALL"], workers=2, on_progress=on_progress)
+
+    assert len(results["BIG"]) == 20 and len(results["SMALL"]) == 2
+    assert big_done_when_small_finished and big_done_when_small_finished[0] <= 4
+    assert peak[0] <= 2
+    assert monitoring_router.get_progress("BIG")["status"] == "complete"
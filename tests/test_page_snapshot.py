@@ -0,0 +1,50 @@
+import threading
+import time
+
+import page_snapshot
+
+
+def _fake_fetch(calls):
+    def fetch(domain):
+        calls.append(domain)
+        time.sleep(0.02)
+        return {"domain": domain, "fetched_at": time.time(), "error": None}
+    return fetch
+
+
+def test_concurrent_checkers_share_one_fetch(monkeypatch):
+    calls = []
+    monkeypatch.setattr(page_snapshot, "_fetch", _fake_fetch(calls))
+
+    threads = [threading.Thread(target=page_snapshot.get_snapshot, args=("https://shared.com",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ["shared.com"]
+    assert "shared.com" not in page_snapshot._SNAPSHOTS._locks
+
+
+def test_snapshot_cache_is_bounded(monkeypatch):
+    calls = []
+    monkeypatch.setattr(page_snapshot, "_fetch", _fake_fetch(calls))
+    monkeypatch.setattr(page_snapshot._SNAPSHOTS, "max_entries", 5)
+
+    for i in range(20):
+        page_snapshot.get_snapshot(f"bound{i}.com")
+
+    assert len(page_snapshot._SNAPSHOTS) == 5
+    page_snapshot.get_snapshot("bound19.com")
+    assert len(calls) == 20
+
+
+def test_invalidate_forces_a_fresh_fetch(monkeypatch):
+    calls = []
+    monkeypatch.setattr(page_snapshot, "_fetch", _fake_fetch(calls))
+
+    page_snapshot.get_snapshot("again.com")
+    page_snapshot.invalidate_snapshot("again.com")
+    page_snapshot.get_snapshot("again.com")
+
+    assert calls == ["again.com", "again.com"]
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import risk_engine
+
+
+def _stub_signals(monkeypatch, metrics_delay=0.0, vuln_error=None):
+    def get_metrics(domain):
+        time.sleep(metrics_delay)
+        return {"status": "Online", "response_time_ms": 42}
+
+    async def vuln_scan(domain):
+        if vuln_error:
+            raise vuln_error
+        return {"counts": {"high": 1, "low": 2}, "source": "cache"}
+
+    monkeypatch.setattr(risk_engine, "get_metrics", get_metrics)
+    monkeypatch.setattr(risk_engine, "get_ssl", lambda domain: {"days_remaining": 90, "status": "valid"})
+    monkeypatch.setattr(risk_engine, "vuln_scan", vuln_scan)
+
+
+def test_all_signals_ok_is_not_partial(monkeypatch):
+    _stub_signals(monkeypatch)
+
+    risk = asyncio.run(risk_engine.build_risk(" Example.com "))
+
+    assert risk["domain"] == "example.com"
+    assert not risk["partial"]
+    assert risk["status"] == "Online"
+    assert risk["vulnerabilities"] == {"total": 3, "high": 1, "low": 2}
+    assert {s["status"] for s in risk["signals"].values()} == {"ok"}
+
+
+def test_timed_out_signal_is_reported_as_partial(monkeypatch):
+    _stub_signals(monkeypatch, metrics_delay=0.3)
+
+    risk = asyncio.run(risk_engine.build_risk("slow.com", timeout=0.05))
+
+    assert risk["partial"]
+    assert risk["signals"]["metrics"]["status"] == "timeout"
+    assert risk["signals"]["metrics"]["duration_ms"] < 300
+    assert risk["signals"]["ssl"]["status"] == "ok"
+    assert risk["status"] == risk_engine.SIGNAL_FALLBACKS["metrics"]["status"]
+    assert risk["ssl"]["status"] == "valid"
+
+
+def test_failed_signal_falls_back_and_is_partial(monkeypatch):
+    _stub_signals(monkeypatch, vuln_error=RuntimeError("scanner down"))
+
+    risk = asyncio.run(risk_engine.build_risk("down.com"))
+
+    assert risk["partial"]
+    assert risk["signals"]["vulnerabilities"]["status"] == "error"
+    assert risk["vulnerabilities"] == {"total": 0}
@@ -0,0 +1,40 @@
+import ssl_state
+from ssl_policy import evaluate_ssl_repair_policy, evaluate_ssl_repair_policy_fleet
+
+
+def test_recent_attempt_triggers_cooldown():
+    ssl_state.record_repair_attempt("cooldown.com", "failure", "timeout")
+
+    decision = evaluate_ssl_repair_policy("cooldown.com")
+
+    assert decision == {"allowed": False, "reason": "Cooldown window active", "mode": "auto"}
+    state = ssl_state.get_ssl_state("cooldown.com")
+    assert state["last_policy_decision"] == "block"
+    assert state["last_policy_decision_reason"] == "Cooldown window active"
+
+
+def test_attempt_limit_blocks_repair():
+    for _ in range(3):
+        ssl_state.record_repair_attempt("limit.com", "failure")
+
+    decision = evaluate_ssl_repair_policy("limit.com")
+
+    assert not decision["allowed"]
+    assert decision["reason"] == "Too many repair attempts in last 24h"
+
+
+def test_manual_mode_and_severity_rules():
+    ssl_state.set_renewal_mode("manual.com", "manual")
+
+    assert evaluate_ssl_repair_policy("manual.com")["reason"] == "Repair blocked: mode=manual"
+    assert not evaluate_ssl_repair_policy("fresh-low.com", severity="LOW")["allowed"]
+    assert evaluate_ssl_repair_policy("fresh-high.com", severity="HIGH")["allowed"]
+
+
+def test_fleet_decisions_are_flushed():
+    decisions = evaluate_ssl_repair_policy_fleet(["fleet-a.com", "fleet-b.com"])
+
+    assert [d["domain"] for d in decisions] == ["fleet-a.com", "fleet-b.com"]
+    assert not ssl_state._DIRTY
+    row = ssl_state._DB.query_one("SELECT state FROM ssl_state WHERE domain = ?", ("fleet-a.com",))
+    assert '"last_policy_decision": "allow"' in row[0]
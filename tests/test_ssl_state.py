@@ -0,0 +1,79 @@
+import json
+import threading
+import time
+from datetime import datetime
+
+import ssl_state
+
+
+def _stored(domain):
+    row = ssl_state._DB.query_one("SELECT state FROM ssl_state WHERE domain = ?", (domain,))
+    return json.loads(row[0]) if row else None
+
+
+def test_buffered_decisions_start_the_flusher_and_flush():
+    ssl_state.record_policy_decision("buffered.com", "allow", "ok", buffered=True)
+
+    assert ssl_state._FLUSHER is not None and ssl_state._FLUSHER.is_alive()
+    assert ssl_state.flush_state() >= 1
+    assert _stored("buffered.com")["last_policy_decision"] == "allow"
+    assert "buffered.com" not in ssl_state._DIRTY
+
+
+def test_concurrent_buffered_writes_and_flushes():
+    domains = [f"race{i}.com" for i in range(20)]
+    errors = []
+
+    def writer(domain):
+        try:
+            for _ in range(50):
+                ssl_state.record_policy_decision(domain, "block", "busy", buffered=True)
+        except Exception as e:
+            errors.append(e)
+
+    def flusher():
+        for _ in range(50):
+            ssl_state.flush_state()
+
+    threads = [threading.Thread(target=writer, args=(d,)) for d in domains]
+    threads.append(threading.Thread(target=flusher))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    ssl_state.flush_state()
+
+    assert not errors
+    assert not ssl_state._DIRTY
+    for domain in domains:
+        stored = _stored(domain)
+        assert len(stored["policy_decisions"]) == ssl_state.HISTORY_LIMIT
+        summary = stored["history_summary"]["policy_decisions"]
+        assert sum(count for day in summary.values() for count in day.values()) == 50
+
+
+def test_history_is_bounded_and_attempts_counted():
+    for _ in range(ssl_state.HISTORY_LIMIT + 10):
+        ssl_state.record_repair_attempt("history.com", "failure")
+
+    state = ssl_state.get_ssl_state("history.com")
+
+    assert len(state["repair_attempts"]) == ssl_state.HISTORY_LIMIT
+    assert ssl_state.count_recent_attempts("history.com") == ssl_state.HISTORY_LIMIT + 10
+    assert _stored("history.com")["last_repair_attempt_at"] == state["last_repair_attempt_at"]
+
+
+def test_legacy_attempts_are_read_as_utc(monkeypatch):
+    # Local time ten hours ahead of UTC would shift naive timestamps back
+    monkeypatch.setenv("TZ", "Etc/GMT-10")
+    time.tzset()
+    try:
+        state = ssl_state._default_state("legacy.com")
+        state["repair_attempts"] = [{"timestamp": datetime.utcnow().isoformat(), "result": "failure"}]
+        del state["attempt_buckets"]
+        monkeypatch.setitem(ssl_state._STATE, "legacy.com", state)
+
+        assert ssl_state.count_recent_attempts("legacy.com", window_seconds=3600) == 1
+    finally:
+        monkeypatch.undo()
+        time.tzset()
@@ -0,0 +1,93 @@
+import json
+import os
+
+from telemetry_event_store import GENESIS_HASH, TelemetryEventStore, _event_hash
+
+
+def _read_events(directory):
+    events = []
+    for name in sorted(os.listdir(directory)):
+        if name.startswith("segment-"):
+            with open(os.path.join(directory, name)) as f:
+                events += [json.loads(line) for line in f if line.strip()]
+    return events
+
+
+def test_events_are_hash_chained(tmp_path):
+    store = TelemetryEventStore(str(tmp_path))
+
+    first = store.append({"event_id": "E1"})
+    second = store.append({"event_id": "E2"})
+
+    assert first["previous_event_hash"] == GENESIS_HASH
+    assert second["previous_event_hash"] == first["event_hash"]
+    assert store.head_hash() == second["event_hash"]
+    assert store.latest()["event_id"] == "E2"
+
+    for event in _read_events(str(tmp_path)):
+        stored_hash = event.pop("event_hash")
+        assert _event_hash(event) == stored_hash
+
+
+def test_segments_roll_over(tmp_path):
+    store = TelemetryEventStore(str(tmp_path), segment_max_events=3)
+
+    for i in range(7):
+        store.append({"event_id": f"E{i}"})
+
+    stats = store.stats()
+    assert stats["segment"] == 3
+    assert stats["total_events"] == 7
+    assert [e["event_id"] for e in _read_events(str(tmp_path))] == [f"E{i}" for i in range(7)]
+    assert store.latest()["event_id"] == "E6"
+
+
+def test_index_recovers_after_crash_before_index_write(tmp_path):
+    store = TelemetryEventStore(str(tmp_path))
+    store.append({"event_id": "E1"})
+    stale_index = store.stats()
+    store.append({"event_id": "E2"})
+
+    # Simulate a crash between the segment append and the index write
+    store._write_index(stale_index)
+
+    third = TelemetryEventStore(str(tmp_path)).append({"event_id": "E3"})
+
+    events = _read_events(str(tmp_path))
+    assert third["previous_event_hash"] == events[1]["event_hash"]
+    assert store.stats()["total_events"] == 3
+
+
+def test_index_recovers_after_crash_on_the_first_line_of_a_new_segment(tmp_path):
+    store = TelemetryEventStore(str(tmp_path), segment_max_events=2)
+    store.append({"event_id": "E1"})
+    store.append({"event_id": "E2"})
+    stale_index = store.stats()
+    store.append({"event_id": "E3"})   # rolls over to segment 2
+
+    # Crash after the rollover write, before the index names segment 2
+    store._write_index(stale_index)
+
+    fourth = TelemetryEventStore(str(tmp_path), segment_max_events=2).append({"event_id": "E4"})
+
+    events = _read_events(str(tmp_path))
+    assert [e["event_id"] for e in events] == ["E1", "E2", "E3", "E4"]
+    assert fourth["previous_event_hash"] == events[2]["event_hash"]
+    assert store.stats()["segment"] == 2
+    assert store.stats()["total_events"] == 4
+
+
+def test_legacy_log_is_migrated_once(tmp_path):
+    legacy = tmp_path / "telemetry_event_log.json"
+    events = [
+        {"event_id": "L1", "previous_event_hash": GENESIS_HASH, "event_hash": "h1"},
+        {"event_id": "L2", "previous_event_hash": "h1", "event_hash": "h2"},
+    ]
+    legacy.write_text(json.dumps(events))
+
+    store = TelemetryEventStore(str(tmp_path), legacy_file=str(legacy))
+
+    assert not legacy.exists()
+    assert (tmp_path / "telemetry_event_log.json.migrated").exists()
+    assert store.head_hash() == "h2"
+    assert store.append({"event_id": "N1"})["previous_event_hash"] == "h2"
@@ -0,0 +1,68 @@
+from tenant_registry import TenantRegistry
+
+
+def test_register_normalizes_and_deduplicates(tmp_path):
+    registry = TenantRegistry(str(tmp_path / "tenants.db"))
+
+    count = registry.register("T1", ["https://A.com/", "a.com", "http://b.com", ""])
+
+    assert count == 2
+    assert registry.domains("T1") == ["a.com", "b.com"]
+    assert registry.domain_count("T1") == 2
+
+
+def test_register_replaces_domain_list(tmp_path):
+    registry = TenantRegistry(str(tmp_path / "tenants.db"))
+    registry.register("T1", ["a.com", "b.com"])
+
+    registry.register("T1", ["c.com"])
+
+    assert registry.domains("T1") == ["c.com"]
+    assert registry.domain_count("T1") == 1
+    assert not registry.owns("T1", "a.com")
+
+
+def test_add_and_remove_keep_count_in_step(tmp_path):
+    registry = TenantRegistry(str(tmp_path / "tenants.db"))
+    registry.register("T1", ["a.com"])
+
+    assert registry.add_domains("T1", ["a.com", "b.com", "c.com"]) == 2
+    assert registry.domain_count("T1") == 3
+
+    assert registry.remove_domain("T1", "b.com")
+    assert not registry.remove_domain("T1", "b.com")
+    assert registry.domain_count("T1") == 2
+
+
+def test_ownership_lookups(tmp_path):
+    registry = TenantRegistry(str(tmp_path / "tenants.db"))
+    registry.register("T1", ["a.com", "shared.com"])
+    registry.register("T2", ["shared.com"])
+
+    assert registry.owns("T1", "https://a.com")
+    assert not registry.owns("T2", "a.com")
+    assert sorted(registry.owners("shared.com")) == ["T1", "T2"]
+
+
+def test_iter_all_domains_pages_distinct_domains(tmp_path):
+    registry = TenantRegistry(str(tmp_path / "tenants.db"))
+    registry.add_domains("T1", [f"site{i:03d}.com" for i in range(25)])
+    registry.add_domains("T2", [f"site{i:03d}.com" for i in range(20, 30)])
+
+    domains = list(registry.iter_all_domains(page_size=7))
+
+    assert domains == [f"site{i:03d}.com" for i in range(30)]
+
+
+def test_dict_style_access(tmp_path):
+    registry = TenantRegistry(str(tmp_path / "tenants.db"))
+    registry.register("T1", ["a.com"])
+
+    assert "T1" in registry
+    assert "T9" not in registry
+    assert registry["T1"]["domains"] == ["a.com"]
+    assert list(registry) == ["T1"]
+    assert len(registry) == 1
+
+    assert registry.remove_tenant("T1")
+    assert len(registry) == 0
@@ -0,0 +1,127 @@
+import json
+import os
+import zipfile
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from fastapi import HTTPException
+
+import verify_logs
+from conftest import SIGNING_KEY
+from persistence import TelemetryLogger
+
+
+@pytest.fixture(autouse=True)
+def verify_key(monkeypatch):
+    monkeypatch.setattr(verify_logs, "_PUBLIC_KEY", SIGNING_KEY.public_key())
+
+
+def _write_log(tmp_path, signing_key_path, count, batch_size=0):
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    logger = TelemetryLogger(log_dir=str(log_dir), key_path=signing_key_path,
+                             batch_size=batch_size, batch_interval_ms=60000)
+    for i in range(count):
+        logger.log({"event": "probe", "n": i})
+    logger.flush()
+
+    (name,) = os.listdir(log_dir)
+    return str(log_dir / name)
+
+
+def _rewrite(path, line_index, change):
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    change(records[line_index])
+    with open(path, "w") as f:
+        f.writelines(json.dumps(r) + "\n" for r in records)
+
+
+@pytest.mark.parametrize("batch_size", [0, 4])
+def test_valid_logs_verify(tmp_path, signing_key_path, batch_size):
+    path = _write_log(tmp_path, signing_key_path, 10, batch_size)
+
+    report = verify_logs.verify_logs([path], workers=1, chunk_size=3)
+
+    assert report["ok"]
+    assert report["events"] == 10
+    assert report["signatures_checked"] == (10 if batch_size == 0 else 3)
+
+
+def test_tampered_event_reports_hash_mismatch(tmp_path, signing_key_path):
+    path = _write_log(tmp_path, signing_key_path, 5)
+    _rewrite(path, 2, lambda r: r.update(n=99))
+
+    report = verify_logs.verify_logs([path], workers=1)
+
+    assert not report["ok"]
+    assert report["first_bad"]["line"] == 3
+    assert report["first_bad"]["reason"] == "hash mismatch"
+
+
+def test_bad_signature_is_reported(tmp_path, signing_key_path):
+    path = _write_log(tmp_path, signing_key_path, 5)
+    _rewrite(path, 1, lambda r: r.update(signature="00" * 256))
+
+    report = verify_logs.verify_logs([path], workers=1, chunk_size=2)
+
+    assert report["first_bad"]["line"] == 2
+    assert report["first_bad"]["reason"] == "signature invalid"
+
+
+def test_broken_merkle_proof_is_reported(tmp_path, signing_key_path):
+    path = _write_log(tmp_path, signing_key_path, 6, batch_size=3)
+    _rewrite(path, 4, lambda r: r["batch"].update(proof=r["batch"]["proof"][:-1]))
+
+    report = verify_logs.verify_logs([path], workers=1)
+
+    assert report["first_bad"]["reason"] == "merkle proof mismatch"
+
+
+def test_archived_logs_verify(tmp_path, signing_key_path):
+    path = _write_log(tmp_path, signing_key_path, 4)
+    archive = str(tmp_path / "archive.zip")
+    with zipfile.ZipFile(archive, "w") as z:
+        z.write(path, arcname=os.path.basename(path))
+
+    report = verify_logs.verify_logs([archive], workers=1)
+
+    assert report["ok"] and report["events"] == 4
+
+
+def test_pool_verification_matches_inline(tmp_path, signing_key_path, monkeypatch):
+    # Spawned workers load the key from disk, relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("security")
+    with open(verify_logs.VERIFY_KEY_PATH, "wb") as f:
+        f.write(SIGNING_KEY.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo))
+    monkeypatch.setattr(verify_logs, "MAX_WORKERS", 2)
+
+    path = _write_log(tmp_path, signing_key_path, 12)
+    _rewrite(path, 9, lambda r: r.update(signature="00" * 256))
+
+    report = verify_logs.verify_logs([path], workers=2, chunk_size=2)
+
+    assert report["first_bad"]["line"] == 10
+    assert report["signatures_checked"] == 12
+
+
+def test_workers_are_capped_at_cpu_count(tmp_path, signing_key_path, monkeypatch):
+    monkeypatch.setattr(verify_logs, "MAX_WORKERS", 1)
+    monkeypatch.setattr(verify_logs, "_new_pool", lambda workers: pytest.fail("pool created"))
+    path = _write_log(tmp_path, signing_key_path, 3)
+
+    assert verify_logs.verify_logs([path], workers=64)["ok"]
+
+
+def test_endpoint_turns_away_a_second_verification(monkeypatch):
+    monkeypatch.setattr(verify_logs, "default_sources", lambda: [])
+    verify_logs._API_LOCK.acquire()
+    try:
+        with pytest.raises(HTTPException) as excinfo:
+            verify_logs.verify_endpoint(name=None)
+    finally:
+        verify_logs._API_LOCK.release()
+
+    assert excinfo.value.status_code == 429
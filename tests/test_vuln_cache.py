@@ -0,0 +1,66 @@
+import threading
+import time
+
+import vulnerabilities
+from vulnerabilities import VulnCache
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = VulnCache(str(tmp_path / "vuln.db"))
+    cache.put("a.com", {"domain": "a.com", "counts": {"high": 1}})
+
+    assert cache.get("a.com") == {"domain": "a.com", "counts": {"high": 1}}
+    assert cache.get("missing.com") is None
+    assert len(cache) == 1
+
+
+def test_expired_results_are_dropped(tmp_path):
+    cache = VulnCache(str(tmp_path / "vuln.db"))
+    cache.put("old.com", {"domain": "old.com"}, ttl=-1)
+
+    assert cache.get("old.com") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(vulnerabilities, "TOUCH_INTERVAL", 0)
+    cache = VulnCache(str(tmp_path / "vuln.db"), max_entries=3)
+
+    for name in ("a.com", "b.com", "c.com"):
+        cache.put(name, {"domain": name})
+        time.sleep(0.01)
+    cache.get("a.com")
+    cache.put("d.com", {"domain": "d.com"})
+
+    assert cache.get("b.com") is None
+    assert all(cache.get(name) for name in ("a.com", "c.com", "d.com"))
+    assert len(cache) == 3
+
+
+def test_count_survives_reopen_and_concurrent_writers(tmp_path):
+    path = str(tmp_path / "vuln.db")
+    cache = VulnCache(path, max_entries=50)
+
+    def writer(offset):
+        for i in range(40):
+            cache.put(f"d{(offset + i) % 60}.com", {"n": i})
+
+    threads = [threading.Thread(target=writer, args=(n * 15,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stored = cache._db.query_one("SELECT COUNT(*) FROM vuln_cache")[0]
+    assert len(cache) == stored <= 50
+    assert len(VulnCache(path, max_entries=50)) == stored
+
+
+def test_invalidate(tmp_path):
+    cache = VulnCache(str(tmp_path / "vuln.db"))
+    cache.put("a.com", {"domain": "a.com"})
+
+    cache.invalidate("a.com")
+
+    assert cache.get("a.com") is None
+    assert len(cache) == 0
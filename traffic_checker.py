@@ -1,26 +1,21 @@
 import random
 import socket
-import time
-import ssl
+
+from cert_facts import get_cert_facts
+from dns_cache import resolve
 
 
 def estimate_traffic(domain: str):
     try:
         # --- SIGNAL 1: DNS Resolution Speed ---
-        start = time.time()
-        socket.gethostbyname(domain)
-        dns_time = time.time() - start
+        # Measured by the shared resolver cache, not by timing a blocking call
+        dns = resolve(domain)
+        if dns["error"]:
+            raise socket.gaierror(dns["error"])
+        dns_time = dns["lookup_ms"] / 1000
 
         # --- SIGNAL 2: SSL Presence ---
-        context = ssl.create_default_context()
-        ssl_valid = False
-
-        try:
-            with socket.create_connection((domain, 443), timeout=3) as sock:
-                with context.wrap_socket(sock, server_hostname=domain):
-                    ssl_valid = True
-        except:
-            ssl_valid = False
+        ssl_valid = get_cert_facts(domain)["error"] is None
 
         # --- SIGNAL 3: Domain Complexity ---
         domain_score = len(domain)
@@ -45,7 +40,8 @@ def estimate_traffic(domain: str):
         return {
             "visitors_30d": estimated,
             "status": "Estimated",
-            "confidence": "Medium"
+            "confidence": "Medium",
+            "dns_lookup_ms": dns["lookup_ms"]
         }
 
     except Exception as e:
@@ -62,10 +58,11 @@ def estimate_traffic(domain: str):
 
 
 from fastapi import APIRouter
-from traffic_checker import estimate_traffic
+from card_cache import cached_card
 
 router = APIRouter()
 
 @router.get("/traffic/{domain}")
+@cached_card("traffic")
 def traffic_card(domain: str):
     return estimate_traffic(domain)
\ No newline at end of file
@@ -1,17 +1,16 @@
 from fastapi import APIRouter
-import requests
-import time
+from page_snapshot import get_snapshot
+from card_cache import cached_card
 
 router = APIRouter()
 
 @router.get("/uptime/{domain}")
+@cached_card("uptime")
 def uptime_card(domain: str):
-    url = f"https://{domain}"
-    try:
-        start = time.time()
-        r = requests.get(url, timeout=5)
-        latency_ms = int((time.time() - start) * 1000)
-        status = "Online" if r.status_code < 400 else "Offline"
-        return {"status": status, "response_time_ms": latency_ms}
-    except requests.RequestException:
+    snapshot = get_snapshot(domain)
+    if snapshot["error"]:
         return {"status": "Offline", "response_time_ms": None}
+
+    latency_ms = int(snapshot["timings"]["total_ms"])
+    status = "Online" if snapshot["status_code"] < 400 else "Offline"
+    return {"status": status, "response_time_ms": latency_ms}
@@ -1,49 +1,296 @@
+import argparse
 import json
 import hashlib
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import APIRouter, HTTPException, Query
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives import serialization
 
+from merkle import verify_proof
 
-def load_public_key():
 
-    with open("security/verify_key.pem", "rb") as f:
-        return serialization.load_pem_public_key(f.read())
+VERIFY_KEY_PATH = "security/verify_key.pem"
+LOG_DIR = "logs/telemetry"
+ARCHIVE_DIR = "logs/archive"
 
+SIGNATURE_CHUNK = 256       # signatures per process-pool task
+RECENT_ROOTS = 64           # batch roots remembered (blocks are contiguous)
+MAX_WORKERS = os.cpu_count() or 1
 
-def verify_log_file(path):
+# Loaded once per process (main process and each pool worker)
+_PUBLIC_KEY = None
 
-    public_key = load_public_key()
+# Shared by API requests; one verification at a time
+_API_POOL = None
+_API_LOCK = threading.Lock()
 
-    prev_hash = ""
 
-    with open(path, "r") as f:
+def load_public_key():
 
-        for line in f:
+    global _PUBLIC_KEY
 
-            event = json.loads(line)
+    if _PUBLIC_KEY is None:
+        with open(VERIFY_KEY_PATH, "rb") as f:
+            _PUBLIC_KEY = serialization.load_pem_public_key(f.read())
 
-            hash_input = json.dumps(
-                {k: event[k] for k in event if k not in ["hash", "signature"]},
-                sort_keys=True
-            )
+    return _PUBLIC_KEY
 
-            calculated = hashlib.sha256(
-                (hash_input + prev_hash).encode()
-            ).hexdigest()
 
-            if calculated != event["hash"]:
-                print("Hash mismatch detected")
-                return False
+# -----------------------------
+# Signature checks (pool side)
+# -----------------------------
+def _verify_signature_chunk(jobs):
+    """
+    jobs: [(position, signed_message, signature_hex)]
+    Returns the position of the first bad signature in the chunk, or None.
+    """
+    public_key = load_public_key()
 
+    for position, message, signature in jobs:
+        try:
             public_key.verify(
-                bytes.fromhex(event["signature"]),
-                event["hash"].encode(),
+                bytes.fromhex(signature),
+                message.encode(),
                 padding.PKCS1v15(),
                 hashes.SHA256()
             )
+        except Exception:
+            return position
+
+    return None
+
+
+# -----------------------------
+# Sources: plain daily logs and zipped archives
+# -----------------------------
+def _iter_sources(paths):
+    """
+    Yields (name, binary line stream). Each daily log is its own chain.
+    """
+    for path in paths:
+        if path.endswith(".zip"):
+            with zipfile.ZipFile(path) as z:
+                for member in sorted(z.namelist()):
+                    with z.open(member) as f:
+                        yield f"{path}:{member}", f
+        else:
+            with open(path, "rb") as f:
+                yield path, f
+
+
+def default_sources():
+    """
+    Every archive, then every live daily log, oldest first.
+    """
+    paths = []
+    for directory, suffix in ((ARCHIVE_DIR, ".zip"), (LOG_DIR, ".log")):
+        if os.path.isdir(directory):
+            paths += [
+                os.path.join(directory, name)
+                for name in sorted(os.listdir(directory))
+                if name.endswith(suffix)
+            ]
+    return paths
+
+
+# -----------------------------
+# Streaming verification engine
+# -----------------------------
+def _new_pool(workers):
+    # spawn: workers never inherit the server's threads, sockets or locks
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def verify_logs(paths, workers=None, chunk_size=SIGNATURE_CHUNK, pool=None):
+    """
+    Verify hash chains and signatures for the given .log / .zip files.
+
+    The hash chain is checked in a single streaming pass (constant memory).
+    Signatures go to a process pool in chunks, with a bounded number of
+    chunks in flight. Workers are capped at the CPU count; pass pool to
+    reuse an existing one. Returns a report with throughput and the first
+    bad record (source, line, byte offset), if any.
+    """
+    workers = min(workers or MAX_WORKERS, MAX_WORKERS)
+    own_pool = pool is None and workers > 1
+    if own_pool:
+        pool = _new_pool(workers)
+    max_in_flight = max(2, workers * 4)
+
+    in_flight = deque()
+    failures = []   # (order, detail)
+    events = 0
+    signatures = 0
+    jobs = []
+    start = time.perf_counter()
+
+    def submit(batch):
+        nonlocal signatures
+        signatures += len(batch)
+        if pool is None:
+            bad = _verify_signature_chunk(batch)
+            if bad is not None:
+                failures.append((bad[0], {**bad[1], "reason": "signature invalid"}))
+            return
+
+        in_flight.append(pool.submit(_verify_signature_chunk, batch))
+        while len(in_flight) > max_in_flight:
+            collect(in_flight.popleft())
+
+    def collect(future):
+        bad = future.result()
+        if bad is not None:
+            failures.append((bad[0], {**bad[1], "reason": "signature invalid"}))
+
+    try:
+        order = 0
+        for source, stream in _iter_sources(paths):
+            prev_hash = ""
+            recent_roots = deque(maxlen=RECENT_ROOTS)
+            offset = 0
+
+            for line_number, raw in enumerate(stream, start=1):
+                order += 1
+                position = (order, {"source": source, "line": line_number, "offset": offset})
+                offset += len(raw)
+
+                if not raw.strip():
+                    continue
+
+                events += 1
+
+                try:
+                    event = json.loads(raw)
+
+                    hash_input = json.dumps(
+                        {k: event[k] for k in event if k not in ["hash", "signature", "batch"]},
+                        sort_keys=True
+                    )
 
-            prev_hash = event["hash"]
+                    calculated = hashlib.sha256(
+                        (hash_input + prev_hash).encode()
+                    ).hexdigest()
+
+                    if calculated != event["hash"]:
+                        failures.append((order, {**position[1], "reason": "hash mismatch"}))
+                        break
+
+                    if "batch" in event:
+                        batch = event["batch"]
+                        if not verify_proof(event["hash"], batch["proof"], batch["root"]):
+                            failures.append((order, {**position[1], "reason": "merkle proof mismatch"}))
+                            break
+                        if batch["root"] not in recent_roots:
+                            recent_roots.append(batch["root"])
+                            jobs.append((position, batch["root"], batch["signature"]))
+                    else:
+                        jobs.append((position, event["hash"], event["signature"]))
+
+                except (ValueError, KeyError, TypeError):
+                    failures.append((order, {**position[1], "reason": "unreadable record"}))
+                    break
+
+                if len(jobs) >= chunk_size:
+                    submit(jobs)
+                    jobs = []
+
+                prev_hash = event["hash"]
+
+            if failures:
+                # Nothing after a known failure can be the first one
+                break
+
+        if jobs:
+            submit(jobs)
+
+        while in_flight:
+            collect(in_flight.popleft())
+
+    finally:
+        if own_pool:
+            pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    first_bad = min(failures, key=lambda f: f[0])[1] if failures else None
+
+    return {
+        "ok": first_bad is None,
+        "sources": len(paths),
+        "events": events,
+        "signatures_checked": signatures,
+        "elapsed_s": round(elapsed, 3),
+        "events_per_s": round(events / elapsed, 1) if elapsed else None,
+        "first_bad": first_bad,
+    }
+
+
+def verify_log_file(path):
+
+    report = verify_logs([path])
+
+    if not report["ok"]:
+        print(f"Verification failed: {report['first_bad']}")
+        return False
 
     print("Log verified successfully")
-    return True
\ No newline at end of file
+    return True
+
+
+# -----------------------------
+# API endpoint
+# -----------------------------
+router = APIRouter(prefix="/telemetry", tags=["Telemetry"])
+
+
+def _api_pool():
+    global _API_POOL
+    if _API_POOL is None and MAX_WORKERS > 1:
+        _API_POOL = _new_pool(MAX_WORKERS)
+    return _API_POOL
+
+
+@router.get("/verify")
+def verify_endpoint(
+    name: str = Query(None, description="Log or archive file name; omit to verify everything"),
+):
+    if name is None:
+        paths = default_sources()
+    else:
+        if os.path.basename(name) != name:
+            raise HTTPException(status_code=400, detail="Invalid file name")
+        directory = ARCHIVE_DIR if name.endswith(".zip") else LOG_DIR
+        paths = [os.path.join(directory, name)]
+        if not os.path.exists(paths[0]):
+            raise HTTPException(status_code=404, detail="Log file not found")
+
+    # Requests share one worker pool; a second caller is turned away
+    # rather than queueing another full verification
+    if not _API_LOCK.acquire(blocking=False):
+        raise HTTPException(status_code=429, detail="Verification already running")
+    try:
+        return verify_logs(paths, pool=_api_pool())
+    finally:
+        _API_LOCK.release()
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Verify signed telemetry logs and archives")
+    parser.add_argument("paths", nargs="*", help=".log or .zip files (default: all logs and archives)")
+    parser.add_argument("--workers", type=int, default=None, help="signature worker processes")
+    args = parser.parse_args()
+
+    report = verify_logs(args.paths or default_sources(), workers=args.workers)
+    print(json.dumps(report, indent=2))
+    raise SystemExit(0 if report["ok"] else 1)
@@ -1,13 +1,12 @@
 # sitepulseai_demo-backend/vulnerabilities.py
 
-import requests
-import ssl
-import socket
-from datetime import datetime
 import json
-from pathlib import Path
+import time
 import asyncio
 
+from page_snapshot import get_snapshot, invalidate_snapshot
+from cert_facts import get_cert_facts, days_remaining as cert_days_remaining, invalidate_cert_facts
+from sqlite_store import SQLiteStore
 
 
 # vulnerabilities.py
@@ -17,26 +16,98 @@ def get_vulnerabilities_data(domain: str):
     # Your logic to fetch vulnerability info
     return {"domain": domain, "vulnerabilities": []}
 
-CACHE_FILE = Path("vuln_cache.json")
-
 # -----------------------------
-# Cache Helpers
+# Result Cache (SQLite, per-entry TTL, LRU bound)
 # -----------------------------
-def load_cache():
-    if CACHE_FILE.exists():
-        try:
-            with open(CACHE_FILE, "r") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
-
-def save_cache(cache):
-    try:
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache, f)
-    except Exception:
-        pass
+VULN_DB = "vuln_cache.db"
+VULN_CACHE_TTL = 3600          # seconds a scan result stays valid
+VULN_CACHE_MAX = 20000         # entries kept; least recently used go first
+TOUCH_INTERVAL = 60            # seconds between LRU timestamp refreshes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vuln_cache (
+    domain TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS vuln_cache_accessed ON vuln_cache (accessed_at);
+"""
+
+
+class VulnCache:
+    """
+    Domain -> last scan result. Reads and writes are single-row primary
+    key operations; the row count is tracked in memory, so enforcing the
+    size bound never scans the table.
+    """
+
+    def __init__(self, path=VULN_DB, ttl=VULN_CACHE_TTL, max_entries=VULN_CACHE_MAX):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._db = SQLiteStore(path, _SCHEMA)
+        self._count = self._db.query_one("SELECT COUNT(*) FROM vuln_cache")[0]
+
+    def get(self, domain):
+        row = self._db.query_one(
+            "SELECT result, expires_at, accessed_at FROM vuln_cache WHERE domain = ?", (domain,)
+        )
+        if row is None:
+            return None
+
+        result, expires_at, accessed_at = row
+        now = time.time()
+
+        if expires_at <= now:
+            with self._db.transaction() as conn:
+                deleted = conn.execute(
+                    "DELETE FROM vuln_cache WHERE domain = ? AND expires_at <= ?", (domain, now)
+                ).rowcount
+                self._count -= deleted
+            return None
+
+        # LRU recency at minute granularity keeps hot reads write-free
+        if now - accessed_at > TOUCH_INTERVAL:
+            with self._db.transaction() as conn:
+                conn.execute("UPDATE vuln_cache SET accessed_at = ? WHERE domain = ?", (now, domain))
+
+        return json.loads(result)
+
+    def put(self, domain, result, ttl=None):
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        payload = json.dumps(result, default=str)
+
+        with self._db.transaction() as conn:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO vuln_cache (domain, result, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (domain, payload, expires_at, now),
+            ).rowcount
+            if inserted:
+                self._count += 1
+            else:
+                conn.execute(
+                    "UPDATE vuln_cache SET result = ?, expires_at = ?, accessed_at = ? WHERE domain = ?",
+                    (payload, expires_at, now, domain),
+                )
+
+            overflow = self._count - self.max_entries
+            if overflow > 0:
+                self._count -= conn.execute(
+                    "DELETE FROM vuln_cache WHERE domain IN "
+                    "(SELECT domain FROM vuln_cache ORDER BY accessed_at LIMIT ?)",
+                    (overflow,),
+                ).rowcount
+
+    def invalidate(self, domain):
+        with self._db.transaction() as conn:
+            self._count -= conn.execute("DELETE FROM vuln_cache WHERE domain = ?", (domain,)).rowcount
+
+    def __len__(self):
+        return self._count
+
+
+VULN_CACHE = VulnCache()
 
 # -----------------------------
 # Findings Summary
@@ -55,13 +126,10 @@ def summarize_findings(findings):
 def scan_ssl(domain: str):
     findings = []
     try:
-        ctx = ssl.create_default_context()
-        with ctx.wrap_socket(socket.socket(), server_hostname=domain) as s:
-            s.settimeout(3.0)
-            s.connect((domain, 443))
-            cert = s.getpeercert()
-        expires_at = datetime.strptime(cert['notAfter'], "%b %d %H:%M:%S %Y %Z")
-        days_remaining = (expires_at - datetime.utcnow()).days
+        facts = get_cert_facts(domain)
+        if facts["error"]:
+            raise RuntimeError(facts["error"])
+        days_remaining = cert_days_remaining(facts)
 
         if days_remaining <= 0:
             findings.append({"type": "SSL certificate expired", "severity": "Critical"})
@@ -78,8 +146,10 @@ def scan_ssl(domain: str):
 def scan_headers(domain: str):
     findings = []
     try:
-        response = requests.get(f"https://{domain}", timeout=5, allow_redirects=True)
-        headers = response.headers
+        snapshot = get_snapshot(domain)
+        if snapshot["error"]:
+            raise RuntimeError(snapshot["error"])
+        headers = snapshot["headers"]
 
         if "X-Frame-Options" not in headers:
             findings.append({"type": "X-Frame-Options missing", "severity": "Medium"})
@@ -99,28 +169,80 @@ def scan_headers(domain: str):
 # -----------------------------
 # Unified Scan + Cache (Async-Friendly)
 # -----------------------------
+SCAN_TIMEOUT = 8.0      # seconds, deadline for each individual scan
+PARTIAL_TTL = 60        # seconds to cache a result with a timed-out scan
+
+SCANS = {
+    "ssl": scan_ssl,
+    "headers": scan_headers,
+}
+
+
+async def _run_scan(name, domain, timeout):
+    start = time.perf_counter()
+    try:
+        findings = await asyncio.wait_for(asyncio.to_thread(SCANS[name], domain), timeout)
+        status = "ok"
+    except asyncio.TimeoutError:
+        # The worker thread finishes on its own; we stop waiting for it
+        findings, status = [], "timeout"
+    except Exception as e:
+        print(f"[Vuln Scan] {name} failed for {domain}: {e}")
+        findings, status = [], "error"
+
+    return findings, {"status": status, "duration_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+
+async def run_scans(domain, timeout=SCAN_TIMEOUT):
+    """
+    Run every scan concurrently, each under its own deadline.
+    Returns (findings, per-scan status).
+    """
+    outcomes = await asyncio.gather(*(_run_scan(name, domain, timeout) for name in SCANS))
+
+    findings, scans = [], {}
+    for name, (scan_findings, status) in zip(SCANS, outcomes):
+        findings += scan_findings
+        scans[name] = status
+    return findings, scans
+
+
+def build_result(domain, findings, scans):
+    counts = summarize_findings(findings)
+    risk_score = (
+        counts.get("critical", 0) * 5 +
+        counts.get("high", 0) * 3 +
+        counts.get("medium", 0) * 2 +
+        counts.get("low", 0) * 1
+    )
+
+    return {
+        "domain": domain,
+        "findings": findings,
+        "counts": counts,
+        "risk_score": risk_score,
+        "scans": scans,
+        "complete": all(scan["status"] == "ok" for scan in scans.values()),
+        "scanned_at": time.time(),
+    }
+
+
 async def scan_domain(domain: str, license_level: str = "free"):
     try:
         domain = domain.lower().strip()
-        cache = load_cache()
 
-        cached = cache.get(domain)
+        cached = VULN_CACHE.get(domain)
         if cached:
             return cached
 
-        # 🔍 YOUR ACTUAL SCAN LOGIC HERE
-        result = {
-            "risk_score": 0,
-            "counts": {
-                "critical": 0,
-                "high": 0,
-                "medium": 0,
-                "low": 0
-            }
-        }
+        findings, scans = await run_scans(domain)
+
+        # Optionally: license-gated deep scans could go here
 
-        cache[domain] = result
-        save_cache(cache)
+        result = build_result(domain, findings, scans)
+
+        # One record per domain; partial results expire quickly
+        VULN_CACHE.put(domain, result, ttl=None if result["complete"] else PARTIAL_TTL)
 
         return result
 
@@ -129,46 +251,60 @@ async def scan_domain(domain: str, license_level: str = "free"):
 
         # 🚨 NEVER crash — always return safe fallback
         return {
+            "domain": domain,
+            "findings": [],
             "risk_score": 0,
             "counts": {}
         }
-    
-
-    # Run blocking scans in a separate thread for async safety
-    findings_ssl, findings_headers = await asyncio.gather(
-        asyncio.to_thread(scan_ssl, domain),
-        asyncio.to_thread(scan_headers, domain)
-    )
-    findings += findings_ssl
-    findings += findings_headers
 
 
+# -----------------------------
+# Benchmark: sequential vs concurrent pipeline
+# -----------------------------
+def _cold(domain):
+    # Drop every cache layer so each round does real network work
+    invalidate_cert_facts(domain)
+    invalidate_snapshot(domain)
+    VULN_CACHE.invalidate(domain)
 
-    # Optionally: license-gated deep scans could go here
 
-    counts = summarize_findings(findings)
-    risk_score = (
-        counts.get("critical", 0) * 5 +
-        counts.get("high", 0) * 3 +
-        counts.get("medium", 0) * 2 +
-        counts.get("low", 0) * 1
-    )
+def _scan_sequential(domain):
+    findings = []
+    for scan in SCANS.values():
+        findings += scan(domain)
+    return findings
 
-    result = {
-        "domain": domain,
-        "findings": findings,
-        "counts": counts,
-        "risk_score": risk_score
-    }
 
-    # Cache for offline / fast reload
-    cache[domain] = result
-    save_cache(cache)
+async def benchmark(domains, rounds=3):
+    report = {"domains": len(domains), "rounds": rounds, "sequential_ms": [], "concurrent_ms": []}
 
-    return result
+    for _ in range(rounds):
+        for domain in domains:
+            _cold(domain)
+        start = time.perf_counter()
+        for domain in domains:
+            await asyncio.to_thread(_scan_sequential, domain)
+        report["sequential_ms"].append(round((time.perf_counter() - start) * 1000, 1))
 
+        for domain in domains:
+            _cold(domain)
+        start = time.perf_counter()
+        for domain in domains:
+            await run_scans(domain)
+        report["concurrent_ms"].append(round((time.perf_counter() - start) * 1000, 1))
 
+    sequential = sorted(report["sequential_ms"])[rounds // 2]
+    concurrent = sorted(report["concurrent_ms"])[rounds // 2]
+    report["median_speedup"] = round(sequential / concurrent, 2) if concurrent else None
+    return report
 
 
+if __name__ == "__main__":
+    import argparse
 
+    parser = argparse.ArgumentParser(description="Benchmark the vulnerability scan pipeline")
+    parser.add_argument("domains", nargs="+", help="domains to scan (cold caches each round)")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
 
+    print(json.dumps(asyncio.run(benchmark(args.domains, args.rounds)), indent=2))
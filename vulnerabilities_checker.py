@@ -1,7 +1,6 @@
 # sitepulseai_demo-backend/vulnerabilities_checkers.py
 from fastapi import APIRouter
 from vulnerabilities import scan_domain
-import asyncio
 
 
 router = APIRouter(
@@ -14,7 +13,8 @@ async def async_scan_domain(domain: str) -> dict:
     Async wrapper for scan_domain to return safe fallback on failure.
     """
     try:
-        result = await asyncio.to_thread(scan_domain, domain)
+        # scan_domain is already async; its blocking scans run in threads
+        result = await scan_domain(domain)
     except Exception:
         result = None
 